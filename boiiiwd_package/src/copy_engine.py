@@ -0,0 +1,221 @@
+from src.imports import *
+from src.helpers import *
+
+
+DEFAULT_COPY_WORKERS = 4
+COPY_BUFFER_SIZE = 8 * 1024 * 1024
+# copy_file_range/sendfile calls are split so progress keeps moving on multi-GB .ff/.xpak files
+COPY_CHUNK_SIZE = 64 * 1024 * 1024
+PROGRESS_INTERVAL = 0.1
+HASH_BUFFER_SIZE = 1024 * 1024
+# FAT32/exFAT keep mtimes to 2 seconds
+MTIME_TOLERANCE = 2
+
+
+def get_copy_workers():
+    try:
+        return min(max(int(check_config("copy_workers", str(DEFAULT_COPY_WORKERS))), 1), 16)
+    except ValueError:
+        return DEFAULT_COPY_WORKERS
+
+
+# kernel side copies where the os has them (linux), a big buffer otherwise (windows)
+def copy_file_data(src, dst, on_bytes):
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        size = os.fstat(fsrc.fileno()).st_size
+        for fast_copy in (getattr(os, "copy_file_range", None), getattr(os, "sendfile", None)):
+            if not fast_copy or not size:
+                continue
+            try:
+                copied = 0
+                while copied < size:
+                    if fast_copy is os.sendfile:
+                        sent = fast_copy(fdst.fileno(), fsrc.fileno(), copied, COPY_CHUNK_SIZE)
+                    else:
+                        sent = fast_copy(fsrc.fileno(), fdst.fileno(), COPY_CHUNK_SIZE, copied, copied)
+                    if not sent:
+                        break
+                    copied += sent
+                    on_bytes(sent)
+                if copied >= size:
+                    return
+                # the file changed under us, finish it with the buffered copy
+                fsrc.seek(copied)
+                fdst.seek(copied)
+                break
+            except OSError:
+                # not supported between these filesystems, nothing was written yet
+                if copied:
+                    raise
+        buffer = bytearray(COPY_BUFFER_SIZE)
+        view = memoryview(buffer)
+        while True:
+            read = fsrc.readinto(buffer)
+            if not read:
+                break
+            fdst.write(view[:read])
+            on_bytes(read)
+
+
+def hash_file(path):
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(HASH_BUFFER_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# path -> (size, mtime_ns, hash) in boiiiwd_hashes.json, a file is only hashed again once it changed
+class HashCache:
+    def __init__(self, path=None):
+        self.path = path or os.path.join(APPLICATION_PATH, HASH_CACHE_FILE)
+        self.lock = threading.Lock()
+        self.changed = False
+        try:
+            with open(self.path, "r") as file:
+                self.hashes = json.load(file)
+        except (OSError, ValueError):
+            self.hashes = {}
+
+    def get(self, path):
+        stat = os.stat(path)
+        key = os.path.normcase(os.path.abspath(path))
+        with self.lock:
+            cached = self.hashes.get(key)
+        if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+            return cached[2]
+        digest = hash_file(path)
+        with self.lock:
+            self.hashes[key] = [stat.st_size, stat.st_mtime_ns, digest]
+            self.changed = True
+        return digest
+
+    # drops entries of files that are gone
+    def save(self):
+        with self.lock:
+            if not self.changed:
+                return
+            self.hashes = {path: value for path, value in self.hashes.items() if os.path.exists(path)}
+            try:
+                with open(self.path, "w") as file:
+                    json.dump(self.hashes, file)
+                self.changed = False
+            except OSError:
+                pass
+
+
+# files (and emptied folders) of dst that src doesn't have anymore, returns how many files were removed
+def remove_dropped_files(src, dst):
+    removed = 0
+    for root, dirs, names in os.walk(dst, topdown=False):
+        relative = os.path.relpath(root, dst)
+        for name in names:
+            if not os.path.exists(os.path.join(src, relative, name)):
+                try:
+                    os.remove(os.path.join(root, name))
+                    removed += 1
+                except OSError:
+                    pass
+        for name in dirs:
+            if not os.path.exists(os.path.join(src, relative, name)):
+                try:
+                    os.rmdir(os.path.join(root, name))
+                except OSError:
+                    pass
+    return removed
+
+
+class CopyStats:
+    def __init__(self):
+        self.files_written = 0
+        self.files_skipped = 0
+        self.files_removed = 0
+        self.bytes_written = 0
+        self.bytes_skipped = 0
+
+
+# copies a folder with several files in flight, progress is reported in bytes at most every PROGRESS_INTERVAL
+# through on_progress(bytes_done, bytes_total) from the copying threads
+class TreeCopier:
+    def __init__(self, on_progress=None, workers=None, hash_cache=None):
+        self.on_progress = on_progress
+        self.workers = workers or get_copy_workers()
+        self.hash_cache = hash_cache
+        self.stats = CopyStats()
+        self.lock = threading.Lock()
+        self.bytes_total = 0
+        self.bytes_done = 0
+        self.last_report = 0
+
+    def add_bytes(self, count):
+        with self.lock:
+            self.bytes_done += count
+            now = time.time()
+            if now - self.last_report < PROGRESS_INTERVAL:
+                return
+            self.last_report = now
+            done, total = self.bytes_done, self.bytes_total
+        if self.on_progress:
+            self.on_progress(done, total)
+
+    # rsync style: size and mtime first, the content hash when only the mtime differs
+    def is_unchanged(self, src, dst):
+        try:
+            src_stat, dst_stat = os.stat(src), os.stat(dst)
+        except OSError:
+            return False
+        if src_stat.st_size != dst_stat.st_size:
+            return False
+        # the same file (a hardlink) is unchanged whatever its mtime says
+        if os.path.samestat(src_stat, dst_stat) or abs(src_stat.st_mtime - dst_stat.st_mtime) < MTIME_TOLERANCE:
+            return True
+        if not self.hash_cache or self.hash_cache.get(src) != self.hash_cache.get(dst):
+            return False
+        # same content, the next sync can trust the mtime
+        shutil.copystat(src, dst)
+        return True
+
+    def copy_file(self, src, dst, size):
+        if self.hash_cache and self.is_unchanged(src, dst):
+            with self.lock:
+                self.stats.files_skipped += 1
+                self.stats.bytes_skipped += size
+            self.add_bytes(size)
+            return
+        if os.path.exists(dst) and os.path.samefile(src, dst):
+            self.add_bytes(size)
+            return
+        copy_file_data(src, dst, self.add_bytes)
+        shutil.copystat(src, dst)
+        with self.lock:
+            self.stats.files_written += 1
+            self.stats.bytes_written += size
+
+    # with a hash cache only new/changed files are written and the ones src doesn't have are removed,
+    # returns the CopyStats
+    def copy_tree(self, src, dst):
+        files = []
+        for root, _, names in os.walk(src):
+            target_root = os.path.join(dst, os.path.relpath(root, src))
+            os.makedirs(target_root, exist_ok=True)
+            for name in names:
+                path = os.path.join(root, name)
+                files.append((path, os.path.join(target_root, name), os.path.getsize(path)))
+        self.bytes_total = sum(size for _, _, size in files)
+
+        if self.hash_cache:
+            self.stats.files_removed = remove_dropped_files(src, dst)
+
+        # biggest first so one large .ff doesn't start last and run alone
+        files.sort(key=lambda item: item[2], reverse=True)
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                for future in as_completed([executor.submit(self.copy_file, *item) for item in files]):
+                    future.result()
+        finally:
+            if self.hash_cache:
+                self.hash_cache.save()
+
+        if self.on_progress:
+            self.on_progress(self.bytes_total, self.bytes_total)
+        return self.stats
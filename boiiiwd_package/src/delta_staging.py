@@ -0,0 +1,47 @@
+from src.imports import *
+from src.helpers import *
+from src.steamcmd_session import get_install_dirs, get_workshop_folders
+from src.copy_engine import TreeCopier
+
+
+def delta_updates_enabled():
+    return check_config("delta_updates", "on") != "off"
+
+
+# zone folder of an installed item, None when it isn't installed there (anymore)
+def find_installed_zone(destination_folder, folder_name, workshop_id):
+    if not destination_folder or not folder_name:
+        return None
+    for kind in ("usermaps", "mods"):
+        zone_folder = os.path.join(destination_folder, kind, folder_name, "zone")
+        json_file_path = os.path.join(zone_folder, "workshop.json")
+        try:
+            if os.path.exists(json_file_path) and str(extract_json_data(json_file_path, "PublisherID")) == str(workshop_id):
+                return zone_folder
+        except Exception:
+            continue
+    return None
+
+
+# gives steamcmd a copy of the installed files as its content folder so an update only fetches the chunks that
+# changed. a copy and not links: steamcmd may write into the files it has, the installed ones must stay as they
+# are if the download fails or is stopped (copy_file_range clones instead of copying where the filesystem can).
+# returns True when the content folder holds the item
+def stage_installed_item(zone_folder, map_folder):
+    if os.path.exists(map_folder):
+        return True
+    try:
+        TreeCopier().copy_tree(zone_folder, map_folder)
+        return True
+    except OSError:
+        remove_tree(map_folder)
+        return False
+
+
+# content folders of the item in the other steamcmd install dirs (queue workers) hold the version the install
+# just replaced, they'd only take up space
+def remove_other_stagings(steamcmd_path, workshop_id, keep):
+    for install_dir in get_install_dirs(steamcmd_path):
+        _, map_folder = get_workshop_folders(install_dir, workshop_id)
+        if os.path.normpath(map_folder) != os.path.normpath(keep) and os.path.exists(map_folder):
+            remove_tree(map_folder)
@@ -0,0 +1,249 @@
+import src.shared_vars as main_app
+from src.imports import *
+from src.helpers import *
+
+
+# built once on first use then hidden/refilled, opening it for another item is just a content update
+class DetailsWindow(ctk.CTkToplevel):
+    def __init__(self, master):
+        super().__init__(master)
+        self.withdraw()
+        if os.path.exists(os.path.join(RESOURCES_DIR, "ryuk.ico")):
+            self.after(210, lambda: self.iconbitmap(os.path.join(RESOURCES_DIR, "ryuk.ico")))
+        self.title("Map/Mod Information")
+        self.maxsize(450, 10000)
+        self.minsize(300, 500)
+        self.protocol("WM_DELETE_WINDOW", self.close_window)
+
+        self.details = None
+        self.desc_threshold = 30
+        self.type_expanded = False
+
+        # frames
+        self.stars_frame = ctk.CTkFrame(self)
+        self.stars_frame.grid(row=0, column=0, columnspan=2, padx=20, pady=(20, 0), sticky="nsew")
+        self.stars_frame.columnconfigure(0, weight=0)
+        self.stars_frame.rowconfigure(0, weight=1)
+
+        self.image_frame = ctk.CTkFrame(self)
+        self.image_frame.grid(row=1, column=0, columnspan=2, padx=20, pady=0, sticky="nsew")
+
+        self.info_frame = ctk.CTkFrame(self)
+        self.info_frame.grid(row=2, column=0, columnspan=2, padx=20, pady=20, sticky="nsew")
+
+        self.buttons_frame = ctk.CTkFrame(self)
+        self.buttons_frame.grid(row=3, column=0, columnspan=2, padx=20, pady=(0, 20), sticky="nsew")
+
+        # fillers
+        self.name_label = ctk.CTkLabel(self.info_frame, text="", wraplength=420, justify="left")
+        self.name_label.grid(row=0, column=0, columnspan=2, sticky="w", padx=20, pady=2.5)
+
+        self.description_lab = ctk.CTkLabel(self.info_frame, text="")
+        self.description_lab.grid(row=1, column=0, columnspan=2, sticky="w", padx=20, pady=2.5)
+        self.description_lab.bind("<Button-1>", self.show_description)
+        self.description_lab_tooltip = CTkToolTip(self.description_lab, message="View description", topmost=True)
+
+        self.id_label = ctk.CTkLabel(self.info_frame, text="")
+        self.id_label.grid(row=2, column=0, columnspan=2, sticky="w", padx=20, pady=2.5)
+
+        self.type_label = ctk.CTkLabel(self.info_frame, text="", wraplength=350, justify="left")
+        self.type_label.grid(row=3, column=0, columnspan=2, sticky="w", padx=20, pady=2.5)
+        self.type_label.bind("<Button-1>", self.show_full_type)
+        self.type_label_tooltip = CTkToolTip(self.type_label, message="View all types", topmost=True)
+
+        self.size_label = ctk.CTkLabel(self.info_frame, text="")
+        self.size_label.grid(row=4, column=0, columnspan=2, sticky="w", padx=20, pady=2.5)
+
+        self.date_created_label = ctk.CTkLabel(self.info_frame, text="")
+        self.date_created_label.grid(row=5, column=0, columnspan=2, sticky="w", padx=20, pady=2.5)
+
+        self.date_updated_label = ctk.CTkLabel(self.info_frame, text="")
+        self.date_updated_label.grid(row=6, column=0, columnspan=2, sticky="w", padx=20, pady=2.5)
+        self.date_updated_label.bind("<Button-1>", self.view_changelogs)
+        self.date_updated_label_tooltip = CTkToolTip(self.date_updated_label, message="View changelogs", topmost=True)
+
+        self.down_date_label = ctk.CTkLabel(self.info_frame, text="")
+        self.down_date_label.grid(row=7, column=0, columnspan=2, sticky="w", padx=20, pady=2.5)
+
+        self.stars_image_label = ctk.CTkLabel(self.stars_frame, text="")
+        self.stars_image_label.pack(side="left", padx=(10, 20), pady=(10, 10))
+
+        self.ratings = ctk.CTkLabel(self.stars_frame, text="")
+        self.ratings.pack(side="right", padx=(10, 20), pady=(10, 10))
+
+        self.image_label = ctk.CTkLabel(self.image_frame, text="")
+        self.image_label.pack(expand=True, fill="both", padx=(10, 20), pady=(10, 10))
+
+        # Buttons
+        self.view_button = ctk.CTkButton(self.buttons_frame, text="View", command=self.view_map_mod, width=130)
+        self.view_button.grid(row=0, column=0, padx=(20, 20), pady=(10, 10), sticky="n")
+        self.view_button_tooltip = CTkToolTip(self.view_button, message="View Workshop", topmost=True)
+
+        self.update_btn = ctk.CTkButton(self.buttons_frame, text="Update", command=self.update_item, width=130)
+        self.update_btn.grid(row=0, column=1, padx=(10, 20), pady=(10, 10), sticky="n")
+        self.update_btn_tooltip = CTkToolTip(self.update_btn, message="Checks and installs updates of the current selected item (redownload!)", topmost=True)
+
+        self.close_button = ctk.CTkButton(self.buttons_frame, text="Close", command=self.close_window, width=130)
+        self.close_button.grid(row=0, column=2, padx=(10, 20), pady=(10, 10), sticky="n")
+
+        self.grid_rowconfigure(0, weight=0)
+        self.grid_rowconfigure(1, weight=0)
+        self.grid_rowconfigure(2, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_columnconfigure(1, weight=1)
+
+        self.buttons_frame.grid_rowconfigure(0, weight=1)
+        self.buttons_frame.grid_columnconfigure(0, weight=1)
+        self.buttons_frame.grid_columnconfigure(1, weight=1)
+        self.buttons_frame.grid_columnconfigure(2, weight=1)
+
+    def close_window(self):
+        self.withdraw()
+
+    def view_map_mod(self):
+        if self.details:
+            webbrowser.open(self.details["url"])
+
+    def view_changelogs(self, event=None):
+        if self.details and self.details["date_updated"] not in ("Not updated", "Offline"):
+            webbrowser.open(f"https://steamcommunity.com/sharedfiles/filedetails/changelog/{self.details['workshop_id']}")
+
+    def update_item(self):
+        on_update = self.details.get("on_update") if self.details else None
+        if on_update and on_update(self.details):
+            self.withdraw()
+
+    def show_full_type(self, event=None):
+        full_text = self.details["type"] if self.details else ""
+        if len(full_text) <= self.desc_threshold:
+            return
+        self.type_expanded = not self.type_expanded
+        if self.type_expanded:
+            self.type_label.configure(text=f"Type: {full_text}")
+        else:
+            self.type_label.configure(text=f"Type: {full_text[:self.desc_threshold]}...")
+
+    def show_description(self, event):
+        if not self.details or len(self.details["description"]) <= self.desc_threshold:
+            return
+        map_name = self.details["name"]
+        description = self.details["description"]
+
+        def main_thread():
+            description_window = ctk.CTkToplevel(None)
+
+            if os.path.exists(os.path.join(RESOURCES_DIR, "ryuk.ico")):
+                description_window.after(210, lambda: description_window.iconbitmap(os.path.join(RESOURCES_DIR, "ryuk.ico")))
+
+            description_window.attributes('-topmost', 'true')
+            description_window.title(f"Description - {map_name}")
+            x_pos = event.x_root - 300
+            y_pos = event.y_root - 200
+            calc_req_width = len(description) * 6 + 5
+            win_width = calc_req_width if calc_req_width < 500 else 500
+            description_window.geometry(f"{win_width + 5}x300+{x_pos}+{y_pos}")
+
+            if check_config("theme", "boiiiwd_theme.json") == "boiiiwd_obsidian.json":
+                description_label = ctk.CTkTextbox(description_window, activate_scrollbars=True, scrollbar_button_color="#5b6c7f")
+            else:
+                description_label = ctk.CTkTextbox(description_window, activate_scrollbars=True)
+            description_label.insert("1.0", description)
+            description_label.pack(fill=ctk.BOTH, expand=True, padx=(10, 10), pady=(10, 10))
+            description_label.configure(state="disabled")
+
+            main_app.app.create_context_menu(description_label, textbox=True)
+            description_window.after(50, description_window.focus_set)
+
+        main_app.app.after(0, main_thread)
+
+    # details is the record returned by get_item_details(), library items add folder/down_date/online/on_update
+    def show_details(self, details):
+        self.details = details
+        self.type_expanded = False
+        library = "folder" in details
+        online = details.get("online", True)
+        workshop_id = str(details["workshop_id"])
+        description = details["description"]
+        date_updated = details["date_updated"]
+
+        self.name_label.configure(text=f"Name: {details['name']}")
+
+        shortened_description = re.sub(r'[\\/\n\r]', '', description).strip()
+        shortened_description = re.sub(r'([^a-zA-Z0-9\s:().])', '', shortened_description)
+        shortened_description = f"{shortened_description[:self.desc_threshold]}... (View)"\
+                                if len(shortened_description) > self.desc_threshold else shortened_description
+        self.description_lab.configure(text=f"Description: {shortened_description}")
+        if len(description) > self.desc_threshold:
+            self.description_lab.configure(cursor="hand2")
+            self.description_lab_tooltip.show()
+        else:
+            self.description_lab.configure(cursor="")
+            self.description_lab_tooltip.hide()
+
+        map_mod_type_txt = details["type"]
+        map_mod_type = map_mod_type_txt[:self.desc_threshold] + "..." if len(map_mod_type_txt) > self.desc_threshold else map_mod_type_txt
+        self.type_label.configure(text=f"Type: {map_mod_type}")
+        if len(map_mod_type_txt) > self.desc_threshold:
+            self.type_label.configure(cursor="hand2")
+            self.type_label_tooltip.show()
+        else:
+            self.type_label.configure(cursor="")
+            self.type_label_tooltip.hide()
+
+        self.size_label.configure(text=f"Size: {details['size']}" if library else f"Size (Workshop): {details['size']}")
+        self.date_created_label.configure(text=f"Posted: {details['date_created']}")
+
+        if date_updated != "Not updated" and date_updated != "Offline":
+            self.date_updated_label.configure(text=f"Updated: {date_updated}  🔗", cursor="hand2")
+            self.date_updated_label_tooltip.show()
+        else:
+            self.date_updated_label.configure(text=f"Updated: {date_updated}", cursor="")
+            self.date_updated_label_tooltip.hide()
+
+        stars_width, stars_height = details["stars_image"].size
+        self.stars_image_label.configure(image=ctk.CTkImage(details["stars_image"], size=(int(stars_width), int(stars_height))))
+        self.ratings.configure(text=details["ratings_text"])
+
+        max_width = 300
+        image_size = details["image"].size
+        i_width, i_height = tuple([int(max_width/image_size[0] * x) for x in image_size])
+        self.image_label.configure(image=ctk.CTkImage(details["image"], size=(int(i_width), int(i_height))))
+
+        self.view_button.configure(state="normal")
+        self.view_button_tooltip.configure(message="View Workshop")
+
+        if library:
+            self.id_label.configure(text=f"ID: {workshop_id} | Folder: {os.path.basename(details['folder'])}")
+            self.id_label.grid()
+            self.down_date_label.configure(text=f"Downloaded: {details.get('down_date')}")
+            self.down_date_label.grid()
+            self.update_btn.configure(text="Update", state="normal")
+            self.update_btn_tooltip.configure(message="Checks and installs updates of the current selected item (redownload!)")
+            self.update_btn.grid()
+
+            if not online:
+                self.view_button.configure(state="disabled")
+                self.update_btn.configure(state="disabled")
+                self.update_btn_tooltip.configure(message="Currently offline")
+                self.view_button_tooltip.configure(message="Currently offline")
+            if check_config("update_invalid", "no") == "yes":
+                self.update_btn_tooltip.configure(message="update_invalid is set to 'yes' in config.ini")
+            elif details.get("invalid_warn"):
+                self.update_btn.configure(text="Update", state="disabled")
+                self.update_btn_tooltip.configure(message="Disabled due to item being blocked or duplicated")
+        else:
+            self.id_label.grid_remove()
+            self.down_date_label.grid_remove()
+            self.update_btn.grid_remove()
+
+        if not workshop_id.isdigit():
+            self.view_button.configure(text="View", state="disabled")
+            self.view_button_tooltip.configure(message="Not a valid Workshop ID")
+
+        if self.state() == "withdrawn":
+            _, _, x, y = get_window_size_from_registry()
+            try: self.geometry(f"+{x+50}+{y-50}")
+            except: pass
+            self.deiconify()
+        self.lift()
+        self.after(10, self.focus_force)
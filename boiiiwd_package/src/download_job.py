@@ -0,0 +1,123 @@
+from src.imports import *
+from src.helpers import *
+from src.retry_policy import RetryStats
+
+
+JOB_QUEUED = "queued"
+# waiting for steamcmd to report the download: login, a retry after a failed attempt, a cache reset
+JOB_RESOLVING = "resolving"
+JOB_DOWNLOADING = "downloading"
+JOB_INSTALLING = "installing"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+JOB_SKIPPED = "skipped"
+
+JOB_FINAL_STATES = (JOB_DONE, JOB_FAILED, JOB_SKIPPED)
+
+# an item steamcmd already has up to date can finish without ever reporting a download
+JOB_TRANSITIONS = {
+    JOB_QUEUED: (JOB_RESOLVING, JOB_FAILED, JOB_SKIPPED),
+    # back to queued: a stalled item sent to the back of the queue, or one making way for a more urgent item
+    JOB_RESOLVING: (JOB_QUEUED, JOB_RESOLVING, JOB_DOWNLOADING, JOB_INSTALLING, JOB_FAILED, JOB_SKIPPED),
+    JOB_DOWNLOADING: (JOB_QUEUED, JOB_RESOLVING, JOB_INSTALLING, JOB_FAILED, JOB_SKIPPED),
+    # the copy into boiii isn't interruptible, skip/stop wait for it to end
+    JOB_INSTALLING: (JOB_DONE, JOB_FAILED),
+}
+
+
+# one workshop item's way through a download, threads wait on its transitions instead of polling flags
+class DownloadJob:
+    def __init__(self, workshop_id, on_change=None, lane=0, size=0, install_folder=None):
+        self.workshop_id = str(workshop_id)
+        # scheduler lane (LANE_*), lower goes first, and the resolved size for shortest first ordering
+        self.lane = lane
+        self.size = size
+        # times it stalled and went to the back of its lane
+        self.requeues = 0
+        # folder of an installed item that gets updated in place (no workshop.json to find it by)
+        self.install_folder = install_folder
+        self.state = JOB_QUEUED
+        self.reason = None
+        self.changed = time.time()
+        self.download_started = 0
+        self.attempts = 0
+        self.retries = RetryStats()
+        # why the current attempt got cut short from outside (e.g. stalled), steamcmd only sees a kill
+        self.interruption = None
+        # steamcmd's content folder held the installed files before the download (delta update),
+        # so its existence doesn't mean steamcmd got anywhere
+        self.staged = False
+        self.on_change = on_change
+        self.condition = threading.Condition()
+
+    def __repr__(self):
+        return f"DownloadJob({self.workshop_id}, {self.state})"
+
+    @property
+    def finished(self):
+        return self.state in JOB_FINAL_STATES
+
+    @property
+    def fails(self):
+        return self.retries.total
+
+    @property
+    def downloading(self):
+        return self.state == JOB_DOWNLOADING
+
+    # returns False when the transition isn't allowed from the current state, e.g. skipping a finished item
+    def transition(self, state, reason=None):
+        with self.condition:
+            if state not in JOB_TRANSITIONS.get(self.state, ()):
+                return False
+            previous = self.state
+            self.state = state
+            self.reason = reason
+            self.changed = time.time()
+            if state == JOB_RESOLVING:
+                self.attempts += 1
+                self.download_started = 0
+            elif state == JOB_DOWNLOADING:
+                self.download_started = self.changed
+            self.condition.notify_all()
+        if self.on_change:
+            self.on_change(self, previous)
+        return True
+
+    # stop doesn't apply to an item that's already installing
+    def cancel(self, reason="Stopped"):
+        with self.condition:
+            if self.state == JOB_INSTALLING:
+                return False
+            return self.transition(JOB_FAILED, reason)
+
+    def interrupt(self, reason):
+        with self.condition:
+            self.interruption = reason
+            self.condition.notify_all()
+
+    def take_interruption(self):
+        with self.condition:
+            reason, self.interruption = self.interruption, None
+            return reason
+
+    # blocks until predicate(job) is true or timeout runs out, returns predicate(job)
+    def wait(self, predicate, timeout=None):
+        with self.condition:
+            return self.condition.wait_for(lambda: predicate(self), timeout)
+
+    def wait_for_state(self, *states, timeout=None):
+        return self.wait(lambda job: job.state in states, timeout)
+
+    # wakes up when the job leaves its current state
+    def wait_for_change(self, timeout=None):
+        state = self.state
+        return self.wait(lambda job: job.state != state, timeout)
+
+    def download_elapsed(self):
+        return time.time() - self.download_started if self.download_started else 0
+
+    # returns how many times the item failed with this class
+    def register_fail(self, failure_class):
+        with self.condition:
+            return self.retries.add(failure_class)
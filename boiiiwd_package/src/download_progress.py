@@ -0,0 +1,143 @@
+from src.imports import *
+from src.helpers import *
+from src.folder_size import FolderSizeTracker
+
+
+# the workshop page rounds sizes to 0.001 MB and its MB may be 1000² bytes where it's read as 1024²,
+# sizes within that of each other are the same size
+SIZE_UNIT_SLACK = 1 - 1000 ** 2 / 1024 ** 2
+SIZE_ROUNDING = 1024 * 1024 // 1000
+
+
+def sizes_match(actual, reported):
+    return abs(actual - reported) <= reported * SIZE_UNIT_SLACK + SIZE_ROUNDING
+
+
+class ItemProgress:
+    def __init__(self, workshop_id, size):
+        self.workshop_id = str(workshop_id)
+        self.bytes_total = size or 0
+        self.bytes_done = 0
+        # highest byte count steamcmd reported, the folder size counts too since the workshop log
+        # only reports one "download 0/total" per item
+        self.counter_done = 0
+        self.folders = ()
+        # one per folder, they remember what they saw so a sample only looks at what changed
+        self.trackers = ()
+        # the trackers aren't thread safe, the ui loop and the stall watchdog both sample them
+        self.sample_lock = threading.Lock()
+        self.finished = False
+        self.resized = False
+
+
+# bytes done/total per item and for the whole queue
+class QueueProgress:
+    def __init__(self, use_counters=True):
+        self.use_counters = use_counters
+        self.items = {}
+        self.lock = threading.Lock()
+
+    def add_item(self, workshop_id, size):
+        with self.lock:
+            self.items[str(workshop_id)] = ItemProgress(workshop_id, size)
+
+    def item(self, workshop_id):
+        with self.lock:
+            return self.items.get(str(workshop_id))
+
+    # download folder first (steamcmd's staging), then the content folder it ends up in
+    def set_folders(self, workshop_id, *folders):
+        item = self.item(workshop_id)
+        if item:
+            # a requeued item gets new folders, the old trackers' watches go first
+            self.close_trackers(item)
+            with item.sample_lock:
+                item.folders = folders
+                item.trackers = tuple(FolderSizeTracker(folder) for folder in folders)
+
+    def close_trackers(self, item):
+        with item.sample_lock:
+            for tracker in item.trackers:
+                tracker.close()
+            item.trackers = ()
+
+    # bytes in the item's folders right now, whatever steamcmd's counters say
+    def disk_size(self, workshop_id):
+        item = self.item(workshop_id)
+        if not item:
+            return 0
+        with item.sample_lock:
+            for tracker in item.trackers:
+                try:
+                    size = tracker.size()
+                except OSError:
+                    size = 0
+                if size:
+                    return size
+        return 0
+
+    # steamcmd's exact total replaces the workshop page's rounded one, its done bytes only count once they move
+    def on_counters(self, workshop_id, bytes_done, bytes_total):
+        item = self.item(workshop_id)
+        if not item or not self.use_counters or item.finished:
+            return
+        with self.lock:
+            if bytes_total:
+                item.resized = item.resized or bool(item.bytes_total and not sizes_match(bytes_total, item.bytes_total))
+                item.bytes_total = bytes_total
+            item.counter_done = max(item.counter_done, bytes_done or 0)
+            item.bytes_done = max(item.bytes_done, item.counter_done)
+            if item.bytes_total:
+                item.bytes_done = min(item.bytes_done, item.bytes_total)
+
+    # re-reads the staging folder, bytes done is the larger of it and steamcmd's counters,
+    # returns True once each time the item's size turned out to be different from the workshop's
+    def refresh(self, workshop_id):
+        item = self.item(workshop_id)
+        if not item or item.finished:
+            return False
+        size = self.disk_size(workshop_id)
+        with self.lock:
+            item.bytes_done = max(size, item.counter_done)
+            if item.bytes_done > item.bytes_total:
+                item.resized = item.resized or bool(item.bytes_total and not sizes_match(item.bytes_done, item.bytes_total))
+                item.bytes_total = item.bytes_done
+        with self.lock:
+            resized, item.resized = item.resized, False
+        return bool(resized)
+
+    def restart(self, workshop_id):
+        item = self.item(workshop_id)
+        if item:
+            with self.lock:
+                item.bytes_done = 0
+                item.counter_done = 0
+                item.finished = False
+
+    def finish(self, workshop_id):
+        item = self.item(workshop_id)
+        if item:
+            with self.lock:
+                item.bytes_done = item.bytes_total
+                item.finished = True
+            self.close_trackers(item)
+
+    # a skipped/failed item no longer counts towards the queue
+    def skip(self, workshop_id):
+        with self.lock:
+            item = self.items.pop(str(workshop_id), None)
+        if item:
+            self.close_trackers(item)
+
+    def totals(self):
+        with self.lock:
+            return (sum(item.bytes_done for item in self.items.values()),
+                    sum(item.bytes_total for item in self.items.values()))
+
+    def fraction(self, workshop_id=None):
+        if workshop_id is None:
+            done, total = self.totals()
+        else:
+            item = self.item(workshop_id)
+            done, total = (item.bytes_done, item.bytes_total) if item else (0, 0)
+        return min(done / total, 1) if total else 0
@@ -0,0 +1,142 @@
+from src.imports import *
+from src.helpers import *
+from src.steamcmd_session import SteamCMDSession, get_worker_install_dir, get_worker_steamcmd_dir
+from src.download_job import JOB_DOWNLOADING, JOB_FAILED, JOB_INSTALLING, JOB_QUEUED, JOB_RESOLVING, JOB_SKIPPED
+from src.scheduler import JobScheduler
+
+
+# runs a queue with N steamcmd sessions at once, each in its own install dir with its own copy of steamcmd
+class DownloadWorkerPool:
+    def __init__(self, steamcmd_path, workers, download_fn, on_download_started=None, on_event=None, scheduler=None):
+        self.workers = max(1, int(workers))
+        self.download_fn = download_fn
+        self.on_download_started = on_download_started
+        self.sessions = [SteamCMDSession(get_worker_steamcmd_dir(steamcmd_path, index, self.workers), on_download_started=self.mark_downloading, on_event=on_event,
+                                         install_dir=get_worker_install_dir(steamcmd_path, index, self.workers),
+                                         source_path=steamcmd_path if self.workers > 1 else None)
+                         for index in range(self.workers)]
+        self.lock = threading.Lock()
+        # idle workers wait here while others still run, items can be added (or sent back) until the last one ends
+        self.idle = threading.Condition(self.lock)
+        self.pending = scheduler or JobScheduler()
+        # workshop id -> {"worker", "started", "job"}
+        self.active = {}
+        self.jobs = {}
+        self.done_count = 0
+        self.stopped = False
+        self.finished = threading.Event()
+
+    # returns False when the queue already ended
+    def add_items(self, jobs):
+        with self.lock:
+            for job in jobs:
+                self.jobs[job.workshop_id] = job
+            added = self.pending.add_all(jobs)
+            self.idle.notify_all()
+        return added
+
+    def run(self):
+        self.finished.clear()
+        threads = [threading.Thread(target=self.worker, args=(index,), daemon=True) for index in range(self.workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.finished.set()
+
+    def worker(self, index):
+        session = self.sessions[index]
+        try:
+            while not self.stopped:
+                with self.lock:
+                    # the last worker to run out of items closes the queue
+                    job = self.pending.pop(close=not self.active)
+                    while job is None and self.active and not self.stopped:
+                        self.idle.wait()
+                        job = self.pending.pop(close=not self.active)
+                    if job is None or self.stopped:
+                        self.idle.notify_all()
+                        return
+                    workshop_id = job.workshop_id
+                    # a promoted item that another worker just picked up
+                    if workshop_id in self.active:
+                        continue
+                    self.active[workshop_id] = {"worker": index, "started": time.time(), "job": job}
+                try:
+                    self.download_fn(self, session, job)
+                except Exception as e:
+                    job.transition(JOB_FAILED, f"{e}")
+                    show_message("Error", f"Error while downloading {workshop_id}\n{e}", icon="cancel")
+                finally:
+                    with self.lock:
+                        self.active.pop(workshop_id, None)
+                        # stalled/preempted items go back to the queue, behind their lane
+                        if job.state == JOB_QUEUED and not self.stopped:
+                            self.pending.add(job)
+                        else:
+                            self.done_count += 1
+                        self.idle.notify_all()
+        finally:
+            session.close()
+
+    def job(self, workshop_id):
+        with self.lock:
+            return self.jobs.get(str(workshop_id))
+
+    def mark_downloading(self, workshop_id):
+        job = self.job(workshop_id)
+        if job:
+            job.transition(JOB_DOWNLOADING)
+        if self.on_download_started:
+            self.on_download_started(workshop_id)
+
+    # workshop id -> {"worker", "started", "job", "downloading", "installing"}
+    def snapshot(self):
+        with self.lock:
+            return {workshop_id: dict(item, downloading=item["job"].state == JOB_DOWNLOADING, installing=item["job"].state == JOB_INSTALLING)
+                    for workshop_id, item in self.active.items()}
+
+    def skipped(self):
+        with self.lock:
+            return {workshop_id for workshop_id, job in self.jobs.items() if job.state == JOB_SKIPPED}
+
+    def remaining(self):
+        with self.lock:
+            return len(self.pending) + len(self.active)
+
+    # active items of a lower priority lane than `lane`, the lowest lane and latest started first
+    def preemptible(self, lane):
+        with self.lock:
+            items = sorted(self.active.values(), key=lambda item: (-item["job"].lane, -item["started"]))
+            return [item["job"] for item in items if item["job"].lane > lane and item["job"].state in (JOB_RESOLVING, JOB_DOWNLOADING)]
+
+    # skips the item that has been running the longest, one that's already installing can't be skipped
+    def skip_current(self, on_done=None):
+        with self.lock:
+            active = [workshop_id for workshop_id, item in self.active.items() if item["job"].state != JOB_INSTALLING]
+            if not active:
+                return None
+            workshop_id = min(active, key=lambda i: self.active[i]["started"])
+            job = self.active[workshop_id]["job"]
+        if job.transition(JOB_SKIPPED, "Skipped"):
+            self.kill_item(workshop_id, on_done=on_done)
+        return workshop_id
+
+    # ends the steamcmd attempt of an active item, the worker's session logs in again for the next one
+    def kill_item(self, workshop_id, on_done=None):
+        with self.lock:
+            item = self.active.get(str(workshop_id))
+            session = self.sessions[item["worker"]] if item else None
+        if session:
+            session.kill(on_done=on_done)
+
+    def stop(self):
+        self.stopped = True
+        with self.lock:
+            jobs = list(self.jobs.values())
+            self.pending.close()
+            self.idle.notify_all()
+        for job in jobs:
+            job.cancel()
+        for session in self.sessions:
+            session.kill()
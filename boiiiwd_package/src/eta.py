@@ -0,0 +1,131 @@
+from src.imports import *
+from src.helpers import *
+
+
+ETA_LEARNING_RATE = 0.2
+
+
+# per host averages learned from past runs: fixed seconds per item that aren't spent downloading
+# (login, validate, install copy) and download throughput for when there's no live reading yet
+class ETAModel:
+    def __init__(self, overhead=15.0, throughput=0.0, samples=0):
+        self.overhead = overhead
+        self.throughput = throughput
+        self.samples = samples
+
+    @staticmethod
+    def model_path():
+        return os.path.join(APPLICATION_PATH, ETA_MODEL_FILE)
+
+    @classmethod
+    def load(cls):
+        try:
+            with open(cls.model_path(), "r") as file:
+                data = json.load(file).get(platform.node(), {})
+            return cls(float(data.get("overhead", 15.0)), float(data.get("throughput", 0.0)), int(data.get("samples", 0)))
+        except Exception:
+            return cls()
+
+    def save(self):
+        try:
+            with open(self.model_path(), "r") as file:
+                data = json.load(file)
+        except Exception:
+            data = {}
+        data[platform.node()] = {"overhead": round(self.overhead, 2), "throughput": round(self.throughput), "samples": self.samples}
+        try:
+            with open(self.model_path(), "w") as file:
+                json.dump(data, file, indent=4)
+        except OSError:
+            pass
+
+    def learn(self, overhead, throughput=None):
+        # the first run replaces the defaults, later ones move the average
+        rate = 1.0 if not self.samples else ETA_LEARNING_RATE
+        self.overhead += rate * (overhead - self.overhead)
+        if throughput:
+            self.throughput = throughput if not self.throughput else self.throughput + rate * (throughput - self.throughput)
+        self.samples += 1
+
+
+# item/queue ETA from the bytes left in QueueProgress, the live throughput and the learned per item overhead
+class QueueETA:
+    def __init__(self, progress, workers=1):
+        self.progress = progress
+        self.workers = max(1, workers)
+        self.model = ETAModel.load()
+        self.started = {}
+        self.download_started_at = {}
+        self.download_finished_at = {}
+        # when the install stage picked the item up, waiting in the install buffer isn't per item overhead
+        self.install_started_at = {}
+        self.lock = threading.Lock()
+
+    def item_started(self, workshop_id):
+        with self.lock:
+            self.started[str(workshop_id)] = time.time()
+
+    def download_started(self, workshop_id):
+        with self.lock:
+            self.download_started_at.setdefault(str(workshop_id), time.time())
+
+    def download_finished(self, workshop_id):
+        with self.lock:
+            self.download_finished_at[str(workshop_id)] = time.time()
+
+    def install_started(self, workshop_id):
+        with self.lock:
+            self.install_started_at[str(workshop_id)] = time.time()
+
+    # an installed item teaches the model, skipped/failed ones are just forgotten
+    def item_finished(self, workshop_id, learn=True):
+        workshop_id = str(workshop_id)
+        now = time.time()
+        with self.lock:
+            started = self.started.pop(workshop_id, None)
+            download_started = self.download_started_at.pop(workshop_id, None)
+            download_finished = self.download_finished_at.pop(workshop_id, None)
+            install_started = self.install_started_at.pop(workshop_id, None)
+        if not learn or not started or not download_started:
+            return
+        download_finished = download_finished or now
+        item = self.progress.item(workshop_id)
+        download_seconds = max(download_finished - download_started, 0)
+        throughput = item.bytes_total / download_seconds if item and item.bytes_total and download_seconds > 1 else None
+        self.model.learn((download_started - started) + (now - (install_started or download_finished)), throughput)
+
+    def save(self):
+        if self.model.samples:
+            self.model.save()
+
+    # returns (item_eta, queue_eta, finish timestamp), seconds or None when there's nothing to go on
+    def estimate(self, throughput, workshop_id=None):
+        rate = throughput if throughput and throughput > 1024 else self.model.throughput
+        with self.progress.lock:
+            items = list(self.progress.items.values())
+        with self.lock:
+            started = set(self.started)
+        if not items or not rate:
+            return None, None, None
+
+        remaining_bytes = sum(max(item.bytes_total - item.bytes_done, 0) for item in items if not item.finished)
+        not_started = sum(1 for item in items if not item.finished and item.workshop_id not in started)
+        queue_eta = remaining_bytes / rate + not_started * self.model.overhead / self.workers
+
+        item_eta = None
+        current = self.progress.item(workshop_id) if workshop_id else None
+        if current and not current.finished:
+            active = max(1, min(len(started), self.workers))
+            item_eta = max(current.bytes_total - current.bytes_done, 0) / (rate / active)
+        return item_eta, queue_eta, time.time() + queue_eta
+
+
+def format_eta(item_eta, queue_eta, finish_time):
+    if queue_eta is None:
+        return ""
+    hours, minutes, seconds = convert_seconds(queue_eta)
+    text = f" | ETA: {int(hours):02d}:{int(minutes):02d}:{int(seconds):02d}"
+    if item_eta is not None:
+        hours, minutes, seconds = convert_seconds(item_eta)
+        text += f" (item {int(hours):02d}:{int(minutes):02d}:{int(seconds):02d})"
+    return text + f" - Done at {datetime.fromtimestamp(finish_time).strftime('%H:%M')}"
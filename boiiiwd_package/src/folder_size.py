@@ -0,0 +1,225 @@
+from src.imports import *
+from src.helpers import *
+
+
+# without inotify, files that kept their size this many samples are only stat'ed again on a full rescan
+HOT_SAMPLES = 3
+FULL_RESCAN_EVERY = 10
+
+IN_MODIFY = 0x2
+IN_ATTRIB = 0x4
+IN_MOVED_FROM = 0x40
+IN_MOVED_TO = 0x80
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_DELETE_SELF = 0x400
+IN_MOVE_SELF = 0x800
+IN_Q_OVERFLOW = 0x4000
+IN_IGNORED = 0x8000
+IN_ISDIR = 0x40000000
+INOTIFY_MASK = IN_MODIFY | IN_ATTRIB | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF
+INOTIFY_EVENT = struct.Struct("iIII")
+
+
+# linux only: tells which files changed and which folders got entries added/removed since the last read
+class InotifyWatcher:
+    def __init__(self):
+        self.libc = ctypes.CDLL(None, use_errno=True)
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        # watch descriptor -> folder
+        self.watches = {}
+
+    # None where inotify isn't there (windows) or the watch limit is reached
+    @classmethod
+    def create(cls):
+        if not sys.platform.startswith("linux"):
+            return None
+        try:
+            return cls()
+        except (OSError, AttributeError):
+            return None
+
+    def watch(self, path):
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path), INOTIFY_MASK)
+        if wd < 0:
+            return False
+        self.watches[wd] = path
+        return True
+
+    # (changed files, folders to list again, lost track), losing track (queue overflow, a watched folder
+    # replaced) means everything has to be rescanned
+    def read(self):
+        changed, dirty, overflow = set(), set(), False
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            except OSError:
+                return changed, dirty, True
+            offset = 0
+            while offset + INOTIFY_EVENT.size <= len(data):
+                wd, mask, _, length = INOTIFY_EVENT.unpack_from(data, offset)
+                name = os.fsdecode(data[offset + INOTIFY_EVENT.size:offset + INOTIFY_EVENT.size + length].rstrip(b"\0"))
+                offset += INOTIFY_EVENT.size + length
+                if mask & (IN_Q_OVERFLOW | IN_DELETE_SELF | IN_MOVE_SELF):
+                    overflow = True
+                    continue
+                folder = self.watches.get(wd)
+                if mask & IN_IGNORED:
+                    self.watches.pop(wd, None)
+                if folder is None:
+                    continue
+                if mask & (IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO | IN_ISDIR):
+                    dirty.add(folder)
+                elif name:
+                    changed.add(os.path.join(folder, name))
+        return changed, dirty, overflow
+
+    def close(self):
+        if self.fd < 0:
+            return
+        try:
+            os.close(self.fd)
+        except OSError:
+            pass
+        self.fd = -1
+
+    # items that failed never get finish()ed
+    def __del__(self):
+        self.close()
+
+
+# size of a steamcmd staging folder (nested folders included) that only looks at what changed since the last sample:
+# inotify events where there are some, otherwise folders whose mtime changed and files that are still growing
+class FolderSizeTracker:
+    def __init__(self, folder, use_inotify=True):
+        self.folder = folder
+        self.watcher = InotifyWatcher.create() if use_inotify else None
+        # folder -> mtime_ns, files, subfolders of its last listing
+        self.folders = {}
+        # file -> size
+        self.files = {}
+        # file -> samples left before it's considered done growing
+        self.hot = {}
+        self.total = 0
+        self.samples = 0
+        self.scanned = False
+
+    def size(self):
+        self.samples += 1
+        if not os.path.isdir(self.folder):
+            if self.scanned:
+                self.reset()
+            return 0
+        if not self.scanned:
+            self.scan(self.folder, full=True)
+            self.scanned = True
+        elif self.watcher:
+            changed, dirty, overflow = self.watcher.read()
+            if overflow:
+                self.reset()
+                self.scan(self.folder, full=True)
+                self.scanned = True
+            else:
+                for folder in dirty:
+                    self.list_folder(folder)
+                for path in changed:
+                    self.stat_file(path)
+        else:
+            self.scan(self.folder, full=self.samples % FULL_RESCAN_EVERY == 0)
+            for path in list(self.hot):
+                self.stat_file(path)
+        return self.total
+
+    def reset(self):
+        self.folders.clear()
+        self.files.clear()
+        self.hot.clear()
+        self.total = 0
+        self.scanned = False
+        if self.watcher:
+            self.watcher.close()
+            self.watcher = InotifyWatcher.create()
+
+    def close(self):
+        if self.watcher:
+            self.watcher.close()
+            self.watcher = None
+
+    # walks the tree, only folders whose mtime changed (entries added/removed) get listed again
+    def scan(self, folder, full=False):
+        try:
+            mtime = os.stat(folder).st_mtime_ns
+        except OSError:
+            self.forget_folder(folder)
+            return
+        known = self.folders.get(folder)
+        if full or not known or known[0] != mtime:
+            self.list_folder(folder)
+        for subfolder in self.folders.get(folder, (0, (), ()))[2]:
+            self.scan(subfolder, full)
+
+    def list_folder(self, folder):
+        files, subfolders = set(), []
+        try:
+            mtime = os.stat(folder).st_mtime_ns
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subfolders.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            files.add(entry.path)
+                            self.set_file(entry.path, entry.stat(follow_symlinks=False).st_size)
+                    except OSError:
+                        continue
+        except OSError:
+            self.forget_folder(folder)
+            return
+
+        known = self.folders.get(folder)
+        if known:
+            for path in known[1] - files:
+                self.forget_file(path)
+            for subfolder in set(known[2]) - set(subfolders):
+                self.forget_folder(subfolder)
+        if self.watcher and not known:
+            self.watcher.watch(folder)
+        self.folders[folder] = (mtime, files, subfolders)
+        # folders that just showed up get listed right away, inotify only reports them as a change of their parent
+        for subfolder in subfolders:
+            if subfolder not in self.folders:
+                self.list_folder(subfolder)
+
+    def stat_file(self, path):
+        try:
+            self.set_file(path, os.stat(path).st_size)
+        except OSError:
+            self.forget_file(path)
+
+    def set_file(self, path, size):
+        previous = self.files.get(path)
+        if previous != size:
+            self.hot[path] = HOT_SAMPLES
+        elif path in self.hot:
+            self.hot[path] -= 1
+            if self.hot[path] <= 0:
+                del self.hot[path]
+        self.files[path] = size
+        self.total += size - (previous or 0)
+
+    def forget_file(self, path):
+        self.total -= self.files.pop(path, 0)
+        self.hot.pop(path, None)
+
+    def forget_folder(self, folder):
+        known = self.folders.pop(folder, None)
+        if not known:
+            return
+        for path in known[1]:
+            self.forget_file(path)
+        for subfolder in known[2]:
+            self.forget_folder(subfolder)
@@ -3,12 +3,30 @@ from src.imports import *
 
 # Start helper functions
 
+# workshop id -> {"api": api response, "details": details record, "time": last fetch}, filled by the prefetcher
+metadata_cache = {}
+metadata_cache_lock = threading.Lock()
+METADATA_CACHE_TTL = 600
+
 #testing app offline
 # import socket
 # def guard(*args, **kwargs):
 #     pass
 # socket.socket = guard
 
+def get_cached_metadata(workshop_id, key):
+    with metadata_cache_lock:
+        entry = metadata_cache.get(str(workshop_id))
+        if entry and key in entry and time.time() - entry["time"] < METADATA_CACHE_TTL:
+            return entry[key]
+    return None
+
+def set_cached_metadata(workshop_id, key, value):
+    with metadata_cache_lock:
+        entry = metadata_cache.setdefault(str(workshop_id), {"time": time.time()})
+        entry[key] = value
+        entry["time"] = time.time()
+
 def check_config(name, fallback=None):
     config = configparser.ConfigParser()
     config.read(CONFIG_FILE_PATH)
@@ -145,6 +163,15 @@ def extract_workshop_id(link):
     except:
         return None
 
+# id or link that looks like a workshop item, without asking steam
+def parse_workshop_id(text):
+    text = str(text).strip()
+    if not text.isdigit():
+        text = extract_workshop_id(text) or ""
+    if text.isdigit() and 6 <= len(text) <= 20:
+        return text
+    return None
+
 def check_steamcmd():
     steamcmd_path = get_steamcmd_path()
     steamcmd_exe_path = os.path.join(steamcmd_path, "steamcmd.exe")
@@ -220,6 +247,12 @@ def convert_bytes_to_readable(size_in_bytes, no_symb=None):
         size_in_bytes /= 1024.0
 
 def get_workshop_file_size(workshop_id, raw=None):
+    details = get_cached_metadata(workshop_id, "details")
+    if details and details.get("size_bytes") is not None:
+        if raw:
+            return convert_bytes_to_readable(details["size_bytes"])
+        return details["size_bytes"]
+
     url = f"https://steamcommunity.com/sharedfiles/filedetails/?id={workshop_id}&searchtext="
     response = requests.get(url)
     soup = BeautifulSoup(response.text, "html.parser")
@@ -243,6 +276,86 @@ def get_workshop_file_size(workshop_id, raw=None):
     except:
         return None
 
+# scrapes the workshop page once and returns the record the details window is filled from
+def get_item_details(workshop_id, use_cache=True):
+    if use_cache:
+        details = get_cached_metadata(workshop_id, "details")
+        if details:
+            return dict(details)
+
+    headers = {'Cache-Control': 'no-cache'}
+    url = f"https://steamcommunity.com/sharedfiles/filedetails/?id={workshop_id}"
+    response = requests.get(url, headers=headers)
+    response.raise_for_status()
+    soup = BeautifulSoup(response.text, "html.parser")
+
+    try:
+        type_txt = soup.find("div", class_="rightDetailsBlock").text.strip()
+        map_mod_type = type_txt if "File Size" not in type_txt else "Not specified"
+        map_name = soup.find("div", class_="workshopItemTitle").text.strip()
+        details_stats_container = soup.find("div", class_="detailsStatsContainerRight")
+        details_stat_elements = details_stats_container.find_all("div", class_="detailsStatRight")
+        try:
+            file_size_text = details_stat_elements[0].get_text(strip=True).replace(",", "")
+            file_size_bytes = int(float(file_size_text.replace(" MB", "")) * 1024 * 1024)
+        except:
+            file_size_bytes = None
+        date_created = details_stat_elements[1].text.strip()
+        try:
+            ratings = soup.find('div', class_='numRatings')
+            ratings_text = ratings.get_text()
+        except:
+            ratings_text = "Not enough ratings"
+        try:
+            date_updated = details_stat_elements[2].text.strip()
+        except:
+            date_updated = "Not updated"
+        try:
+            description = soup.find('div', class_='workshopItemDescription').get_text(separator='\n')
+        except:
+            description = "Not available"
+
+        stars_div = soup.find("div", class_="fileRatingDetails")
+        starts = stars_div.find("img")["src"]
+    except:
+        raise ValueError("Couldn't get information.")
+
+    try:
+        preview_image_element = soup.find("img", id="previewImage")
+        workshop_item_image_url = preview_image_element["src"]
+    except:
+        try:
+            preview_image_element = soup.find("img", id="previewImageMain")
+            workshop_item_image_url = preview_image_element["src"]
+        except Exception as e:
+            raise ValueError(f"Failed to get preview image ,probably wrong link/id if not please open an issue on github.\n{e}")
+
+    starts_image_response = requests.get(starts)
+    stars_image = Image.open(io.BytesIO(starts_image_response.content))
+
+    image_response = requests.get(workshop_item_image_url)
+    image_response.raise_for_status()
+    image = Image.open(io.BytesIO(image_response.content))
+    image.load()
+    stars_image.load()
+
+    details = {
+        "workshop_id": workshop_id,
+        "url": url,
+        "name": map_name,
+        "type": map_mod_type,
+        "size": convert_bytes_to_readable(file_size_bytes) if file_size_bytes is not None else "Unknown",
+        "size_bytes": file_size_bytes,
+        "date_created": date_created,
+        "date_updated": date_updated,
+        "ratings_text": ratings_text,
+        "description": description,
+        "image": image,
+        "stars_image": stars_image,
+    }
+    set_cached_metadata(workshop_id, "details", details)
+    return dict(details)
+
 def show_message(title, message, icon="warning", _return=False, option_1="No", option_2="Ok"):
     if _return:
         msg = CTkMessagebox(title=title, message=message, icon=icon, option_1=option_1, option_2=option_2, sound=True)
@@ -282,6 +395,34 @@ def remove_tree(folder_path, show_error=None):
     except Exception as e:
         pass
 
+# closest existing folder of a path that may not exist yet
+def existing_parent(path):
+    path = os.path.abspath(path)
+    while not os.path.exists(path) and os.path.dirname(path) != path:
+        path = os.path.dirname(path)
+    return path
+
+def same_volume(path1, path2):
+    try:
+        return os.stat(existing_parent(path1)).st_dev == os.stat(existing_parent(path2)).st_dev
+    except OSError:
+        return False
+
+# moves src into dst with renames only (same volume), files already in dst get replaced
+def move_tree(src, dst):
+    if os.path.isdir(dst) and not os.listdir(dst):
+        os.rmdir(dst)
+    if not os.path.exists(dst):
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+        os.replace(src, dst)
+        return
+    for root, _, files in os.walk(src):
+        target_root = os.path.join(dst, os.path.relpath(root, src))
+        os.makedirs(target_root, exist_ok=True)
+        for name in files:
+            os.replace(os.path.join(root, name), os.path.join(target_root, name))
+    remove_tree(src)
+
 def convert_seconds(seconds):
     minutes, seconds = divmod(seconds, 60)
     hours, minutes = divmod(minutes, 60)
@@ -402,6 +543,9 @@ def save_window_size_to_registry(width, height, x, y):
         print(f"Error saving to registry: {e}")
 
 def item_steam_api(id):
+    cached = get_cached_metadata(id, "api")
+    if cached:
+        return cached
     try:
         url = ITEM_INFO_API
         data = {
@@ -409,7 +553,9 @@ def item_steam_api(id):
             "publishedfileids[0]": int(id),
         }
         info = requests.post(url, data=data)
-        return info.json()
+        response_data = info.json()
+        set_cached_metadata(id, "api", response_data)
+        return response_data
 
     except Exception as e:
         print(e)
@@ -436,4 +582,100 @@ def get_item_dates(ids):
         print(e)
         return {}
 
+# resolves many items in one request, invalid/removed ids are left out of the result
+def get_items_details(ids):
+    try:
+        data = {
+            "itemcount": len(ids),
+        }
+        for i, id in enumerate(ids):
+            data[f"publishedfileids[{i}]"] = int(id)
+
+        info = requests.post(ITEM_INFO_API, data=data)
+        response_data = info.json()
+
+        if "response" in response_data:
+            item_details = response_data["response"].get("publishedfiledetails", [])
+            resolved = {item["publishedfileid"]: item for item in item_details if item.get("result") == 1}
+            # same shape as a single item_steam_api() response so later lookups hit the cache
+            for item_id, item in resolved.items():
+                set_cached_metadata(item_id, "api", {"response": {"result": 1, "resultcount": 1, "publishedfiledetails": [item]}})
+            return resolved
+
+        return {}
+
+    except Exception as e:
+        print(e)
+        return {}
+
+def library_item_type(item_text):
+    match = re.search(r'Type:\s*(\w+)', item_text)
+    return match.group(1).lower() if match else "None"
+
+def library_date_to_timestamp(date):
+    try:
+        return int(datetime.strptime(date, "%d %b, %Y @ %I:%M%p").timestamp())
+    except:
+        return 0
+
+def export_library_manifest(items_file, manifest_path):
+    with open(items_file, 'r') as f:
+        lib_data = json.load(f)
+
+    lib_items = [item for item in lib_data if str(item.get("id", "None")).isdigit()]
+    workshop_items = get_items_details([item["id"] for item in lib_items]) if lib_items else {}
+
+    manifest_items = []
+    for item in lib_items:
+        details = workshop_items.get(item["id"], {})
+        manifest_items.append({
+            "id": item["id"],
+            "folder_name": item.get("folder_name", ""),
+            "type": library_item_type(item.get("text", "")),
+            # workshop's time_updated when online, falls back to when the item was installed
+            "time_updated": details.get("time_updated") or library_date_to_timestamp(item.get("date", "")),
+        })
+
+    manifest = {
+        "boiiiwd_version": VERSION,
+        "created": int(time.time()),
+        "items": manifest_items,
+    }
+    with open(manifest_path, 'w') as f:
+        json.dump(manifest, f, indent=4)
+
+    return len(manifest_items)
+
+def load_library_manifest(manifest_path):
+    with open(manifest_path, 'r') as f:
+        manifest = json.load(f)
+
+    items = manifest.get("items", []) if isinstance(manifest, dict) else manifest
+    return [item for item in items if str(item.get("id", "")).strip().isdigit()]
+
+# returns (missing, outdated) ids of the manifest compared to the local library file
+def diff_library_manifest(manifest_items, items_file):
+    local_dates = {}
+    if os.path.exists(items_file):
+        with open(items_file, 'r') as f:
+            local_dates = {item["id"]: item.get("date", "") for item in json.load(f) if "id" in item}
+
+    missing = []
+    outdated = []
+    for item in manifest_items:
+        item_id = str(item["id"]).strip()
+        if item_id in missing or item_id in outdated:
+            continue
+        if item_id not in local_dates:
+            missing.append(item_id)
+            continue
+        try:
+            time_updated = datetime.fromtimestamp(int(item.get("time_updated", 0)))
+        except:
+            continue
+        if check_item_date(local_dates[item_id], time_updated):
+            outdated.append(item_id)
+
+    return missing, outdated
+
 # End helper functions
@@ -1,9 +1,15 @@
 import configparser
+import ctypes
+import hashlib
+import heapq
 import io
+import itertools
 import math
 import os
+import platform
 import re
 import shutil
+import struct
 import subprocess
 import sys
 import threading
@@ -11,6 +17,8 @@ import time
 import webbrowser
 import zipfile
 
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 from tkinter import END, Event, Menu
@@ -43,6 +51,14 @@ GITHUB_REPO = "faroukbmiled/BOIIIWD"
 ITEM_INFO_API = "https://api.steampowered.com/ISteamRemoteStorage/GetPublishedFileDetails/v1/"
 LATEST_RELEASE_URL = "https://github.com/faroukbmiled/BOIIIWD/releases/latest/download/Release.zip"
 LIBRARY_FILE = "boiiiwd_library.json"
+MANIFEST_FILE = "boiiiwd_manifest.json"
+THROUGHPUT_FILE = "boiiiwd_throughput.jsonl"
+ETA_MODEL_FILE = "boiiiwd_eta.json"
+RETRIES_FILE = "boiiiwd_retries.jsonl"
+STALLS_FILE = "boiiiwd_stalls.jsonl"
+HASH_CACHE_FILE = "boiiiwd_hashes.json"
+QUEUE_JOURNAL_FILE = "boiiiwd_queue.json"
+UI_REFRESH_INTERVAL = 1
 RESOURCES_DIR = os.path.join(os.path.dirname(__file__), '..', 'resources')
 UPDATER_FOLDER = "update"
 REGISTRY_KEY_PATH = r"Software\BOIIIWD"
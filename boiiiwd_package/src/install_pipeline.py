@@ -0,0 +1,88 @@
+from src.imports import *
+from src.helpers import *
+from src.download_job import JOB_FAILED
+
+
+DEFAULT_BUFFER_ITEMS = 2
+DEFAULT_BUFFER_SIZE = 10
+
+
+# (items, bytes) downloaded items can pile up to before the downloads wait for the installer
+def get_install_buffer_limits():
+    try:
+        items = max(int(check_config("install_buffer_items", str(DEFAULT_BUFFER_ITEMS))), 1)
+    except ValueError:
+        items = DEFAULT_BUFFER_ITEMS
+    try:
+        size = max(float(check_config("install_buffer_size", str(DEFAULT_BUFFER_SIZE))), 0)
+    except ValueError:
+        size = DEFAULT_BUFFER_SIZE
+    return items, int(size * 1024 ** 3)
+
+
+# install stage of the queue: downloaded items wait here (still in steamcmd's folders) and get installed one at a
+# time on their own thread, so steamcmd moves on to the next item instead of waiting for the copy
+class InstallPipeline:
+    def __init__(self, install_fn, max_items=None, max_bytes=None):
+        default_items, default_bytes = get_install_buffer_limits()
+        self.install_fn = install_fn
+        self.max_items = max_items or default_items
+        self.max_bytes = default_bytes if max_bytes is None else max_bytes
+        # (job, size, args), an item stays in here until it's installed
+        self.pending = deque()
+        self.staged_bytes = 0
+        self.closed = False
+        self.condition = threading.Condition()
+        self.thread = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+        return self
+
+    @property
+    def backlog(self):
+        with self.condition:
+            return len(self.pending)
+
+    def has_room(self, size):
+        # an item bigger than the whole buffer still gets in once it's empty
+        if not self.pending:
+            return True
+        return len(self.pending) < self.max_items and (not self.max_bytes or self.staged_bytes + size <= self.max_bytes)
+
+    # blocks while the buffer is full, install_fn(job, *args) gets called for it later
+    def put(self, job, size, *args):
+        with self.condition:
+            self.condition.wait_for(lambda: self.has_room(size))
+            self.pending.append((job, size, args))
+            self.staged_bytes += size
+            self.condition.notify_all()
+
+    def run(self):
+        while True:
+            with self.condition:
+                self.condition.wait_for(lambda: self.pending or self.closed)
+                if not self.pending:
+                    return
+                job, size, args = self.pending[0]
+            try:
+                self.install_fn(job, *args)
+            except Exception as e:
+                job.transition(JOB_FAILED, f"{e}")
+                show_message("Error", f"Error while installing {job.workshop_id}\n{e}", icon="cancel")
+            finally:
+                with self.condition:
+                    self.pending.popleft()
+                    self.staged_bytes -= size
+                    self.condition.notify_all()
+
+    # no more items, the ones already in get installed
+    def close(self):
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+
+    def join(self):
+        if self.thread:
+            self.thread.join()
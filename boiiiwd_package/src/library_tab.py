@@ -1,5 +1,6 @@
 from src.imports import *
 from src.helpers import *
+from src.scheduler import LANE_INTERACTIVE, LANE_UPDATE
 
 import src.shared_vars as main_app
 
@@ -16,7 +17,21 @@ class LibraryTab(ctk.CTkScrollableFrame):
         self.no_items_label = ctk.CTkLabel(self, text="", anchor="w")
         self.filter_entry = ctk.CTkEntry(self, placeholder_text="Your search query here, or type in mod or map to only see that")
         self.filter_entry.bind("<KeyRelease>", self.filter_items)
-        self.filter_entry.grid(row=0, column=0,  padx=(10, 20), pady=(10, 20), sticky="we")
+        self.filter_entry.grid(row=0, column=0,  padx=(10, 100), pady=(10, 20), sticky="we")
+        self.actions_button = ctk.CTkButton(self, text="Actions", width=65, height=24, fg_color="#3d3f42", command=self.show_actions_menu)
+        self.actions_button.grid(row=0, column=0, padx=(0, 20), pady=(10, 20), sticky="e")
+        self.actions_menu = Menu(self, tearoff=False, background='#565b5e', fg='white', borderwidth=0, bd=0)
+        self.actions_menu.add_command(label="Select all (shown)", command=self.select_all_items)
+        self.actions_menu.add_command(label="Clear selection", command=self.clear_selection)
+        self.actions_menu.add_separator()
+        self.actions_menu.add_command(label="Remove selected", command=self.remove_selected)
+        self.actions_menu.add_command(label="Update selected (redownload)", command=self.update_selected)
+        self.actions_menu.add_command(label="Open selected", command=self.open_selected)
+        self.actions_menu.add_command(label="Copy selected IDs", command=self.copy_selected_ids)
+        self.actions_menu.add_separator()
+        self.actions_menu.add_command(label="Export manifest", command=self.export_manifest)
+        self.actions_menu.add_command(label="Import manifest", command=self.import_manifest)
+        actions_tooltip = CTkToolTip(self.actions_button, message="Bulk actions on selected items, Export/Import a library manifest", topmost=True)
         filter_refresh_button_image = os.path.join(RESOURCES_DIR, "Refresh_icon.svg.png")
         update_button_image = os.path.join(RESOURCES_DIR, "update_icon.png")
         self.filter_refresh_button = ctk.CTkButton(self, image=ctk.CTkImage(Image.open(filter_refresh_button_image)), command=self.refresh_items, width=20, height=20,
@@ -31,6 +46,10 @@ class LibraryTab(ctk.CTkScrollableFrame):
         self.label_list = []
         self.button_list = []
         self.button_view_list = []
+        self.checkbox_list = []
+        # folder path -> row widgets/info, avoids looping over every label to find an item
+        self.rows = {}
+        self.bulk_job_running = False
         self.file_cleaned = False
         self.filter_type = True
         self.clipboard_has_content = False
@@ -40,6 +59,8 @@ class LibraryTab(ctk.CTkScrollableFrame):
         self.refresh_next_time = False
 
     def add_item(self, item, image=None, workshop_id=None, folder=None, invalid_warn=False):
+        checkbox_var = ctk.BooleanVar()
+        checkbox = ctk.CTkCheckBox(self, text="", variable=checkbox_var, width=20, checkbox_width=18, checkbox_height=18)
         label = ctk.CTkLabel(self, text=item, image=image, compound="left", padx=5, anchor="w")
         button = ctk.CTkButton(self, text="Remove", width=60, height=24, fg_color="#3d3f42")
         button_view = ctk.CTkButton(self, text="Details", width=55, height=24, fg_color="#3d3f42")
@@ -47,14 +68,18 @@ class LibraryTab(ctk.CTkScrollableFrame):
         button_view.configure(command=lambda: self.show_map_info(workshop_id, folder ,invalid_warn))
         button_view_tooltip = CTkToolTip(button_view, message="Opens up a window that shows basic details")
         button_tooltip = CTkToolTip(button, message="Removes the map/mod from your game")
-        label.grid(row=len(self.label_list) + 1, column=0, pady=(0, 10), padx=(5, 10), sticky="w")
+        checkbox.grid(row=len(self.checkbox_list) + 1, column=0, pady=(0, 10), padx=(10, 0), sticky="w")
+        label.grid(row=len(self.label_list) + 1, column=0, pady=(0, 10), padx=(35, 10), sticky="w")
         button.grid(row=len(self.button_list) + 1, column=1, pady=(0, 10), padx=(50, 10), sticky="e")
         button_view.grid(row=len(self.button_view_list) + 1, column=1, pady=(0, 10), padx=(10, 75), sticky="w")
+        self.checkbox_list.append(checkbox)
         self.label_list.append(label)
         self.button_list.append(button)
         self.button_view_list.append(button_view)
-        label.bind("<Enter>", lambda event, label=label: self.on_label_hover(label, enter=True))
-        label.bind("<Leave>", lambda event, label=label: self.on_label_hover(label, enter=False))
+        self.rows[str(folder)] = {"item": item, "folder": folder, "id": workshop_id, "var": checkbox_var,
+                                  "checkbox": checkbox, "label": label, "button": button, "button_view": button_view}
+        label.bind("<Enter>", lambda event, label=label: self.on_label_hover(label, enter=True, workshop_id=workshop_id))
+        label.bind("<Leave>", lambda event, label=label: self.on_label_hover(label, enter=False, workshop_id=workshop_id))
         label.bind("<Button-1>", lambda event, label=label: self.copy_to_clipboard(label, workshop_id, event))
         label.bind("<Control-Button-1>", lambda event, label=label: self.copy_to_clipboard(label, workshop_id, event, append=True))
         label.bind("<Button-2>", lambda event: self.open_folder_location(folder, event))
@@ -62,11 +87,15 @@ class LibraryTab(ctk.CTkScrollableFrame):
         if invalid_warn:
             label_warn = CTkToolTip(label, message="Duplicated or Blocked item (Search item id in search)")
 
-    def on_label_hover(self, label, enter):
+    def on_label_hover(self, label, enter, workshop_id=None):
         if enter:
             label.configure(fg_color="#272727")
+            # pointer resting on a row, have Details ready before it's clicked
+            if workshop_id and parse_workshop_id(workshop_id):
+                main_app.app.prefetcher.prefetch(workshop_id, delay=0.8)
         else:
             label.configure(fg_color="transparent")
+            main_app.app.prefetcher.cancel()
 
     def copy_to_clipboard(self, label, something, event=None, append=False):
         try:
@@ -211,13 +240,15 @@ class LibraryTab(ctk.CTkScrollableFrame):
 
     def filter_items(self, event):
         filter_text = self.filter_entry.get().lower()
-        for label, button, button_view_list in zip(self.label_list, self.button_list, self.button_view_list):
+        for checkbox, label, button, button_view_list in zip(self.checkbox_list, self.label_list, self.button_list, self.button_view_list):
             item_text = label.cget("text").lower()
             if filter_text in item_text:
+                checkbox.grid()
                 label.grid()
                 button.grid()
                 button_view_list.grid()
             else:
+                checkbox.grid_remove()
                 label.grid_remove()
                 button_view_list.grid_remove()
                 button.grid_remove()
@@ -424,32 +455,168 @@ class LibraryTab(ctk.CTkScrollableFrame):
         except Exception as e:
             show_message("Error updating json file", f"Error while updating library json file\n{e}")
 
+    def remove_items_by_options(self, items_file, options, option_name="id"):
+        if not os.path.exists(items_file) or not options:
+            return
+
+        with open(items_file, "r") as f:
+            items_data = json.load(f)
+
+        updated_items_data = [item for item in items_data if item.get(option_name) not in options]
+
+        if len(updated_items_data) < len(items_data):
+            with open(items_file, "w") as f:
+                json.dump(updated_items_data, f, indent=4)
+
     def remove_item(self, item, folder, id):
-        items_file = os.path.join(APPLICATION_PATH, LIBRARY_FILE)
-        for label, button, button_view_list in zip(self.label_list, self.button_list, self.button_view_list):
-            if item == label.cget("text"):
-                self.added_folders.remove(os.path.basename(folder))
+        row = self.rows.get(str(folder))
+        if row:
+            self.remove_rows([row])
+
+    def destroy_row(self, row):
+        for widget_list, widget in ((self.checkbox_list, row["checkbox"]), (self.label_list, row["label"]),
+                                    (self.button_list, row["button"]), (self.button_view_list, row["button_view"])):
+            widget.destroy()
+            if widget in widget_list:
+                widget_list.remove(widget)
+        self.rows.pop(str(row["folder"]), None)
+        self.added_items.discard(row["item"])
+        self.added_folders.discard(os.path.basename(row["folder"]))
+        self.ids_added.discard(row["id"])
+
+    # deletes folders concurrently off the Tk thread, then writes the library file once
+    def remove_rows(self, rows):
+        if self.bulk_job_running:
+            show_message("Please wait", "Another library operation is still running.")
+            return
+        self.bulk_job_running = True
+        for row in rows:
+            row["button"].configure(state="disabled", text="...")
+
+        def remove_thread():
+            removed = []
+            failed = []
+            try:
+                with ThreadPoolExecutor(max_workers=min(8, len(rows))) as executor:
+                    futures = {executor.submit(shutil.rmtree, row["folder"]): row for row in rows}
+                    for future in as_completed(futures):
+                        row = futures[future]
+                        try:
+                            future.result()
+                            removed.append(row)
+                        except FileNotFoundError:
+                            removed.append(row)
+                        except Exception as e:
+                            failed.append((row, e))
+
+                items_file = os.path.join(APPLICATION_PATH, LIBRARY_FILE)
                 try:
-                    shutil.rmtree(folder)
+                    self.remove_items_by_options(items_file, {os.path.basename(row["folder"]) for row in removed}, "folder_name")
                 except Exception as e:
-                    show_message("Error" ,f"Error removing folder '{folder}': {e}", icon="cancel")
-                    return
-                label.destroy()
-                button.destroy()
-                button_view_list.destroy()
-                self.label_list.remove(label)
-                self.button_list.remove(button)
-                self.added_items.remove(label.cget("text"))
-                self.ids_added.remove(id)
-                self.button_view_list.remove(button_view_list)
-                self.remove_item_by_option(items_file, id)
+                    show_message("Error updating json file", f"Error while updating library json file\n{e}")
+            finally:
+                main_app.app.after(0, lambda: finish(removed, failed))
+
+        def finish(removed, failed):
+            for row in removed:
+                self.destroy_row(row)
+            for row, _ in failed:
+                row["button"].configure(state="normal", text="Remove")
+            self.bulk_job_running = False
+            if failed:
+                errors = "\n".join(f"{row['folder']}: {e}" for row, e in failed[:5])
+                show_message("Error", f"Couldn't remove {len(failed)} item(s):\n{errors}", icon="cancel")
+            if not self.rows:
+                self.show_no_items_message()
+
+        threading.Thread(target=remove_thread, daemon=True).start()
+
+    def get_selected_rows(self):
+        return [row for row in self.rows.values() if row["var"].get()]
+
+    def select_all_items(self):
+        for row in self.rows.values():
+            if row["label"].winfo_ismapped():
+                row["var"].set(True)
+
+    def clear_selection(self):
+        for row in self.rows.values():
+            row["var"].set(False)
+
+    def no_selection_noti(self):
+        cevent = Event()
+        cevent.x_root = self.actions_button.winfo_rootx()
+        cevent.y_root = self.actions_button.winfo_rooty()
+        show_noti(self.actions_button, "Please select 1 or more items", event=cevent, noti_dur=1.0, topmost=True)
+
+    def remove_selected(self):
+        rows = self.get_selected_rows()
+        if not rows:
+            self.no_selection_noti()
+            return
+        if show_message("Remove items", f"Remove {len(rows)} selected item(s) from your game?", _return=True, option_1="No", option_2="Remove"):
+            self.remove_rows(rows)
+
+    def update_selected(self):
+        rows = self.get_selected_rows()
+        if not rows:
+            self.no_selection_noti()
+            return
+        ids = [row["id"] for row in rows if str(row["id"]).isdigit()]
+        if not ids:
+            show_message("Warning", "None of the selected items have a valid Workshop ID.")
+            return
+        self.download_items(ids)
+
+    def open_selected(self):
+        rows = self.get_selected_rows()
+        if not rows:
+            self.no_selection_noti()
+            return
+        for row in rows:
+            if os.path.exists(row["folder"]):
+                os.startfile(row["folder"])
+
+    def copy_selected_ids(self):
+        rows = self.get_selected_rows()
+        if not rows:
+            self.no_selection_noti()
+            return
+        ids = [str(row["id"]) for row in rows if str(row["id"]).isdigit()]
+        self.clipboard_clear()
+        self.clipboard_append(",".join(ids))
+        self.clipboard_has_content = True
+        cevent = Event()
+        cevent.x_root = self.actions_button.winfo_rootx()
+        cevent.y_root = self.actions_button.winfo_rooty()
+        show_noti(self.actions_button, f"Copied {len(ids)} IDs to clipboard", event=cevent, noti_dur=1.0, topmost=True)
+
+    # single id goes through the main tab, many go through the queue, while something downloads they're added to it
+    def download_items(self, ids):
+        if main_app.app.is_pressed or main_app.app.is_downloading:
+            main_app.app.enqueue_download(ids, LANE_UPDATE)
+            return True
+        if len(ids) == 1:
+            main_app.app.edit_workshop_id.delete(0, "end")
+            main_app.app.edit_workshop_id.insert(0, ids[0])
+            main_app.app.main_button_event()
+        else:
+            main_app.app.queuetextarea.configure(state="normal")
+            main_app.app.queuetextarea.delete("1.0", "end")
+            main_app.app.queuetextarea.insert("1.0", ",".join(ids))
+            main_app.app.queue_button_event()
+        main_app.app.download_map(update=True)
+        return True
 
     def refresh_items(self):
         main_app.app.title("BOIII Workshop Downloader - Library  ➜  Loading... ⏳")
-        for label, button, button_view_list in zip(self.label_list, self.button_list, self.button_view_list):
+        for checkbox, label, button, button_view_list in zip(self.checkbox_list, self.label_list, self.button_list, self.button_view_list):
+            checkbox.destroy()
             label.destroy()
             button.destroy()
             button_view_list.destroy()
+        self.checkbox_list.clear()
+        self.rows.clear()
         self.label_list.clear()
         self.button_list.clear()
         self.button_view_list.clear()
@@ -461,6 +628,99 @@ class LibraryTab(ctk.CTkScrollableFrame):
         # main_app library event needs a return for status => when refresh_next_time is true
         return status
 
+    def show_actions_menu(self):
+        try:
+            x = self.actions_button.winfo_rootx()
+            y = self.actions_button.winfo_rooty() + self.actions_button.winfo_height()
+            self.actions_menu.tk_popup(x, y)
+        finally:
+            self.actions_menu.grab_release()
+
+    # load_items() builds widgets, a worker thread has it run on the Tk thread and waits for it
+    def reload_items_and_wait(self):
+        done = threading.Event()
+        def main_thread():
+            try:
+                self.load_items(main_app.app.edit_destination_folder.get(), dont_add=True)
+            finally:
+                done.set()
+        main_app.app.after(0, main_thread)
+        done.wait()
+
+    def export_manifest(self):
+        items_file = os.path.join(APPLICATION_PATH, LIBRARY_FILE)
+        manifest_path = ctk.filedialog.asksaveasfilename(title="Export library manifest", initialfile=MANIFEST_FILE,
+                                                         defaultextension=".json", filetypes=[("JSON", "*.json")])
+        if not manifest_path:
+            return
+
+        def export_thread():
+            try:
+                # make sure the json file reflects what's on disk
+                self.reload_items_and_wait()
+                if not os.path.exists(items_file):
+                    show_message("Nothing to export", "No library items found, make sure you have the right boiii folder selected.")
+                    return
+                count = export_library_manifest(items_file, manifest_path)
+                show_message("Manifest exported", f"{count} items were written to:\n{manifest_path}", icon="info")
+            except Exception as e:
+                show_message("Error", f"Error while exporting manifest\n{e}", icon="cancel")
+
+        threading.Thread(target=export_thread).start()
+
+    def import_manifest(self):
+        if main_app.app.is_pressed:
+            show_message("Error", "Please wait for the current download to finish or stop it then start.", icon="cancel")
+            return
+
+        items_file = os.path.join(APPLICATION_PATH, LIBRARY_FILE)
+        manifest_path = ctk.filedialog.askopenfilename(title="Import library manifest", filetypes=[("JSON", "*.json")])
+        if not manifest_path:
+            return
+
+        def import_thread():
+            try:
+                manifest_items = load_library_manifest(manifest_path)
+            except Exception as e:
+                show_message("Error", f"Couldn't read manifest file\n{e}", icon="cancel")
+                return
+
+            if not manifest_items:
+                show_message("Empty manifest", "No valid items found in the selected manifest.")
+                return
+
+            self.reload_items_and_wait()
+            missing, outdated = diff_library_manifest(manifest_items, items_file)
+            to_queue = missing + outdated
+
+            if not to_queue:
+                show_message("Up to date!", "All manifest items are already installed and up to date!", icon="info")
+                return
+
+            if not if_internet_available("return"):
+                show_message("Offline", "No internet connection. Please check your internet connection and try again.")
+                return
+
+            # resolve everything in one request, drop items that no longer exist on the workshop
+            resolved = get_items_details(to_queue)
+            invalid = [item_id for item_id in to_queue if item_id not in resolved]
+            to_queue = [item_id for item_id in to_queue if item_id in resolved]
+
+            def start_queue():
+                message = f"Missing: {len([i for i in missing if i in resolved])} - Outdated: {len([i for i in outdated if i in resolved])}"
+                if invalid:
+                    message += f"\nSkipped (not found on workshop): {', '.join(invalid)}"
+                if not to_queue:
+                    show_message("Nothing to download", message)
+                    return
+                if not show_message("Manifest imported", f"{message}\n\nDownload {len(to_queue)} items now?", icon="info", _return=True, option_1="No", option_2="Download"):
+                    return
+                self.download_items(to_queue)
+
+            main_app.app.after(0, start_queue)
+
+        threading.Thread(target=import_thread).start()
+
     def view_item(self, workshop_id):
         url = f"https://steamcommunity.com/sharedfiles/filedetails/?id={workshop_id}"
         webbrowser.open(url)
@@ -507,74 +767,22 @@ class LibraryTab(ctk.CTkScrollableFrame):
 
             if online and valid_id!=False:
                 try:
-                    url = f"https://steamcommunity.com/sharedfiles/filedetails/?id={workshop_id}"
-                    response = requests.get(url)
-                    response.raise_for_status()
-                    content = response.text
-
-                    soup = BeautifulSoup(content, "html.parser")
-
-                    try:
-                        type_txt = soup.find("div", class_="rightDetailsBlock").text.strip()
-                        map_mod_type = type_txt if "File Size" not in type_txt else "Not specified"
-                        map_name = soup.find("div", class_="workshopItemTitle").text.strip()
-                        details_stats_container = soup.find("div", class_="detailsStatsContainerRight")
-                        details_stat_elements = details_stats_container.find_all("div", class_="detailsStatRight")
-                        date_created = details_stat_elements[1].text.strip()
-                        try:
-                            ratings = soup.find('div', class_='numRatings')
-                            ratings_text = ratings.get_text()
-                        except:
-                            ratings = "Not found"
-                            ratings_text= "Not enough ratings"
-                        try:
-                            date_updated = details_stat_elements[2].text.strip()
-                        except:
-                            date_updated = "Not updated"
-                        try:
-                            description = soup.find('div', class_='workshopItemDescription').get_text(separator='\n')
-                        except:
-                            description = "Not available"
-
-                        stars_div = soup.find("div", class_="fileRatingDetails")
-                        starts = stars_div.find("img")["src"]
-                    except:
-                        show_message("Warning", "Couldn't get information.")
-                        for button_view in self.button_view_list:
-                            button_view.configure(state="normal")
-                        return
-
-                    try:
-                        preview_image_element = soup.find("img", id="previewImage")
-                        workshop_item_image_url = preview_image_element["src"]
-                    except:
-                        try:
-                            preview_image_element = soup.find("img", id="previewImageMain")
-                            workshop_item_image_url = preview_image_element["src"]
-                        except Exception as e:
-                            show_message("Warning", f"Failed to get preview image ,probably wrong link/id if not please open an issue on github.\n{e}")
-                            for button_view in self.button_view_list:
-                                button_view.configure(state="normal")
-                            return
-
-                    starts_image_response = requests.get(starts)
-                    stars_image = Image.open(io.BytesIO(starts_image_response.content))
-                    stars_image_size = stars_image.size
-
-                    image_response = requests.get(workshop_item_image_url)
-                    image_response.raise_for_status()
-                    image = Image.open(io.BytesIO(image_response.content))
-                    image_size = image.size
-
-                    self.toplevel_info_window(map_name, map_mod_type, map_size, image, image_size, date_created,
-                                            date_updated, stars_image, stars_image_size, ratings_text,
-                                            url, workshop_id, invalid_warn, folder, description, online)
-
+                    details = get_item_details(workshop_id)
+                    # the rest may come from the prefetch cache, the update check needs the current date_updated
+                    time_updated = get_item_dates([workshop_id]).get(str(workshop_id))
+                    if time_updated:
+                        details["date_updated"] = datetime.fromtimestamp(time_updated).strftime("%d %b, %Y @ %I:%M%p")
+                except ValueError as e:
+                    show_message("Warning", f"{e}")
+                    main_app.app.after(0, self.enable_details_buttons)
+                    return
                 except Exception as e:
                     show_message("Error", f"Failed to fetch information.\nError: {e}", icon="cancel")
-                    for button_view in self.button_view_list:
-                        button_view.configure(state="normal")
+                    main_app.app.after(0, self.enable_details_buttons)
                     return
+
+                details["size"] = map_size
+                self.toplevel_info_window(details, invalid_warn, folder, online)
             else:
                 creation_timestamp = None
                 for ff_file in json_path.parent.glob("*.ff"):
@@ -588,256 +796,90 @@ class LibraryTab(ctk.CTkScrollableFrame):
                     workshop_id = extract_json_data(json_path, "PublisherID") or "None"
                     name = re.sub(r'\^\w+', '', extract_json_data(json_path, "Title")) or "None"
                     map_name = name[:45] + "..." if len(name) > 45 else name
-                    map_mod_type = extract_json_data(json_path, "Type") or "None"
                     preview_iamge = json_path.parent / "previewimage.png"
                     if preview_iamge.exists():
                         image = Image.open(preview_iamge)
                     else:
                         image = Image.open(os.path.join(RESOURCES_DIR, "default_library_img.png"))
-                    image_size = image.size
-                    offline_date = datetime.fromtimestamp(creation_timestamp).strftime("%d %b, %Y @ %I:%M%p")
-                    date_updated = "Offline"
-                    date_created = "Offline"
-                    stars_image = Image.open(os.path.join(RESOURCES_DIR, "ryuk.png"))
-                    stars_image_size = stars_image.size
-                    ratings_text = "Offline"
                     description = re.sub(r'\^\w+', '', extract_json_data(json_path, "Description")) or "Not available"
                     description = re.sub(r'\[.*?\]', '', description)
-                    url = f"https://steamcommunity.com/sharedfiles/filedetails/?id={workshop_id}"
 
-                    self.toplevel_info_window(map_name, map_mod_type, map_size, image, image_size, date_created,
-                                            date_updated, stars_image, stars_image_size, ratings_text,
-                                            url, workshop_id, invalid_warn, folder, description, online ,offline_date)
+                    details = {
+                        "workshop_id": workshop_id,
+                        "url": f"https://steamcommunity.com/sharedfiles/filedetails/?id={workshop_id}",
+                        "name": map_name,
+                        "type": extract_json_data(json_path, "Type") or "None",
+                        "size": map_size,
+                        "date_created": "Offline",
+                        "date_updated": "Offline",
+                        "ratings_text": "Offline",
+                        "description": description,
+                        "image": image,
+                        "stars_image": Image.open(os.path.join(RESOURCES_DIR, "ryuk.png")),
+                    }
+                    offline_date = datetime.fromtimestamp(creation_timestamp).strftime("%d %b, %Y @ %I:%M%p")
+                    self.toplevel_info_window(details, invalid_warn, folder, online, offline_date)
                 else:
                     show_message("Warning", "Couldn't get offline information, Please connect to internet and try again")
-                    for button_view in self.button_view_list:
-                        button_view.configure(state="normal")
+                    main_app.app.after(0, self.enable_details_buttons)
                     return
 
         info_thread = threading.Thread(target=show_map_thread)
         info_thread.start()
 
-    def toplevel_info_window(self, map_name, map_mod_type_txt, map_size, image, image_size,
-                             date_created ,date_updated, stars_image, stars_image_size, ratings_text,
-                             url, workshop_id, invalid_warn, folder, description ,online,offline_date=None):
-        def main_thread():
-            try:
-                items_file = os.path.join(APPLICATION_PATH, LIBRARY_FILE)
-                top = ctk.CTkToplevel(self)
-                if os.path.exists(os.path.join(RESOURCES_DIR, "ryuk.ico")):
-                    top.after(210, lambda: top.iconbitmap(os.path.join(RESOURCES_DIR, "ryuk.ico")))
-                top.title("Map/Mod Information")
-                _, _, x, y = get_window_size_from_registry()
-                top.geometry(f"+{x+50}+{y-50}")
-                top.maxsize(450, 10000)
-                top.minsize(300, 500)
-                # top.attributes('-topmost', 'true')
-
-                if offline_date:
-                    down_date = offline_date
-                elif invalid_warn:
-                    try:
-                        zone_path = Path(folder) / "zone"
-                        for ff_file in zone_path.glob("*.ff"):
-                            if ff_file.exists():
-                                creation_timestamp = ff_file.stat().st_mtime
-                                break
-                        down_date = datetime.fromtimestamp(creation_timestamp).strftime("%d %b, %Y @ %I:%M%p")
-                    except:
-                        down_date = "Failed to get download date"
-                else:
-                    down_date = self.get_item_by_id(items_file, workshop_id, 'date')
-
-                def close_window():
-                    top.destroy()
-
-                def view_map_mod():
-                    webbrowser.open(url)
+    def enable_details_buttons(self):
+        for button_view in self.button_view_list:
+            button_view.configure(state="normal")
 
-                def show_description(event):
-                    def main_thread():
-                        description_window = ctk.CTkToplevel(None)
+    def toplevel_info_window(self, details, invalid_warn, folder, online, offline_date=None):
+        items_file = os.path.join(APPLICATION_PATH, LIBRARY_FILE)
+        workshop_id = details["workshop_id"]
 
-                        if os.path.exists(os.path.join(RESOURCES_DIR, "ryuk.ico")):
-                            description_window.after(210, lambda: description_window.iconbitmap(os.path.join(RESOURCES_DIR, "ryuk.ico")))
+        if offline_date:
+            down_date = offline_date
+        elif invalid_warn:
+            try:
+                zone_path = Path(folder) / "zone"
+                for ff_file in zone_path.glob("*.ff"):
+                    if ff_file.exists():
+                        creation_timestamp = ff_file.stat().st_mtime
+                        break
+                down_date = datetime.fromtimestamp(creation_timestamp).strftime("%d %b, %Y @ %I:%M%p")
+            except:
+                down_date = "Failed to get download date"
+        else:
+            down_date = self.get_item_by_id(items_file, workshop_id, 'date')
 
-                        description_window.attributes('-topmost', 'true')
-                        description_window.title(f"Description - {map_name}")
-                        x_pos = event.x_root - 300
-                        y_pos = event.y_root - 200
-                        calc_req_width = len(description) * 6 + 5
-                        win_width = calc_req_width if calc_req_width < 500 else 500
-                        description_window.geometry(f"{win_width + 5}x300+{x_pos}+{y_pos}")
+        details.update({
+            "folder": folder,
+            "invalid_warn": invalid_warn,
+            "online": online,
+            "down_date": down_date,
+            "on_update": self.check_item_for_update,
+        })
 
-                        if check_config("theme", "boiiiwd_theme.json") == "boiiiwd_obsidian.json":
-                            description_label = ctk.CTkTextbox(description_window, activate_scrollbars=True, scrollbar_button_color="#5b6c7f")
-                        else:
-                            description_label = ctk.CTkTextbox(description_window, activate_scrollbars=True)
-                        description_label.insert("1.0", description)
-                        description_label.pack(fill=ctk.BOTH, expand=True, padx=(10, 10), pady=(10, 10))
-                        description_label.configure(state="disabled")
-
-                        main_app.app.create_context_menu(description_label, textbox=True)
-                        description_window.after(50, description_window.focus_set)
-
-                    main_app.app.after(0, main_thread)
-
-                def check_for_updates():
-                    try:
-
-                        if check_item_date(down_date, date_updated, format=True):
-                            if show_message("There is an update.", "Press download to redownload!", icon="info", _return=True, option_1="No", option_2="Download"):
-                                if main_app.app.is_downloading:
-                                    show_message("Error", "Please wait for the current download to finish or stop it then restart.", icon="cancel")
-                                    return
-                                main_app.app.edit_workshop_id.delete(0, "end")
-                                main_app.app.edit_workshop_id.insert(0, workshop_id)
-                                main_app.app.main_button_event()
-                                if invalid_warn and check_config("update_invalid", "no") == "yes":
-                                    main_app.app.download_map(update=True, invalid_item_folder=os.path.basename(folder))
-                                else:
-                                    main_app.app.download_map(update=True)
-                                top.destroy()
-                                return
-                        else:
-                            show_message("Up to date!", "No updates found!", icon="info")
-                    except:
-                        show_message("Up to date!", "No updates found!", icon="info")
-
-                def show_full_text(event, widget, full_text):
-                    widget_text = type_label.cget("text")
-                    label_type = widget_text.split(':')[0]
-                    # + 30 which is desc_threshold + 5 is the ... dots and a white space
-                    if len(widget_text) == len(label_type) + 30 + 5:
-                        widget.configure(text=f"{label_type}: {full_text}")
-                    else:
-                        widget.configure(text=f"{label_type}: {full_text[:30]}...")
-
-                # frames
-                stars_frame = ctk.CTkFrame(top)
-                stars_frame.grid(row=0, column=0, columnspan=2, padx=20, pady=(20, 0), sticky="nsew")
-                stars_frame.columnconfigure(0, weight=0)
-                stars_frame.rowconfigure(0, weight=1)
-
-                image_frame = ctk.CTkFrame(top)
-                image_frame.grid(row=1, column=0, columnspan=2, padx=20, pady=0, sticky="nsew")
-
-                info_frame = ctk.CTkFrame(top)
-                info_frame.grid(row=2, column=0, columnspan=2, padx=20, pady=20, sticky="nsew")
-
-                buttons_frame = ctk.CTkFrame(top)
-                buttons_frame.grid(row=3, column=0, columnspan=2, padx=20, pady=(0, 20), sticky="nsew")
-
-                # fillers
-                name_label = ctk.CTkLabel(info_frame, text=f"Name: {map_name}", wraplength=420, justify="left")
-                name_label.grid(row=0, column=0, columnspan=2, sticky="w", padx=20, pady=2.5)
-
-                desc_threshold = 30
-                shortened_description = re.sub(r'[\\/\n\r]', '', description).strip()
-                shortened_description = re.sub(r'([^a-zA-Z0-9\s:().])', '', shortened_description)
-                shortened_description = f"{shortened_description[:desc_threshold]}... (View)"\
-                                        if len(shortened_description) > desc_threshold else shortened_description
-                description_lab = ctk.CTkLabel(info_frame, text=f"Description: {shortened_description}")
-                description_lab.grid(row=1, column=0, columnspan=2, sticky="w", padx=20, pady=2.5)
-                if len(description) > desc_threshold:
-                    description_lab_tooltip = CTkToolTip(description_lab, message="View description", topmost=True)
-                    description_lab.configure(cursor="hand2")
-                    description_lab.bind("<Button-1>", lambda e: show_description(e))
-
-                id_label = ctk.CTkLabel(info_frame, text=f"ID: {workshop_id} | Folder: {os.path.basename(folder)}")
-                id_label.grid(row=2, column=0, columnspan=2, sticky="w", padx=20, pady=2.5)
-
-                map_mod_type = map_mod_type_txt[:desc_threshold] + "..." if len(map_mod_type_txt) > desc_threshold else map_mod_type_txt
-                type_label = ctk.CTkLabel(info_frame, text=f"Type: {map_mod_type}", wraplength=350, justify="left")
-                type_label.grid(row=3, column=0, columnspan=2, sticky="w", padx=20, pady=2.5)
-                if len(map_mod_type) > desc_threshold:
-                    type_label_tooltip = CTkToolTip(type_label, message="View all types", topmost=True)
-                    type_label.configure(cursor="hand2")
-                    type_label.bind("<Button-1>", lambda e: show_full_text(e, type_label, map_mod_type_txt))
-
-                size_label = ctk.CTkLabel(info_frame, text=f"Size: {map_size}")
-                size_label.grid(row=4, column=0, columnspan=2, sticky="w", padx=20, pady=2.5)
-
-                date_created_label = ctk.CTkLabel(info_frame, text=f"Posted: {date_created}")
-                date_created_label.grid(row=5, column=0, columnspan=2, sticky="w", padx=20, pady=2.5)
-
-                if date_updated != "Not updated" and date_updated != "Offline":
-                    date_updated_label = ctk.CTkLabel(info_frame, text=f"Updated: {date_updated}  🔗")
-                    date_updated_label_tooltip = CTkToolTip(date_updated_label, message="View changelogs", topmost=True)
-                    date_updated_label.configure(cursor="hand2")
-                    date_updated_label.bind("<Button-1>", lambda e:
-                        webbrowser.open(f"https://steamcommunity.com/sharedfiles/filedetails/changelog/{workshop_id}"))
-                else:
-                    date_updated_label = ctk.CTkLabel(info_frame, text=f"Updated: {date_updated}")
-                date_updated_label.grid(row=6, column=0, columnspan=2, sticky="w", padx=20, pady=2.5)
-
-                date_updated_label = ctk.CTkLabel(info_frame, text=f"Downloaded: {down_date}")
-                date_updated_label.grid(row=7, column=0, columnspan=2, sticky="w", padx=20, pady=2.5)
-
-                stars_image_label = ctk.CTkLabel(stars_frame)
-                stars_width, stars_height = stars_image_size
-                stars_image_widget = ctk.CTkImage(stars_image, size=(int(stars_width), int(stars_height)))
-                stars_image_label.configure(image=stars_image_widget, text="")
-                stars_image_label.pack(side="left", padx=(10, 20), pady=(10, 10))
-
-                ratings = ctk.CTkLabel(stars_frame)
-                ratings.configure(text=ratings_text)
-                ratings.pack(side="right", padx=(10, 20), pady=(10, 10))
-
-                image_label = ctk.CTkLabel(image_frame)
-                max_width = 300
-                i_width, i_height = tuple([int(max_width/image_size[0] * x)  for x in image_size])
-                # preview image is too big if offline, // to round floats
-
-                image_widget = ctk.CTkImage(image, size=(int(i_width), int(i_height)))
-                image_label.configure(image=image_widget, text="")
-                image_label.pack(expand=True, fill="both", padx=(10, 20), pady=(10, 10))
-
-                # Buttons
-                view_button = ctk.CTkButton(buttons_frame, text="View", command=view_map_mod, width=130)
-                view_button.grid(row=0, column=0, padx=(20, 20), pady=(10, 10), sticky="n")
-                view_button_tooltip = CTkToolTip(view_button, message="View Workshop", topmost=True)
-
-                update_btn = ctk.CTkButton(buttons_frame, text="Update", command=check_for_updates, width=130)
-                update_btn.grid(row=0, column=1, padx=(10, 20), pady=(10, 10), sticky="n")
-                update_btn_tooltip = CTkToolTip(update_btn, message="Checks and installs updates of the current selected item (redownload!)", topmost=True)
-
-                close_button = ctk.CTkButton(buttons_frame, text="Close", command=close_window, width=130)
-                close_button.grid(row=0, column=2, padx=(10, 20), pady=(10, 10), sticky="n")
-
-                if not online:
-                    view_button.configure(state="disabled")
-                    update_btn.configure(state="disabled")
-                    update_btn_tooltip.configure(message="Currently offline")
-                    view_button_tooltip.configure(message="Currently offline")
-                if check_config("update_invalid", "no") == "yes":
-                    update_btn_tooltip.configure(message="update_invalid is set to 'yes' in config.ini")
-                elif invalid_warn:
-                    update_btn.configure(text="Update", state="disabled")
-                    update_btn_tooltip.configure(message="Disabled due to item being blocked or duplicated")
-
-                if not workshop_id.isdigit():
-                    view_button.configure(text="View", state="disabled")
-                    view_button_tooltip.configure(message="Not a valid Workshop ID")
-
-                top.grid_rowconfigure(0, weight=0)
-                top.grid_rowconfigure(1, weight=0)
-                top.grid_rowconfigure(2, weight=1)
-                top.grid_columnconfigure(0, weight=1)
-                top.grid_columnconfigure(1, weight=1)
-
-                buttons_frame.grid_rowconfigure(0, weight=1)
-                buttons_frame.grid_rowconfigure(1, weight=1)
-                buttons_frame.grid_rowconfigure(2, weight=1)
-                buttons_frame.grid_columnconfigure(0, weight=1)
-                buttons_frame.grid_columnconfigure(1, weight=1)
-                buttons_frame.grid_columnconfigure(2, weight=1)
+        main_app.app.show_details_window(details, callback=self.enable_details_buttons)
 
-            finally:
-                top.after(10, top.focus_force)
-                for button_view in self.button_view_list:
-                    button_view.configure(state="normal")
-        main_app.app.after(0, main_thread)
+    # called by the details window update button, returning True hides the window
+    def check_item_for_update(self, details):
+        try:
+            if check_item_date(details["down_date"], details["date_updated"], format=True):
+                if show_message("There is an update.", "Press download to redownload!", icon="info", _return=True, option_1="No", option_2="Download"):
+                    invalid_item_folder = os.path.basename(details["folder"]) if details["invalid_warn"] and check_config("update_invalid", "no") == "yes" else None
+                    # the user is waiting on this one, it goes ahead of what's downloading
+                    if main_app.app.is_pressed or main_app.app.is_downloading:
+                        main_app.app.enqueue_download([details["workshop_id"]], LANE_INTERACTIVE, invalid_item_folder)
+                        return True
+                    main_app.app.edit_workshop_id.delete(0, "end")
+                    main_app.app.edit_workshop_id.insert(0, details["workshop_id"])
+                    main_app.app.main_button_event()
+                    main_app.app.download_map(update=True, invalid_item_folder=invalid_item_folder)
+                    return True
+            else:
+                show_message("Up to date!", "No updates found!", icon="info")
+        except:
+            show_message("Up to date!", "No updates found!", icon="info")
+        return False
 
     @if_internet_available
     def check_for_updates(self, on_launch=False):
@@ -979,27 +1021,9 @@ class LibraryTab(ctk.CTkScrollableFrame):
                 self.select_all_bool = True
 
             def update_btn_fun():
-                if len(selected_id_list) == 1:
-                    if main_app.app.is_downloading:
-                        show_message("Error", "Please wait for the current download to finish or stop it then start.", icon="cancel")
-                        return
-                    main_app.app.edit_workshop_id.delete(0, "end")
-                    main_app.app.edit_workshop_id.insert(0, selected_id_list[0])
-                    main_app.app.main_button_event()
-                    main_app.app.download_map(update=True)
-                    top.destroy()
-                    return
-
-                elif len(selected_id_list) > 1:
-                    if main_app.app.is_downloading:
-                        show_message("Error", "Please wait for the current download to finish or stop it then start.", icon="cancel")
-                        return
-                    comma_separated_ids = ",".join(selected_id_list)
-                    main_app.app.queuetextarea.delete("1.0", "end")
-                    main_app.app.queuetextarea.insert("1.0", comma_separated_ids)
-                    main_app.app.queue_button_event()
-                    main_app.app.download_map(update=True)
-                    top.destroy()
+                if selected_id_list:
+                    if self.download_items(list(selected_id_list)):
+                        top.destroy()
                     return
 
                 else:
@@ -1,13 +1,33 @@
 from src.update_window import check_for_updates_func
 from src.helpers import *
 
+from src.details_window import DetailsWindow
 from src.library_tab import LibraryTab
+from src.prefetch import MetadataPrefetcher
+from src.steamcmd_output import EVENT_DOWNLOAD_STARTED, EVENT_FAILURE, EVENT_PROGRESS, EVENT_SUCCESS, SteamCMDOutputParser, WorkshopLogFollower
+from src.steamcmd_session import SteamCMDSession, build_steamcmd_command, get_staging_dir, get_workshop_folders, get_workshop_log_path
+from src.throughput import ThroughputMeter
+from src.download_progress import QueueProgress
+from src.download_workers import DownloadWorkerPool
+from src.eta import QueueETA, format_eta
+from src.retry_policy import RetryPolicy, failure_hint, record_retries
+from src.stall_watchdog import StallWatchdog, get_stall_settings, record_stall
+from src.copy_engine import HashCache, TreeCopier, remove_dropped_files
+from src.delta_staging import delta_updates_enabled, find_installed_zone, remove_other_stagings, stage_installed_item
+from src.install_pipeline import InstallPipeline
+from src.ui_bus import UIUpdateBus
+from src.queue_journal import QueueJournal
+from src.scheduler import JobScheduler, LANE_BULK, LANE_INTERACTIVE, LANE_UPDATE, preemption_enabled
+from src.download_job import DownloadJob, JOB_DONE, JOB_DOWNLOADING, JOB_FAILED, JOB_INSTALLING, JOB_QUEUED, JOB_RESOLVING, JOB_SKIPPED
+from src.process_supervisor import process_supervisor
 from src.settings_tab import SettingsTab
 
 
 class BOIIIWD(ctk.CTk):
     def __init__(self):
         super().__init__()
+        # download threads update widgets through this, never directly
+        self.ui = UIUpdateBus(self, is_visible=lambda: self.slider_progressbar_frame.winfo_ismapped()).start()
 
         # configure window
         self.title("BOIII Workshop Downloader - Main")
@@ -122,7 +142,7 @@ class BOIIIWD(ctk.CTk):
         self.button_download = ctk.CTkButton(master=self.slider_progressbar_frame, text="Download", command=self.download_map)
         self.button_download.grid(row=4, column=0, padx=20, pady=(5, 20), columnspan=2, sticky="ew")
 
-        self.button_stop = ctk.CTkButton(master=self.slider_progressbar_frame, text="Stop", command=self.stop_download)
+        self.button_stop = ctk.CTkButton(master=self.slider_progressbar_frame, text="Stop", command=self.stop_button_event)
         self.button_stop.grid(row=4, column=2, padx=(0, 20), pady=(5, 20), columnspan=1, sticky="w")
 
         # options frame
@@ -179,11 +199,31 @@ class BOIIIWD(ctk.CTk):
         self.hide_settings_widgets()
         self.button_stop.configure(state="disabled")
         self.is_pressed = False
+        # a download/queue thread is running, set until its cleanup is done
+        self.download_running = False
         self.queue_enabled = False
-        self.queue_stop_button = False
-        self.is_downloading = False
-        self.item_skipped = False
-        self.fail_threshold = 0
+        self.details_window = None
+        self.prefetcher = MetadataPrefetcher()
+        self.steamcmd_session = None
+        self.install_lock = threading.Lock()
+        self.download_pool = None
+        self.download_progress = None
+        self.queue_eta = None
+        # workshop id -> DownloadJob of the current download/queue
+        self.download_jobs = {}
+        self.current_job = None
+        self.stall_watchdog = None
+        self.install_pipeline = None
+        # pending items of the running queue, None while no queue takes new items
+        self.download_scheduler = None
+        # (workshop ids, lane, install folder) asked for while a download that isn't a queue runs
+        self.waiting_downloads = []
+        # the waiting ones a queue was started for, the queue takes them over (lanes, install folders) once it opens
+        self.starting_downloads = []
+        self.scheduler_lock = threading.Lock()
+        self.queue_journal = QueueJournal.load()
+        # the window is closing: stopped items stay resumable
+        self.closing = False
 
         # sidebar windows bouttons
         self.sidebar_main.configure(command=self.main_button_event, text="Main ⬇️", fg_color=(self.active_color), state="active")
@@ -233,6 +273,9 @@ class BOIIIWD(ctk.CTk):
         if self.settings_tab.check_items_var.get():
             self.library_tab.check_for_updates(on_launch=True)
 
+        if self.queue_journal.resumable():
+            self.after(1000, self.offer_queue_resume)
+
     def do_popup(self, event, frame):
         try: frame.tk_popup(event.x_root, event.y_root)
         finally: frame.grab_release()
@@ -333,11 +376,18 @@ class BOIIIWD(ctk.CTk):
     def on_closing(self):
         save_config("DestinationFolder" ,self.edit_destination_folder.get())
         save_config("SteamCMDPath" ,self.edit_steamcmd_path.get())
+        self.closing = True
         self.stop_download(on_close=True)
+        self.queue_journal.flush()
         os._exit(0)
 
     def id_chnaged_handler(self, some=None, other=None ,shit=None):
-        self.after(1, self.label_file_size.configure(text=f"File size: 0KB"))
+        self.label_file_size.configure(text=f"File size: 0KB")
+        workshop_id = parse_workshop_id(self.check_if_changed.get())
+        if workshop_id:
+            self.prefetcher.prefetch(workshop_id)
+        else:
+            self.prefetcher.cancel()
 
     def check_for_updates(self):
         check_for_updates_func(self, ignore_up_todate=False)
@@ -579,419 +629,551 @@ class BOIIIWD(ctk.CTk):
                 except:
                     show_message("Warning", "Please enter a valid Workshop ID/Link.")
                     return
-            if self.button_download._state == "normal":
-                self.after(1, lambda mid=workshop_id: self.label_file_size.configure(text=f"File size: {get_workshop_file_size(mid ,raw=True)}"))
 
             try:
-                headers = {'Cache-Control': 'no-cache'}
-                url = f"https://steamcommunity.com/sharedfiles/filedetails/?id={workshop_id}"
-                response = requests.get(url, headers=headers)
-                response.raise_for_status()
-                content = response.text
-
-                soup = BeautifulSoup(content, "html.parser")
-
-                try:
-                    type_txt = soup.find("div", class_="rightDetailsBlock").text.strip()
-                    map_mod_type = type_txt if "File Size" not in type_txt else "Not specified"
-                    map_name = soup.find("div", class_="workshopItemTitle").text.strip()
-                    map_size = map_size = get_workshop_file_size(workshop_id, raw=True)
-                    details_stats_container = soup.find("div", class_="detailsStatsContainerRight")
-                    details_stat_elements = details_stats_container.find_all("div", class_="detailsStatRight")
-                    date_created = details_stat_elements[1].text.strip()
-                    try:
-                        ratings = soup.find('div', class_='numRatings')
-                        ratings_text = ratings.get_text()
-                    except:
-                        ratings = "Not found"
-                        ratings_text= "Not enough ratings"
-                    try:
-                        date_updated = details_stat_elements[2].text.strip()
-                    except:
-                        date_updated = "Not updated"
-                    try:
-                            description = soup.find('div', class_='workshopItemDescription').get_text(separator='\n')
-                    except:
-                        description = "Not available"
-
-                    stars_div = soup.find("div", class_="fileRatingDetails")
-                    starts = stars_div.find("img")["src"]
-                except:
-                    show_message("Warning", "Please enter a valid Workshop ID/Link\nCouldn't get information.")
-                    return
-
-                try:
-                    preview_image_element = soup.find("img", id="previewImage")
-                    workshop_item_image_url = preview_image_element["src"]
-                except:
-                    try:
-                        preview_image_element = soup.find("img", id="previewImageMain")
-                        workshop_item_image_url = preview_image_element["src"]
-                    except Exception as e:
-                        show_message("Warning", f"Failed to get preview image ,probably wrong link/id if not please open an issue on github.\n{e}")
-                        return
-
-                starts_image_response = requests.get(starts)
-                stars_image = Image.open(io.BytesIO(starts_image_response.content))
-                stars_image_size = stars_image.size
-
-                image_response = requests.get(workshop_item_image_url)
-                image_response.raise_for_status()
-                image = Image.open(io.BytesIO(image_response.content))
-                image_size = image.size
-
-                self.toplevel_info_window(map_name, map_mod_type, map_size, image, image_size, date_created ,
-                                        date_updated, stars_image, stars_image_size, ratings_text, url, workshop_id, description)
-
+                details = get_item_details(workshop_id)
+            except ValueError as e:
+                show_message("Warning", f"Please enter a valid Workshop ID/Link\n{e}")
+                return
             except requests.exceptions.RequestException as e:
                 show_message("Error", f"Failed to fetch map information.\nError: {e}", icon="cancel")
                 return
 
+            if self.button_download._state == "normal":
+                self.after(0, lambda size=details["size"]: self.label_file_size.configure(text=f"File size: {size}"))
+
+            self.show_details_window(details)
+
         info_thread = threading.Thread(target=show_map_thread)
         info_thread.start()
 
-    def toplevel_info_window(self, map_name, map_mod_type_txt, map_size, image, image_size,
-                             date_created ,date_updated, stars_image, stars_image_size,
-                             ratings_text, url, workshop_id, description):
+    def show_details_window(self, details, callback=None):
         def main_thread():
-            top = ctk.CTkToplevel(self)
-            top.after(210, lambda: top.iconbitmap(os.path.join(RESOURCES_DIR, "ryuk.ico")))
-            top.title("Map/Mod Information")
-            _, _, x, y = get_window_size_from_registry()
-            top.geometry(f"+{x+50}+{y-50}")
-            top.maxsize(450, 10000)
-            top.minsize(300, 500)
-            # top.attributes('-topmost', 'true')
-
-            def close_window():
-                top.destroy()
-
-            def view_map_mod():
-                webbrowser.open(url)
-
-            def show_description(event):
-                def main_thread():
-                    description_window = ctk.CTkToplevel(None)
-
-                    if os.path.exists(os.path.join(RESOURCES_DIR, "ryuk.ico")):
-                        description_window.after(210, lambda: description_window.iconbitmap(os.path.join(RESOURCES_DIR, "ryuk.ico")))
-
-                    description_window.attributes('-topmost', 'true')
-                    description_window.title(f"Description - {map_name}")
-                    x_pos = event.x_root - 300
-                    y_pos = event.y_root - 200
-                    calc_req_width = len(description) * 6 + 5
-                    win_width = calc_req_width if calc_req_width < 500 else 500
-                    description_window.geometry(f"{win_width + 5}x300+{x_pos}+{y_pos}")
-
-                    if check_config("theme", "boiiiwd_theme.json") == "boiiiwd_obsidian.json":
-                        description_label = ctk.CTkTextbox(description_window, activate_scrollbars=True, scrollbar_button_color="#5b6c7f")
-                    else:
-                        description_label = ctk.CTkTextbox(description_window, activate_scrollbars=True)
-                    description_label.insert("1.0", description)
-                    description_label.pack(fill=ctk.BOTH, expand=True, padx=(10, 10), pady=(10, 10))
-                    description_label.configure(state="disabled")
-
-                    self.create_context_menu(description_label, textbox=True)
-                    description_window.after(50, description_window.focus_set)
-
-                self.after(0, main_thread)
-
-            def show_full_text(event, widget, full_text):
-                widget_text = type_label.cget("text")
-                label_type = widget_text.split(':')[0]
-                # + 30 which is desc_threshold + 5 is the ... dots and a white space
-                if len(widget_text) == len(label_type) + 30 + 5:
-                    widget.configure(text=f"{label_type}: {full_text}")
-                else:
-                    widget.configure(text=f"{label_type}: {full_text[:30]}...")
-
-            # frames
-            stars_frame = ctk.CTkFrame(top)
-            stars_frame.grid(row=0, column=0, columnspan=2, padx=20, pady=(20, 0), sticky="nsew")
-            stars_frame.columnconfigure(0, weight=0)
-            stars_frame.rowconfigure(0, weight=1)
-
-            image_frame = ctk.CTkFrame(top)
-            image_frame.grid(row=1, column=0, columnspan=2, padx=20, pady=0, sticky="nsew")
-
-            info_frame = ctk.CTkFrame(top)
-            info_frame.grid(row=2, column=0, columnspan=2, padx=20, pady=20, sticky="nsew")
-
-            buttons_frame = ctk.CTkFrame(top)
-            buttons_frame.grid(row=3, column=0, columnspan=2, padx=20, pady=(0, 20), sticky="nsew")
-
-            # fillers
-            name_label = ctk.CTkLabel(info_frame, text=f"Name: {map_name}", wraplength=420, justify="left")
-            name_label.grid(row=0, column=0, columnspan=2, sticky="w", padx=20, pady=2.5)
-
-            desc_threshold = 30
-            shortened_description = re.sub(r'[\\/\n\r]', '', description).strip()
-            shortened_description = re.sub(r'([^a-zA-Z0-9\s:().])', '', shortened_description)
-            shortened_description = f"{shortened_description[:desc_threshold]}... (View)"\
-                                    if len(shortened_description) > desc_threshold else shortened_description
-            description_lab = ctk.CTkLabel(info_frame, text=f"Description: {shortened_description}")
-            description_lab.grid(row=1, column=0, columnspan=2, sticky="w", padx=20, pady=2.5)
-            if len(description) > desc_threshold:
-                description_lab_tooltip = CTkToolTip(description_lab, message="View description", topmost=True)
-                description_lab.configure(cursor="hand2")
-                description_lab.bind("<Button-1>", lambda e: show_description(e))
-
-            map_mod_type = map_mod_type_txt[:desc_threshold] + "..." if len(map_mod_type_txt) > desc_threshold else map_mod_type_txt
-            type_label = ctk.CTkLabel(info_frame, text=f"Type: {map_mod_type}", wraplength=350, justify="left")
-            type_label.grid(row=2, column=0, columnspan=2, sticky="w", padx=20, pady=2.5)
-            if len(map_mod_type) > desc_threshold:
-                type_label_tooltip = CTkToolTip(type_label, message="View all types", topmost=True)
-                type_label.configure(cursor="hand2")
-                type_label.bind("<Button-1>", lambda e: show_full_text(e, type_label, map_mod_type_txt))
-
-            size_label = ctk.CTkLabel(info_frame, text=f"Size (Workshop): {map_size}")
-            size_label.grid(row=3, column=0, columnspan=2, sticky="w", padx=20, pady=2.5)
-
-            date_created_label = ctk.CTkLabel(info_frame, text=f"Posted: {date_created}")
-            date_created_label.grid(row=4, column=0, columnspan=2, sticky="w", padx=20, pady=2.5)
-
-            if date_updated != "Not updated":
-                date_updated_label = ctk.CTkLabel(info_frame, text=f"Updated: {date_updated} 🔗")
-                date_updated_label_tooltip = CTkToolTip(date_updated_label, message="View changelogs", topmost=True)
-                date_updated_label.configure(cursor="hand2")
-                date_updated_label.bind("<Button-1>", lambda e:
-                    webbrowser.open(f"https://steamcommunity.com/sharedfiles/filedetails/changelog/{workshop_id}"))
-            else:
-                date_updated_label = ctk.CTkLabel(info_frame, text=f"Updated: {date_updated}")
-
-            date_updated_label.grid(row=5, column=0, columnspan=2, sticky="w", padx=20, pady=2.5)
-
-            stars_image_label = ctk.CTkLabel(stars_frame)
-            stars_width, stars_height = stars_image_size
-            stars_image_widget = ctk.CTkImage(stars_image, size=(int(stars_width), int(stars_height)))
-            stars_image_label.configure(image=stars_image_widget, text="")
-            stars_image_label.pack(side="left", padx=(10, 20), pady=(10, 10))
-
-            ratings = ctk.CTkLabel(stars_frame)
-            ratings.configure(text=ratings_text)
-            ratings.pack(side="right", padx=(10, 20), pady=(10, 10))
-
-            image_label = ctk.CTkLabel(image_frame)
-            max_width = 300
-            i_width, i_height = tuple([int(max_width/image_size[0] * x)  for x in image_size])
-            image_widget = ctk.CTkImage(image, size=(int(i_width), int(i_height)))
-            image_label.configure(image=image_widget, text="")
-            image_label.pack(expand=True, fill="both", padx=(10, 20), pady=(10, 10))
-
-            # Buttons
-            close_button = ctk.CTkButton(buttons_frame, text="View", command=view_map_mod)
-            close_button.pack(side="left", padx=(10, 20), pady=(10, 10))
-
-            view_button = ctk.CTkButton(buttons_frame, text="Close", command=close_window)
-            view_button.pack(side="right", padx=(10, 20), pady=(10, 10))
-
-            top.grid_rowconfigure(0, weight=0)
-            top.grid_rowconfigure(1, weight=0)
-            top.grid_rowconfigure(2, weight=1)
-            top.grid_columnconfigure(0, weight=1)
-            top.grid_columnconfigure(1, weight=1)
-            top.after(10, top.focus_force)
+            try:
+                if not self.details_window or not self.details_window.winfo_exists():
+                    self.details_window = DetailsWindow(self)
+                self.details_window.show_details(details)
+            finally:
+                if callback:
+                    callback()
 
         self.after(0, main_thread)
 
-    def check_steamcmd_stdout(self, log_file_path, target_item_id):
-        temp_file_path = log_file_path + '.temp'
-        if not os.path.exists(log_file_path):
-            if os.path.isdir(log_file_path):
-                try: os.makedirs(log_file_path)
-                except: return False
-            else:
-                try:
-                    with open(log_file_path, 'w') as file:
-                        file.write('')
-                except: pass
-
-        try: shutil.copy2(log_file_path, temp_file_path)
-        except: return False
-
-        try:
-            with open(temp_file_path, 'r') as log_file:
-                log_file.seek(0, os.SEEK_END)
-                file_size = log_file.tell()
-
-                position = file_size
-                lines_found = 0
-
-                while lines_found < 7 and position > 0:
-                    position -= 1
-                    log_file.seek(position, os.SEEK_SET)
-
-                    char = log_file.read(1)
+    def skip_current_queue_item(self):
+        if self.button_download._state == "normal":
+            self.ui.grid_remove(self.skip_boutton)
+            self.ui.configure(self.status_text, text=f"Status: Standby!")
+            return
+        if self.download_pool:
+            self.download_pool.skip_current(on_done=self.report_cancel_latency("Skipping..."))
+            self.ui.configure(self.status_text, text=f"Status: Skipping...")
+            return
+        # an item that's already installing finishes first
+        if not self.current_job or not self.current_job.transition(JOB_SKIPPED, "Skipped"):
+            return
+        if not self.download_running:
+            self.is_pressed = False
+        self.ui.configure(self.label_file_size, text=f"File size: 0KB")
 
-                    if char == '\n':
-                        lines_found += 1
+        self.close_steamcmd_session()
+        process_supervisor.cancel_all(on_done=self.report_cancel_latency("Skipping..."))
+        self.ui.grid_remove(self.skip_boutton)
+        self.ui.configure(self.status_text, text=f"Status: Skipping...")
+        self.ui.configure(self.label_speed, text="Network Speed: 0 KB/s")
+        self.ui.configure(self.progress_text, text="0%")
+        self.ui.set(self.progress_bar, 0.0)
 
-                lines = log_file.readlines()[-7:]
+    # the real deal
+    def run_steamcmd_command(self, command, map_folder, job, queue=None):
+        if not self.prepare_workshop_folder(map_folder, job):
+            self.stop_download()
+            return
 
-                for line in reversed(lines):
-                    line = line.lower().strip()
-                    if f"download item {target_item_id.strip()}" in line:
-                        return True
+        # console has to be its own process, everything else reuses the logged in session
+        if not self.settings_tab.console:
+            return self.run_steamcmd_session(map_folder, job, queue)
+        return self.run_steamcmd_console(command, map_folder, job, queue)
 
-            return False
-        except:
-            try:
-                os.remove(temp_file_path)
-            except:
-                return False
+    # a visible steamcmd window per attempt, its stdout is the user's so progress comes from workshop_log.txt
+    def run_steamcmd_console(self, command, map_folder, job, queue=None):
+        steamcmd_path = get_steamcmd_path()
+        wsid = job.workshop_id
+        result = {}
+
+        def on_event(event):
+            if event.kind == EVENT_DOWNLOAD_STARTED:
+                job.transition(JOB_DOWNLOADING)
+            elif event.kind in (EVENT_SUCCESS, EVENT_FAILURE):
+                result["reason"] = event.reason
+                result["success"] = event.kind == EVENT_SUCCESS
+            self.on_steamcmd_event(event)
+
+        parser = SteamCMDOutputParser(on_event, logged_in=True)
+        follower = WorkshopLogFollower(get_workshop_log_path(steamcmd_path), lambda line: parser.feed(line, source="log")).start()
+        process = None
+        try:
+            # every attempt goes back to resolving, a stopped/skipped job refuses it
+            while job.transition(JOB_RESOLVING):
+                result.pop("reason", None)
+                result.pop("success", None)
+                parser.expect_item(wsid)
+                process = process_supervisor.register(subprocess.Popen(
+                    [steamcmd_path + "/steamcmd.exe"] + command,
+                    creationflags=subprocess.CREATE_NEW_CONSOLE
+                ))
+                process.wait()
+                process_supervisor.unregister(process)
+                result["reason"] = job.take_interruption() or result.get("reason")
+
+                # sent to the back of the queue
+                if job.state == JOB_QUEUED:
+                    break
+                if self.has_downloaded(map_folder, job, result.get("success")) or not self.settings_tab.continuous or job.finished:
+                    break
+                if not self.retry_steamcmd(job, result.get("reason"), self.reset_staging_cache):
+                    break
         finally:
-            try: os.remove(temp_file_path)
-            except: pass
+            follower.stop()
 
-    def skip_current_queue_item(self):
-        if self.button_download._state == "normal":
-            self.skip_boutton.grid_remove()
-            self.after(1, self.status_text.configure(text=f"Status: Standby!"))
-            return
-        self.settings_tab.stopped = True
-        self.item_skipped = True
-        self.settings_tab.steam_fail_counter = 0
-        self.is_pressed = False
-        self.is_downloading = False
-        self.after(1, self.label_file_size.configure(text=f"File size: 0KB"))
-
-        subprocess.run(['taskkill', '/F', '/IM', 'steamcmd.exe'], stdout=subprocess.PIPE, stderr=subprocess.PIPE,
-                    creationflags=subprocess.CREATE_NO_WINDOW)
-        self.skip_boutton.grid_remove()
-        self.after(2, self.status_text.configure(text=f"Status: Skipping..."))
-        self.label_speed.configure(text="Network Speed: 0 KB/s")
-        self.progress_text.configure(text="0%")
-        self.progress_bar.set(0.0)
+        if job.state == JOB_QUEUED:
+            pass
+        elif self.has_downloaded(map_folder, job, result.get("success")):
+            job.transition(JOB_INSTALLING)
+        elif job.transition(JOB_FAILED, result.get("reason")):
+            reason = f" ({result['reason']})" if result.get("reason") else ""
+            show_message("SteamCMD has terminated", f"SteamCMD has been terminated\nAnd failed to download the map/mod{reason}, {failure_hint(result.get('reason'))}")
 
-    # the real deal
-    def run_steamcmd_command(self, command, map_folder, wsid, queue=None):
-        steamcmd_path = get_steamcmd_path()
-        stdout_path = os.path.join(steamcmd_path, "logs", "workshop_log.txt")
-        timestamp = datetime.now().strftime("%Y-%m-%d-%H-%M-%S")
+        if not queue:
+            self.ui.configure(self.button_download, state="normal")
+            self.ui.configure(self.button_stop, state="disabled")
 
-        try: os.makedirs(os.path.dirname(stdout_path), exist_ok=True)
-        except: pass
+        return process.returncode if process else 1
 
+    # the "Reset steamcmd: (n of fails)" setting, Disable turns cache resets off
+    def get_retry_policy(self):
+        if not self.settings_tab.steam_fail_counter_toggle:
+            return RetryPolicy()
         try:
-            with open(stdout_path, 'w') as file:
-                file.write('')
+            fail_number = int(self.settings_tab.steam_fail_number)
         except:
-            try: os.rename(stdout_path, os.path.join(map_folder, os.path.join(stdout_path, f"workshop_log_couldntremove_{timestamp}.txt")))
-            except: pass
-
-        show_console = subprocess.CREATE_NO_WINDOW
-        if self.settings_tab.console:
-            show_console = subprocess.CREATE_NEW_CONSOLE
-
+            fail_number = 25
+        return RetryPolicy(fail_number)
+
+    # counts a failed attempt, backs off and wipes the steamcmd cache if the kind of failure calls for it,
+    # returns False when retrying can't help (disk full, invalid item) or the job got stopped/skipped meanwhile
+    def retry_steamcmd(self, job, reason, reset_cache):
+        def reset():
+            reset_cache()
+            if self.download_progress:
+                self.download_progress.restart(job.workshop_id)
+        return self.get_retry_policy().handle_failure(job, reason, reset)
+
+    # one job per queued item, they're how threads find out about skip/stop/download started
+    def create_download_jobs(self, workshop_ids, lane=LANE_INTERACTIVE, sizes=None, install_folder=None):
+        sizes = sizes or {}
+        self.download_jobs = {str(workshop_id): DownloadJob(workshop_id, on_change=self.on_job_change, lane=lane, size=sizes.get(workshop_id) or 0, install_folder=install_folder)
+                              for workshop_id in workshop_ids}
+        # stop_download() stops it
+        self.stall_watchdog = StallWatchdog(self.download_progress, self.on_download_stalled).start()
+        for job in self.download_jobs.values():
+            self.stall_watchdog.watch(job)
+        return list(self.download_jobs.values())
+
+    # runs on the watchdog's thread
+    def on_download_stalled(self, job, seconds_lost):
+        _, _, action = get_stall_settings()
+        # the back of the queue is only worth it when something else can download meanwhile
+        if action == "requeue" and not any(other is not job and other.state == JOB_QUEUED for other in list(self.download_jobs.values())):
+            action = "restart"
+        job.retries.add_stall(seconds_lost)
+        record_stall(job, seconds_lost, action)
+        if action == "requeue":
+            if not job.transition(JOB_QUEUED, "Stalled"):
+                return
+            job.requeues += 1
+        self.interrupt_job(job, "Stalled")
+
+    # from here on items asked for go into this queue, the ones that waited for it too
+    def open_queue(self, scheduler):
+        with self.scheduler_lock:
+            self.download_scheduler = scheduler
+            waiting = self.starting_downloads + self.waiting_downloads
+            self.starting_downloads, self.waiting_downloads = [], []
+        for workshop_ids, lane, install_folder in waiting:
+            self.enqueue_download(workshop_ids, lane, install_folder, notify=False)
+
+    def close_queue(self):
+        with self.scheduler_lock:
+            scheduler, self.download_scheduler = self.download_scheduler, None
+            # a queue that ended before it opened (invalid ids) doesn't retry them
+            self.starting_downloads = []
+        if scheduler:
+            scheduler.close()
+
+    # items asked for while something downloads: a running queue takes them in by priority, otherwise they
+    # wait for the current download and start right after it
+    def enqueue_download(self, workshop_ids, lane, install_folder=None, notify=True):
+        workshop_ids = [str(workshop_id) for workshop_id in workshop_ids]
+        with self.scheduler_lock:
+            scheduler = self.download_scheduler
+            if not scheduler:
+                self.waiting_downloads.append((workshop_ids, lane, install_folder))
+        if scheduler:
+            threading.Thread(target=self.add_to_queue, args=(scheduler, workshop_ids, lane, install_folder), daemon=True).start()
+        if notify:
+            show_message("Added to the queue", f"These items will download {'next' if lane == LANE_INTERACTIVE else 'after the ones ahead of them'}:\n{', '.join(workshop_ids)}", icon="info")
+
+    # runs on its own thread, validating the items shouldn't hold up the queue
+    def add_to_queue(self, scheduler, workshop_ids, lane, install_folder=None):
+        jobs = []
+        promoted = 0
+        for workshop_id in workshop_ids:
+            job = self.download_jobs.get(workshop_id)
+            # already in this queue and not done yet, it only moves up
+            if job and not job.finished:
+                job.install_folder = install_folder or job.install_folder
+                promoted += scheduler.promote(job, lane)
+                continue
+            # validated by a recent queue, steam isn't asked again
+            size = self.queue_journal.recent_size(workshop_id)
+            if size is None and valid_id(workshop_id):
+                size = get_workshop_file_size(workshop_id)
+            if size is None:
+                show_message("Warning", f"Couldn't add {workshop_id} to the queue, please enter a valid Workshop ID/Link.", icon="warning")
+                continue
+            self.queue_journal.resolved(workshop_id, size)
+            jobs.append(DownloadJob(workshop_id, on_change=self.on_job_change, lane=lane, size=size, install_folder=install_folder))
+
+        for job in jobs:
+            self.download_jobs[job.workshop_id] = job
+            self.download_progress.add_item(job.workshop_id, job.size)
+            self.stall_watchdog.watch(job)
+        pool = self.download_pool
+        if jobs and not (pool.add_items(jobs) if pool else scheduler.add_all(jobs)):
+            # the queue ended meanwhile, they start on their own once it's done
+            for job in jobs:
+                self.download_jobs.pop(job.workshop_id, None)
+            with self.scheduler_lock:
+                self.waiting_downloads.append(([job.workshop_id for job in jobs], lane, install_folder))
+            self.after(0, self.start_waiting_downloads)
+            return
+        self.queue_journal.add([job.workshop_id for job in jobs])
+        _, self.total_queue_size = self.download_progress.totals()
+        if preemption_enabled():
+            self.preempt_for(lane, len(jobs) + promoted)
+
+    # the urgent items don't wait for lower priority ones that are downloading: those go back to the queue
+    # (steamcmd picks up where they were) and their workers take the urgent ones
+    def preempt_for(self, lane, count):
+        pool = self.download_pool
+        if pool:
+            count -= pool.workers - len(pool.snapshot())
+            running = pool.preemptible(lane)
+        else:
+            job = self.current_job
+            running = [job] if job and job.lane > lane and job.state in (JOB_RESOLVING, JOB_DOWNLOADING) else []
+        for job in running[:max(count, 0)]:
+            if job.transition(JOB_QUEUED, "Preempted"):
+                self.interrupt_job(job, "Preempted")
+
+    # Tk thread, once nothing downloads anymore: what waited starts as a queue
+    def start_waiting_downloads(self):
+        with self.scheduler_lock:
+            if self.is_pressed or not self.waiting_downloads:
+                return
+            waiting = self.starting_downloads = self.waiting_downloads
+            self.waiting_downloads = []
+        workshop_ids = list(dict.fromkeys(workshop_id for workshop_ids, _, _ in waiting for workshop_id in workshop_ids))
+        self.queuetextarea.configure(state="normal")
+        self.queuetextarea.delete("1.0", "end")
+        self.queuetextarea.insert("1.0", "\n".join(workshop_ids))
+        self.queue_button_event()
+        self.download_map(update=True)
+
+    # ends the job's current steamcmd attempt, its run loop decides what comes next
+    def interrupt_job(self, job, reason):
+        job.interrupt(reason)
+        if self.download_pool:
+            self.download_pool.kill_item(job.workshop_id)
+        elif self.settings_tab.console:
+            process_supervisor.cancel_all()
+        else:
+            self.close_steamcmd_session()
+
+    # fails every job that isn't done yet, whatever is waiting on them wakes up
+    def cancel_download_jobs(self, reason="Stopped"):
+        for job in list(self.download_jobs.values()):
+            job.cancel(reason)
+        self.close_queue()
+
+    # runs on whichever thread made the transition
+    def on_job_change(self, job, previous):
+        self.queue_journal.on_job_change(job)
+        if job.finished:
+            record_retries(job)
+        if job.state == JOB_DOWNLOADING and self.queue_eta:
+            self.queue_eta.download_started(job.workshop_id)
+        elif job.state in (JOB_SKIPPED, JOB_FAILED) and self.download_progress:
+            # a skipped or failed item no longer counts towards the queue's progress and ETA
+            self.download_progress.skip(job.workshop_id)
+            _, self.total_queue_size = self.download_progress.totals()
+
+    # library/details check this before starting another download
+    @property
+    def is_downloading(self):
+        return any(job.downloading for job in list(self.download_jobs.values()))
+
+    def format_throughput(self, network_rate, disk_rate):
+        network, network_unit = convert_speed(network_rate)
+        disk, disk_unit = convert_speed(disk_rate)
+        return f"Network Speed: {network:.2f} {network_unit} | Disk: {disk:.2f} {disk_unit}"
+
+    def on_steamcmd_event(self, event):
+        if event.kind == EVENT_PROGRESS and self.download_progress:
+            self.download_progress.on_counters(event.workshop_id, event.bytes_done, event.bytes_total)
+
+    def on_steamcmd_download_started(self, workshop_id):
+        job = self.download_jobs.get(str(workshop_id))
+        if job:
+            job.transition(JOB_DOWNLOADING)
+
+    def get_steamcmd_session(self):
+        steamcmd_path = get_steamcmd_path()
+        staging_dir = get_staging_dir(steamcmd_path)
+        if not self.steamcmd_session or self.steamcmd_session.steamcmd_path != steamcmd_path or self.steamcmd_session.install_dir != staging_dir:
+            self.close_steamcmd_session()
+            self.steamcmd_session = SteamCMDSession(steamcmd_path, on_download_started=self.on_steamcmd_download_started, on_event=self.on_steamcmd_event, install_dir=staging_dir)
+        return self.steamcmd_session
+
+    def close_steamcmd_session(self, graceful=False):
+        session = self.steamcmd_session
+        if not session:
+            return
+        if graceful:
+            session.close()
+        else:
+            session.kill()
+
+    # session is passed by queue workers, a standalone download uses the shared session
+    def run_steamcmd_session(self, map_folder, job, queue=None, session=None):
+        pooled = session is not None
+        session = session or self.get_steamcmd_session()
+        wsid = job.workshop_id
+        success = False
+        reason = None
+
+        # every attempt goes back to resolving, a stopped/skipped job refuses it
+        while job.transition(JOB_RESOLVING):
+            success, reason = session.download_item(wsid, should_stop=lambda: job.finished)
+            reason = job.take_interruption() or reason
+            # sent to the back of the queue
+            if job.state == JOB_QUEUED:
+                break
+            if self.has_downloaded(map_folder, job, success) or not self.settings_tab.continuous or job.finished:
+                break
+            # files are locked while the session is alive, reset_cache() closes it first
+            if not self.retry_steamcmd(job, reason, session.reset_cache):
+                break
+
+        if job.state == JOB_QUEUED:
+            pass
+        elif self.has_downloaded(map_folder, job, success):
+            job.transition(JOB_INSTALLING)
+        elif job.transition(JOB_FAILED, reason):
+            show_message("SteamCMD has terminated", f"SteamCMD has been terminated\nAnd failed to download {wsid} ({reason}), {failure_hint(reason)}")
+
+        if not queue and not pooled:
+            self.ui.configure(self.button_download, state="normal")
+            self.ui.configure(self.button_stop, state="disabled")
+
+        return 0 if success else 1
+
+    # a console steamcmd shares the default install dir, unless its items are staged on the boiii drive
+    def reset_staging_cache(self):
+        steamcmd_path = get_steamcmd_path()
+        reset_steamcmd(no_warn=True)
+        if get_staging_dir(steamcmd_path) != steamcmd_path:
+            remove_tree(os.path.join(get_staging_dir(steamcmd_path), "steamapps"))
+
+    # a staged content folder is there from the start, only steamcmd's result tells if it's up to date
+    def has_downloaded(self, map_folder, job, success=False):
+        if job.staged:
+            return success
+        return success or os.path.exists(map_folder)
+
+    # boiii folder of an installed item
+    def installed_zone_folder(self, workshop_id):
+        items_file = os.path.join(APPLICATION_PATH, LIBRARY_FILE)
+        folder_name = self.library_tab.get_item_by_id(items_file, workshop_id, return_option="folder_name")
+        return find_installed_zone(self.edit_destination_folder.get().strip(), folder_name, workshop_id)
+
+    # with delta updates steamcmd keeps (or gets a copy of) the installed files as its content folder and
+    # only fetches what changed, otherwise it won't download into a leftover content folder of the same item
+    def prepare_workshop_folder(self, map_folder, job):
+        if delta_updates_enabled():
+            if not os.path.exists(map_folder):
+                zone_folder = self.installed_zone_folder(job.workshop_id)
+                if zone_folder:
+                    stage_installed_item(zone_folder, map_folder)
+            job.staged = os.path.exists(map_folder)
+            return True
+        if not os.path.exists(map_folder):
+            return True
+        remove_tree(map_folder)
         if os.path.exists(map_folder):
             try:
-                try:
-                    os.remove(map_folder)
-                except:
-                    os.rename(map_folder, os.path.join(map_folder, os.path.join(get_steamcmd_path(), "steamapps", "workshop", "content", "311210", f"couldntremove_{timestamp}")))
+                timestamp = datetime.now().strftime("%Y-%m-%d-%H-%M-%S")
+                os.rename(map_folder, f"{map_folder}_couldntremove_{timestamp}")
             except Exception as e:
-                self.settings_tab.stopped = True
-                self.queue_stop_button = True
                 show_message("Error", f"Couldn't remove {map_folder}, please do so manually\n{e}", icon="cancel")
-                self.stop_download()
-                return
-
-        if self.settings_tab.continuous:
-            start_time = 0
-            while not os.path.exists(map_folder) and not self.settings_tab.stopped:
-                process = subprocess.Popen(
-                    [steamcmd_path + "/steamcmd.exe"] + command.split(),
-                    stdout=None if self.settings_tab.console else subprocess.PIPE,
-                    stderr=None if self.settings_tab.console else subprocess.PIPE,
-                    text=True,
-                    bufsize=1,
-                    universal_newlines=True,
-                    creationflags=show_console
-                )
-
-                if process.poll() is not None:
-                    continue
-
-                #wait for process
-                while True:
-                    if process.poll() is not None:
-                        break
-                    if not self.is_downloading:
-                        if self.check_steamcmd_stdout(stdout_path, wsid):
-                            start_time = time.time()
-                            self.is_downloading = True
-                    elapsed_time = time.time() - start_time
-                    time.sleep(1)
-
-                # print("Broken freeeee!")
-                self.is_downloading = False
-                try:
-                    with open(stdout_path, 'w') as file:
-                        file.write('')
-                except:
-                    try: os.rename(stdout_path, os.path.join(map_folder, os.path.join(stdout_path, f"workshop_log_couldntremove_{timestamp}.txt")))
-                    except: pass
-
-                if not self.settings_tab.stopped:
-                    self.settings_tab.steam_fail_counter = self.settings_tab.steam_fail_counter + 1
-                    if elapsed_time < 20 and elapsed_time > 0 and not os.path.exists(map_folder):
-                        self.fail_threshold = self.fail_threshold + 1
+                return False
+        return True
+
+    # runs on a pool worker thread: download with the worker's own session then install
+    def download_pool_item(self, pool, session, job):
+        workshop_id = job.workshop_id
+        download_folder, map_folder = session.get_workshop_folders(workshop_id)
+        if not self.prepare_workshop_folder(map_folder, job):
+            job.transition(JOB_FAILED, "Couldn't remove the old content folder")
+            return
+        os.makedirs(download_folder, exist_ok=True)
+        self.download_progress.set_folders(workshop_id, download_folder, map_folder)
+        self.queue_eta.item_started(workshop_id)
+        try:
+            self.run_steamcmd_session(map_folder, job, queue=True, session=session)
+            # the worker moves on to its next item while this one installs
+            if job.state == JOB_INSTALLING:
+                self.stage_for_install(job, map_folder, download_folder, self.edit_destination_folder.get().strip())
+        finally:
+            # it failed or got skipped, a staged item is the install stage's
+            if job.state not in (JOB_INSTALLING, JOB_DONE):
+                self.queue_eta.item_finished(workshop_id, learn=False)
+
+    # download stage -> install stage, blocks while too many downloaded items wait for the installer
+    def stage_for_install(self, job, map_folder, download_folder, destination_folder):
+        self.download_progress.finish(job.workshop_id)
+        self.queue_eta.download_finished(job.workshop_id)
+        item = self.download_progress.item(job.workshop_id)
+        self.install_pipeline.put(job, item.bytes_total if item else 0, map_folder, download_folder, destination_folder)
+
+    # install stage of the queue, runs on the pipeline's thread
+    def install_staged_item(self, job, map_folder, download_folder, destination_folder):
+        workshop_id = job.workshop_id
+        mod_type = None
+        self.queue_eta.install_started(workshop_id)
+        try:
+            if os.path.exists(os.path.join(map_folder, "workshop.json")):
+                mod_type = self.install_downloaded_item(workshop_id, map_folder, download_folder, destination_folder, job.install_folder)
+                job.transition(JOB_DONE if mod_type else JOB_FAILED, None if mod_type else "Install failed")
+            elif job.transition(JOB_FAILED, "Failed to find workshop.json"):
+                show_message("Error", "Failed to find workshop.json, please try again.", icon="cancel")
+        finally:
+            self.queue_eta.item_finished(workshop_id, learn=bool(mod_type))
 
-                if self.settings_tab.steam_fail_counter_toggle:
-                    try:
-                        if self.fail_threshold >= int(self.settings_tab.steam_fail_number):
-                            reset_steamcmd(no_warn=True)
-                            self.settings_tab.steamcmd_reset = True
-                            self.settings_tab.steam_fail_counter = 0
-                            self.fail_threshold = 0
-                    except:
-                        if self.fail_threshold >= 25:
-                            reset_steamcmd(no_warn=True)
-                            self.settings_tab.steamcmd_reset = True
-                            self.settings_tab.steam_fail_counter = 0
-                            self.fail_threshold = 0
-                continue
-        else:
-            process = subprocess.Popen(
-                [steamcmd_path + "/steamcmd.exe"] + command.split(),
-                stdout=None if self.settings_tab.console else subprocess.PIPE,
-                stderr=None if self.settings_tab.console else subprocess.PIPE,
-                text=True,
-                bufsize=1,
-                universal_newlines=True,
-                creationflags=show_console
-            )
-
-            #wait for process
-            while True:
-                if process.poll() is not None:
-                    break
-                if not self.is_downloading:
-                    if self.check_steamcmd_stdout(stdout_path, wsid):
-                        start_time = time.time()
-                        self.is_downloading = True
-                elapsed_time = time.time() - start_time
-                time.sleep(1)
-
-            # print("Broken freeeee!")
-            self.is_downloading = False
-            try:
-                with open(stdout_path, 'w') as file:
-                    file.write('')
-            except:
-                try: os.rename(stdout_path, os.path.join(map_folder, os.path.join(stdout_path, f"workshop_log_couldntremove_{timestamp}.txt")))
-                except: pass
+    # waits for the downloaded items that are still being installed
+    def finish_install_pipeline(self):
+        pipeline = self.install_pipeline
+        if not pipeline:
+            return
+        pipeline.close()
+        if pipeline.backlog:
+            self.ui.configure(self.label_speed, text="Installing...")
+        pipeline.join()
+        # a stopped queue's thread may only get here after the next one started its own
+        if self.install_pipeline is pipeline:
+            self.install_pipeline = None
+
+    # downloads the queue with several steamcmd workers, blocks until the pool is done
+    def run_download_pool(self, jobs, workers, start_time, scheduler):
+        pool = DownloadWorkerPool(get_steamcmd_path(), workers, self.download_pool_item, on_event=self.on_steamcmd_event, scheduler=scheduler)
+        pool.add_items(jobs)
+        self.download_pool = pool
+        self.open_queue(scheduler)
+        self.ui.configure(self.button_download, state="disabled")
+        self.ui.configure(self.button_stop, state="normal")
+
+        pool_thread = threading.Thread(target=pool.run, daemon=True)
+        pool_thread.start()
+        try:
+            self.queue_progress_loop(pool, jobs, start_time)
+            pool_thread.join()
+        finally:
+            self.download_pool = None
+        self.finish_install_pipeline()
+
+        if not pool.stopped:
+            self.ui.configure(self.status_text, text=f"Status: Done! => Please press stop only if you see no popup window (rare bug)")
+            self.show_complete_message(message=f"All files were downloaded\nYou can run the game now!\nPS: You have to restart the game \n(pressing launch will launch/restarts)")
+
+    def queue_progress_loop(self, pool, jobs, start_time):
+        meter = ThroughputMeter(process_supervisor.running)
+        item_meters = {}
+
+        while not pool.finished.wait(self.ui.refresh_interval()):
+            # items get added while it runs
+            total_items = len(self.download_jobs)
+            snapshot = pool.snapshot()
+            downloading = [workshop_id for workshop_id, item in snapshot.items() if item["downloading"]]
+            for workshop_id in downloading:
+                self.download_progress.refresh(workshop_id)
+            # skipped items drop out, wrong workshop sizes grow the total
+            _, self.total_queue_size = self.download_progress.totals()
+
+            network_rate, disk_rate = meter.sample()
+            eta_text = format_eta(*self.queue_eta.estimate(network_rate, downloading[0] if len(downloading) == 1 else None))
+            for workshop_id in downloading:
+                if workshop_id not in item_meters:
+                    session = pool.sessions[snapshot[workshop_id]["worker"]]
+                    item_meters[workshop_id] = ThroughputMeter(session.running_processes)
+                    item_meters[workshop_id].start_item(workshop_id)
+                item_meters[workshop_id].sample()
+            for workshop_id in [i for i in item_meters if i not in snapshot]:
+                item_meters.pop(workshop_id).finish_item(pool.job(workshop_id).state)
+
+            progress = self.download_progress.fraction()
+            elapsed_hours, elapsed_minutes, elapsed_seconds = convert_seconds(time.time() - start_time)
+            number = min(pool.done_count + 1, total_items)
+
+            if len(snapshot) == 1:
+                workshop_id = next(iter(snapshot))
+                item_name = get_item_name(workshop_id) or "Error getting name"
+                current = f"ID: {workshop_id} | {item_name}"
+            else:
+                current = f"Workers: {len(downloading)}/{pool.workers} downloading"
+            state = "Downloading" if downloading else "Waiting"
 
-            if not os.path.exists(map_folder):
-                show_message("SteamCMD has terminated", "SteamCMD has been terminated\nAnd failed to download the map/mod, try again or enable continuous download in settings")
+            self.ui.configure(self.status_text, text=f"Status: Total size: ~{convert_bytes_to_readable(self.total_queue_size)} | {current} | {state} {number}/{total_items}")
+            if downloading:
+                self.ui.configure(self.label_speed, text=self.format_throughput(network_rate, disk_rate))
+            else:
+                self.ui.configure(self.label_speed, text=f"Waiting for steamcmd...")
+            self.ui.set(self.progress_bar, progress)
+            self.ui.configure(self.progress_text, text=f"{progress * 100:.2f}%")
+            fails = f" - Fails: {sum(item['job'].fails for item in snapshot.values())}" if self.settings_tab.show_fails else ""
+            self.ui.configure(self.elapsed_time, text=f"Elapsed Time: {int(elapsed_hours):02d}:{int(elapsed_minutes):02d}:{int(elapsed_seconds):02d}{fails}{eta_text}")
+            if pool.remaining() > 1:
+                self.ui.grid(self.skip_boutton, row=3, column=1, padx=(10, 20), pady=(0, 25), sticky="ws")
+            else:
+                self.ui.grid_remove(self.skip_boutton)
 
-        self.settings_tab.stopped = True
-        if not queue:
-            self.button_download.configure(state="normal")
-            self.button_stop.configure(state="disabled")
+        for workshop_id, item_meter in item_meters.items():
+            job = pool.job(workshop_id)
+            item_meter.finish_item(job.state if job.finished else "stopped")
 
-        return process.returncode
+    # the last queue didn't end (crash, reboot or the window was closed), its unfinished items can go again
+    def offer_queue_resume(self):
+        workshop_ids = self.queue_journal.resumable()
+        if not workshop_ids or self.is_pressed:
+            return
+        msg = CTkMessagebox(title="Resume queue", message=f"The last queue didn't finish, {len(workshop_ids)} item(s) left\nResume it?", icon="question", option_1="No", option_2="Resume", sound=True)
+        if msg.get() != "Resume":
+            self.queue_journal.finish()
+            return
+        self.queue_button_event()
+        self.queuetextarea.configure(state="normal")
+        self.queuetextarea.delete(1.0, "end")
+        self.queuetextarea.insert(1.0, "\n".join(workshop_ids))
+        self.download_map(update=self.queue_journal.update)
 
     def show_init_message(self):
         def callback():
@@ -1018,25 +1200,35 @@ class BOIIIWD(ctk.CTk):
 
     @if_internet_available
     def download_map(self, update=False, invalid_item_folder=None):
-        self.is_downloading = False
-        self.fail_threshold = 0
-        if not self.is_pressed:
-            self.after(1, self.label_speed.configure(text=f"Loading..."))
+        if not self.is_pressed and not self.download_scheduler:
+            self.ui.configure(self.label_speed, text=f"Loading...")
             self.is_pressed = True
+            self.download_running = True
             self.library_tab.load_items(self.edit_destination_folder.get(), dont_add=True)
             if self.queue_enabled:
-                self.item_skipped = False
                 start_down_thread = threading.Thread(target=self.queue_download_thread, args=(update,))
                 start_down_thread.start()
             else:
                 start_down_thread = threading.Thread(target=self.download_thread, args=(update, invalid_item_folder,))
                 start_down_thread.start()
+        elif self.queue_enabled:
+            # the ids that aren't part of the running download yet join it
+            text = self.queuetextarea.get("1.0", "end")
+            items = [parse_workshop_id(item) for item in text.replace(",", "\n").split("\n") if item.strip()]
+            items = [item for item in dict.fromkeys(items) if item and item not in self.download_jobs]
+            if items:
+                self.enqueue_download(items, LANE_UPDATE if update else LANE_BULK)
+            else:
+                show_message("Warning", "Already pressed, Please wait.")
         else:
-            show_message("Warning", "Already pressed, Please wait.")
+            # what the user just asked for goes ahead of the rest
+            workshop_id = parse_workshop_id(self.edit_workshop_id.get())
+            if workshop_id:
+                self.enqueue_download([workshop_id], LANE_INTERACTIVE, invalid_item_folder)
+            else:
+                show_message("Warning", "Please enter a valid Workshop ID/Link.", icon="warning")
 
     def queue_download_thread(self, update=None):
-        self.stopped = False
-        self.queue_stop_button = False
         try:
             save_config("DestinationFolder" ,self.edit_destination_folder.get())
             save_config("SteamCMDPath" ,self.edit_steamcmd_path.get())
@@ -1080,7 +1272,6 @@ class BOIIIWD(ctk.CTk):
             self.total_queue_size = 0
             self.already_installed = []
             for item in items:
-                self.fail_threshold = 0
                 item.strip()
                 workshop_id = item
                 if not workshop_id.isdigit():
@@ -1095,12 +1286,14 @@ class BOIIIWD(ctk.CTk):
                         show_message("Warning", "Please enter valid Workshop IDs/Links.", icon="warning")
                         self.stop_download()
                         return
-                if not valid_id(workshop_id):
+                # validated by a recent queue (e.g. the one being resumed), steam isn't asked again
+                recent_size = self.queue_journal.recent_size(workshop_id)
+                if recent_size is None and not valid_id(workshop_id):
                     show_message("Warning", "Please enter valid Workshop IDs/Links.", icon="warning")
                     self.stop_download()
                     return
 
-                ws_file_size = get_workshop_file_size(workshop_id)
+                ws_file_size = recent_size if recent_size is not None else get_workshop_file_size(workshop_id)
                 file_size = ws_file_size
                 items_ws_sizes[workshop_id] = ws_file_size
                 self.total_queue_size += ws_file_size
@@ -1109,10 +1302,13 @@ class BOIIIWD(ctk.CTk):
                     show_message("Error", "Failed to retrieve file size.", icon="cancel")
                     self.stop_download()
                     return
+                self.queue_journal.resolved(workshop_id, file_size)
 
                 if any(workshop_id in item for item in self.library_tab.added_items):
                     self.already_installed.append(workshop_id)
 
+            items = [parse_workshop_id(item) for item in items]
+
             if not update:
                 if self.already_installed:
                     item_ids = ", ".join(self.already_installed)
@@ -1135,164 +1331,89 @@ class BOIIIWD(ctk.CTk):
                     else:
                         show_message("Heads up! map/s not skipped => skip is off in settings", f"These item IDs may already be installed:\n{item_ids}", icon="info")
 
-            self.after(1, self.status_text.configure(text=f"Status: Total size: ~{convert_bytes_to_readable(self.total_queue_size)}"))
+            self.download_progress = QueueProgress(use_counters=self.settings_tab.estimated_progress)
+            for workshop_id in items:
+                self.download_progress.add_item(workshop_id, items_ws_sizes[workshop_id])
+
+            self.ui.configure(self.status_text, text=f"Status: Total size: ~{convert_bytes_to_readable(self.total_queue_size)}")
             start_time = time.time()
-            for index, item in enumerate(items):
-                self.settings_tab.steam_fail_counter = 0
-                current_number = index + 1
-                total_items = len(items)
-                if self.queue_stop_button:
-                    self.stop_download()
-                    break
-                item.strip()
-                self.settings_tab.stopped = False
-                workshop_id = item
-                if not workshop_id.isdigit():
-                    try:
-                        if extract_workshop_id(workshop_id).strip().isdigit():
-                            workshop_id = extract_workshop_id(workshop_id).strip()
-                        else:
-                            show_message("Warning", "Please enter valid Workshop IDs/Links.", icon="warning")
-                            self.stop_download()
-                            return
-                    except:
-                        show_message("Warning", "Please enter valid Workshop IDs/Links.", icon="warning")
-                        self.stop_download()
-                        return
+
+            # the console has to be a single visible steamcmd, so it keeps the one at a time loop
+            workers = 1 if self.settings_tab.console else min(self.settings_tab.download_workers, len(items))
+            self.queue_eta = QueueETA(self.download_progress, workers)
+            jobs = self.create_download_jobs(items, lane=LANE_UPDATE if update else LANE_BULK, sizes=items_ws_sizes)
+            self.queue_journal.start(items, update)
+            self.install_pipeline = InstallPipeline(self.install_staged_item).start()
+            scheduler = JobScheduler()
+            if workers > 1:
+                self.run_download_pool(jobs, workers, start_time, scheduler)
+                return
+
+            scheduler.add_all(jobs)
+            self.open_queue(scheduler)
+            done_count = 0
+            # stop_download() fails every job that isn't done, the queue ends once nothing is left to pop
+            job = scheduler.pop(close=True)
+            while job:
+                current_number = done_count + 1
+                total_items = len(self.download_jobs)
+                self.current_job = job
+                workshop_id = job.workshop_id
                 ws_file_size = get_workshop_file_size(workshop_id)
                 file_size = ws_file_size
-                self.after(1, lambda mid=workshop_id: self.label_file_size.configure(text=f"File size: {get_workshop_file_size(mid ,raw=True)}"))
-                download_folder = os.path.join(get_steamcmd_path(), "steamapps", "workshop", "downloads", "311210", workshop_id)
-                map_folder = os.path.join(get_steamcmd_path(), "steamapps", "workshop", "content", "311210", workshop_id)
+                self.ui.configure(self.label_file_size, text=f"File size: {get_workshop_file_size(workshop_id ,raw=True)}")
+                download_folder, map_folder = get_workshop_folders(get_staging_dir(get_steamcmd_path()), workshop_id)
                 if not os.path.exists(download_folder):
                     os.makedirs(download_folder)
 
+                self.download_progress.set_folders(workshop_id, download_folder, map_folder)
+                self.queue_eta.item_started(workshop_id)
+
                 def check_and_update_progress():
-                    previous_net_speed = 0
-                    est_downloaded_bytes = 0
-                    file_size = ws_file_size
+                    meter = ThroughputMeter(process_supervisor.running)
+                    meter.start_item(workshop_id)
                     item_name = get_item_name(workshop_id) if get_item_name(workshop_id) else "Error getting name"
 
-                    while not self.settings_tab.stopped:
-                        if self.settings_tab.steamcmd_reset:
-                            self.settings_tab.steamcmd_reset = False
-                            previous_net_speed = 0
-                            est_downloaded_bytes = 0
-
-                        if self.item_skipped:
-                            if index > 0:
-                                prev_item_size = None
-                                previous_item = items[index - 1]
-                                prev_item_path = os.path.join(get_steamcmd_path(), "steamapps", "workshop", "downloads", "311210", previous_item)
-                                prev_item_path_2 = os.path.join(get_steamcmd_path(), "steamapps", "workshop", "content", "311210", previous_item)
-                                if os.path.exists(prev_item_path):
-                                    prev_item_size = sum(os.path.getsize(os.path.join(prev_item_path, f)) for f in os.listdir(prev_item_path))
-                                elif os.path.exists(prev_item_path_2):
-                                    prev_item_size = sum(os.path.getsize(os.path.join(prev_item_path_2, f)) for f in os.listdir(prev_item_path_2))
-                                if prev_item_size == 0 or not prev_item_size:
-                                    prev_item_size = items_ws_sizes[previous_item]
-                                if prev_item_size:
-                                    self.total_queue_size -= prev_item_size
-                            self.item_skipped = False
-
-                        while not self.is_downloading and not self.settings_tab.stopped:
-                            self.after(1, self.label_speed.configure(text=f"Waiting for steamcmd..."))
-                            time_elapsed = time.time() - start_time
-                            elapsed_hours, elapsed_minutes, elapsed_seconds = convert_seconds(time_elapsed)
-                            if self.settings_tab.show_fails:
-                                self.after(1, lambda h=elapsed_hours, m=elapsed_minutes, s=elapsed_seconds: self.elapsed_time.configure(text=f"Elapsed Time: {int(h):02d}:{int(m):02d}:{int(s):02d} - Fails: {self.fail_threshold}"))
-                            else:
-                                self.after(1, lambda h=elapsed_hours, m=elapsed_minutes, s=elapsed_seconds: self.elapsed_time.configure(text=f"Elapsed Time: {int(h):02d}:{int(m):02d}:{int(s):02d}"))
-                            self.after(1, self.status_text.configure(
-                                text=f"Status: Total size: ~{convert_bytes_to_readable(self.total_queue_size)} | ID: {workshop_id} | {item_name} | Waiting {current_number}/{total_items}"))
-                            if len(items) > 1:
-                                self.skip_boutton.grid(row=3, column=1, padx=(10, 20), pady=(0, 25), sticky="ws")
-                                if index == len(items) - 1:
-                                    self.skip_boutton.grid_remove()
-                            time.sleep(1)
-                            if self.is_downloading:
-                                break
-
-                        try:
-                            current_size = sum(os.path.getsize(os.path.join(download_folder, f)) for f in os.listdir(download_folder))
-                        except:
-                            try:
-                                current_size = sum(os.path.getsize(os.path.join(map_folder, f)) for f in os.listdir(map_folder))
-                            except:
-                                continue
-
-                        progress = int(current_size / file_size * 100)
-
-                        if progress > 100 and not self.settings_tab.stopped:
-                            progress = int(current_size / current_size * 100)
-                            self.total_queue_size -= file_size
-                            file_size = current_size
-                            self.total_queue_size += file_size
-                            self.after(1, self.status_text.configure(
-                                text=f"Status: Total size: ~{convert_bytes_to_readable(self.total_queue_size)} | ID: {workshop_id} | {item_name} | Downloading {current_number}/{total_items}"))
-                            self.after(1, lambda p=progress: self.label_file_size.configure(text=f"Wrong size reported\nFile size: ~{convert_bytes_to_readable(current_size)}"))
-
-                        if self.settings_tab.estimated_progress and not self.settings_tab.stopped:
-                            time_elapsed = time.time() - start_time
-                            raw_net_speed = psutil.net_io_counters().bytes_recv
-
-                            current_net_speed_text = raw_net_speed
-                            net_speed_bytes = current_net_speed_text - previous_net_speed
-                            previous_net_speed = current_net_speed_text
-
-                            current_net_speed = net_speed_bytes
-                            down_cap = 150000000
-                            if current_net_speed >= down_cap:
-                                current_net_speed = 10
-
-                            est_downloaded_bytes += current_net_speed
+                    # runs until steamcmd is done with the item (installing), it's skipped/stopped/failed or it stalled
+                    # and went back in the queue
+                    while job.state in (JOB_QUEUED, JOB_RESOLVING, JOB_DOWNLOADING) and steamcmd_thread.is_alive():
+                        fails = f" - Fails: {job.fails}" if self.settings_tab.show_fails else ""
+                        time_elapsed = time.time() - start_time
+                        elapsed_hours, elapsed_minutes, elapsed_seconds = convert_seconds(time_elapsed)
 
-                            percentage_complete = (est_downloaded_bytes / file_size) * 100
+                        if not job.downloading:
+                            self.ui.configure(self.label_speed, text=f"Waiting for steamcmd...")
+                            self.ui.configure(self.elapsed_time, text=f"Elapsed Time: {int(elapsed_hours):02d}:{int(elapsed_minutes):02d}:{int(elapsed_seconds):02d}{fails}")
+                            self.ui.configure(self.status_text,
+                                text=f"Status: Total size: ~{convert_bytes_to_readable(self.total_queue_size)} | ID: {workshop_id} | {item_name} | Waiting {current_number}/{total_items}")
+                            if len(scheduler):
+                                self.ui.grid(self.skip_boutton, row=3, column=1, padx=(10, 20), pady=(0, 25), sticky="ws")
+                            else:
+                                self.ui.grid_remove(self.skip_boutton)
+                            job.wait_for_change(self.ui.refresh_interval())
+                            continue
 
-                            progress = min(percentage_complete / 100, 0.99)
+                        if self.download_progress.refresh(workshop_id):
+                            item_size = self.download_progress.item(workshop_id).bytes_total
+                            _, self.total_queue_size = self.download_progress.totals()
+                            self.ui.configure(self.label_file_size, text=f"Wrong size reported\nFile size: ~{convert_bytes_to_readable(item_size)}")
+                        progress = self.download_progress.fraction(workshop_id)
 
-                            net_speed, speed_unit = convert_speed(net_speed_bytes)
+                        network_rate, disk_rate = meter.sample()
+                        eta_text = format_eta(*self.queue_eta.estimate(network_rate, workshop_id))
 
-                            elapsed_hours, elapsed_minutes, elapsed_seconds = convert_seconds(time_elapsed)
+                        self.ui.configure(self.status_text,
+                            text=f"Status: Total size: ~{convert_bytes_to_readable(self.total_queue_size)} | ID: {workshop_id} | {item_name} | Downloading {current_number}/{total_items}")
+                        self.ui.set(self.progress_bar, progress)
+                        self.ui.configure(self.label_speed, text=self.format_throughput(network_rate, disk_rate))
+                        self.ui.configure(self.progress_text, text=f"{progress * 100:.2f}%")
+                        self.ui.configure(self.elapsed_time, text=f"Elapsed Time: {int(elapsed_hours):02d}:{int(elapsed_minutes):02d}:{int(elapsed_seconds):02d}{fails}{eta_text}")
+                        job.wait_for_change(self.ui.refresh_interval())
 
-                            # print(f"raw_net {raw_net_speed}\ncurrent_net_speed: {current_net_speed}\nest_downloaded_bytes {est_downloaded_bytes}\npercentage_complete {percentage_complete}\nprogress {progress}")
-                            self.after(1, self.status_text.configure(
-                                text=f"Status: Total size: ~{convert_bytes_to_readable(self.total_queue_size)} | ID: {workshop_id} | {item_name} | Downloading {current_number}/{total_items}"))
-                            self.after(1, self.progress_bar.set(progress))
-                            self.after(1, lambda v=net_speed: self.label_speed.configure(text=f"Network Speed: {v:.2f} {speed_unit}"))
-                            self.after(1, lambda p=min(percentage_complete ,99): self.progress_text.configure(text=f"{p:.2f}%"))
-                            if self.settings_tab.show_fails:
-                                self.after(1, lambda h=elapsed_hours, m=elapsed_minutes, s=elapsed_seconds: self.elapsed_time.configure(text=f"Elapsed Time: {int(h):02d}:{int(m):02d}:{int(s):02d} - Fails: {self.fail_threshold}"))
-                            else:
-                                self.after(1, lambda h=elapsed_hours, m=elapsed_minutes, s=elapsed_seconds: self.elapsed_time.configure(text=f"Elapsed Time: {int(h):02d}:{int(m):02d}:{int(s):02d}"))
+                    meter.finish_item("done" if job.state in (JOB_INSTALLING, JOB_DONE) else job.state)
 
-                            time.sleep(1)
-                        else:
-                            if not self.settings_tab.stopped:
-                                time_elapsed = time.time() - start_time
-                                progress = int(current_size / file_size * 100)
-                                self.after(1, lambda v=progress / 100.0: self.progress_bar.set(v))
-
-                                current_net_speed = psutil.net_io_counters().bytes_recv
-
-                                net_speed_bytes = current_net_speed - previous_net_speed
-                                previous_net_speed = current_net_speed
-
-                                net_speed, speed_unit = convert_speed(net_speed_bytes)
-                                elapsed_hours, elapsed_minutes, elapsed_seconds = convert_seconds(time_elapsed)
-
-                                self.after(1, self.status_text.configure(
-                                    text=f"Status: Total size: ~{convert_bytes_to_readable(self.total_queue_size)} | ID: {workshop_id} | {item_name} | Downloading {current_number}/{total_items}"))
-                                self.after(1, lambda v=net_speed: self.label_speed.configure(text=f"Network Speed: {v:.2f} {speed_unit}"))
-                                self.after(1, lambda p=progress: self.progress_text.configure(text=f"{p}%"))
-                                if self.settings_tab.show_fails:
-                                    self.after(1, lambda h=elapsed_hours, m=elapsed_minutes, s=elapsed_seconds: self.elapsed_time.configure(text=f"Elapsed Time: {int(h):02d}:{int(m):02d}:{int(s):02d} - Fails: {self.fail_threshold}"))
-                                else:
-                                    self.after(1, lambda h=elapsed_hours, m=elapsed_minutes, s=elapsed_seconds: self.elapsed_time.configure(text=f"Elapsed Time: {int(h):02d}:{int(m):02d}:{int(s):02d}"))
-                                time.sleep(1)
-
-                command = f"+login anonymous app_update 311210 +workshop_download_item 311210 {workshop_id} validate +quit"
-                steamcmd_thread = threading.Thread(target=lambda: self.run_steamcmd_command(command, map_folder, workshop_id, queue=True))
+                command = build_steamcmd_command(workshop_id, install_dir=get_staging_dir(get_steamcmd_path()))
+                steamcmd_thread = threading.Thread(target=lambda: self.run_steamcmd_command(command, map_folder, job, queue=True))
                 steamcmd_thread.start()
 
                 def wait_for_threads():
@@ -1301,98 +1422,63 @@ class BOIIIWD(ctk.CTk):
                     update_ui_thread.start()
                     update_ui_thread.join()
 
-                    self.progress_text.configure(text="0%")
-                    self.progress_bar.set(0.0)
-
-                    map_folder = os.path.join(get_steamcmd_path(), "steamapps", "workshop", "content", "311210", workshop_id)
-
-                    json_file_path = os.path.join(map_folder, "workshop.json")
-
-                    if os.path.exists(json_file_path):
-                        self.label_speed.configure(text="Installing...")
-                        mod_type = extract_json_data(json_file_path, "Type")
-                        items_file = os.path.join(APPLICATION_PATH, LIBRARY_FILE)
-                        item_exists,_ = self.library_tab.item_exists_in_file(items_file, workshop_id)
+                    self.ui.configure(self.progress_text, text="0%")
+                    self.ui.set(self.progress_bar, 0.0)
 
-                        if item_exists:
-                            get_folder_name = self.library_tab.get_item_by_id(items_file, workshop_id, return_option="folder_name")
-                            if get_folder_name:
-                                folder_name = get_folder_name
-                            else:
-                                try:
-                                    folder_name = extract_json_data(json_file_path, self.settings_tab.folder_options.get())
-                                except:
-                                    folder_name = extract_json_data(json_file_path, "publisherID")
-                        else:
-                            try:
-                                folder_name = extract_json_data(json_file_path, self.settings_tab.folder_options.get())
-                            except:
-                                folder_name = extract_json_data(json_file_path, "publisherID")
-
-                        if mod_type == "mod":
-                            path_folder = os.path.join(destination_folder, "mods")
-                            folder_name_path = os.path.join(path_folder, folder_name, "zone")
-                        elif mod_type == "map":
-                            path_folder = os.path.join(destination_folder, "usermaps")
-                            folder_name_path = os.path.join(path_folder, folder_name, "zone")
-                        else:
-                            show_message("Error", f"Invalid workshop type in workshop.json, are you sure this is a map or a mod?., skipping {workshop_id}...", icon="cancel")
-                            return
-
-                        if not item_exists:
-                            while os.path.exists(os.path.join(path_folder, folder_name)):
-                                folder_name += f"_{workshop_id}"
-                                folder_name_path = os.path.join(path_folder, folder_name, "zone")
-
-                        os.makedirs(folder_name_path, exist_ok=True)
-
-                        try:
-                            self.copy_with_progress(map_folder, folder_name_path)
-                        except Exception as E:
-                            show_message("Error", f"Error copying files: {E}", icon="cancel")
-
-                        if self.settings_tab.clean_on_finish:
-                            remove_tree(map_folder)
-                            remove_tree(download_folder)
-
-                        self.library_tab.update_item(self.edit_destination_folder.get(), workshop_id, mod_type, folder_name)
-
-                        if index == len(items) - 1:
-                            self.after(1, self.status_text.configure(text=f"Status: Done! => Please press stop only if you see no popup window (rare bug)"))
-                            self.show_complete_message(message=f"All files were downloaded\nYou can run the game now!\nPS: You have to restart the game \n(pressing launch will launch/restarts)")
-                            self.label_speed.configure(text="Awaiting Download!")
-                    elif os.path.exists(json_file_path) and not self.settings_tab.stopped:
-                        show_message("Error", "Failed to find workshop.json, please try again.", icon="cancel")
-                        if index == len(items) - 1:
-                            self.stop_download()
+                    # failed, skipped or stopped
+                    if job.state != JOB_INSTALLING:
                         return
 
-                self.button_download.configure(state="disabled")
-                self.button_stop.configure(state="normal")
+                    # installs on the pipeline's thread while the next item downloads
+                    self.stage_for_install(job, map_folder, download_folder, destination_folder)
+
+                self.ui.configure(self.button_download, state="disabled")
+                self.ui.configure(self.button_stop, state="normal")
                 update_wait_thread = threading.Thread(target=wait_for_threads)
                 update_wait_thread.start()
                 steamcmd_thread.join()
                 update_wait_thread.join()
+                # it failed or got skipped, a staged item is the install stage's
+                if job.state not in (JOB_INSTALLING, JOB_DONE):
+                    self.queue_eta.item_finished(workshop_id, learn=False)
+                # stalled or preempted, it gets another go when its turn comes
+                if job.state == JOB_QUEUED:
+                    scheduler.add(job)
+                else:
+                    done_count += 1
+                last_job = job
+                job = scheduler.pop(close=True)
 
-                if index == len(items) - 1:
-                    self.button_download.configure(state="normal")
-                    self.button_stop.configure(state="disabled")
-                    self.after(1, self.status_text.configure(text=f"Status: Done!"))
-                    self.skip_boutton.grid_remove()
-                    self.after(1, self.label_file_size.configure(text=f"File size: 0KB"))
-                    self.settings_tab.stopped = True
-                    self.stop_download()
-                    return
+            if not done_count or any(job.reason == "Stopped" for job in list(self.download_jobs.values())):
+                return
+            self.finish_install_pipeline()
+            if last_job.state == JOB_DONE:
+                self.ui.configure(self.status_text, text=f"Status: Done! => Please press stop only if you see no popup window (rare bug)")
+                self.show_complete_message(message=f"All files were downloaded\nYou can run the game now!\nPS: You have to restart the game \n(pressing launch will launch/restarts)")
+                self.ui.configure(self.label_speed, text="Awaiting Download!")
+            self.ui.configure(self.button_download, state="normal")
+            self.ui.configure(self.button_stop, state="disabled")
+            self.ui.configure(self.status_text, text=f"Status: Done!")
+            self.ui.grid_remove(self.skip_boutton)
+            self.ui.configure(self.label_file_size, text=f"File size: 0KB")
+            self.stop_download()
         finally:
-            self.settings_tab.steam_fail_counter = 0
-            self.after(1, self.label_file_size.configure(text=f"File size: 0KB"))
+            self.close_queue()
+            # a stop or an error still installs what was downloaded
+            self.finish_install_pipeline()
+            if not self.closing:
+                self.queue_journal.finish()
+            self.ui.configure(self.label_file_size, text=f"File size: 0KB")
+            if self.queue_eta:
+                self.queue_eta.save()
             self.stop_download()
+            self.download_running = False
             self.is_pressed = False
+            self.ui.configure(self.button_download, state="normal")
+            self.after(0, self.start_waiting_downloads)
 
     def download_thread(self, update=None, invalid_item_folder=None):
         try:
-            self.settings_tab.stopped = False
-
             save_config("DestinationFolder" ,self.edit_destination_folder.get())
             save_config("SteamCMDPath" ,self.edit_steamcmd_path.get())
 
@@ -1454,110 +1540,54 @@ class BOIIIWD(ctk.CTk):
                         return
                     show_message("Heads up! map not skipped => Skip is off in settings", f"This item may already be installed: {workshop_id}", icon="info")
 
-            self.after(1, lambda mid=workshop_id: self.label_file_size.configure(text=f"File size: {get_workshop_file_size(mid ,raw=True)}"))
-            download_folder = os.path.join(get_steamcmd_path(), "steamapps", "workshop", "downloads", "311210", workshop_id)
-            map_folder = os.path.join(get_steamcmd_path(), "steamapps", "workshop", "content", "311210", workshop_id)
+            self.ui.configure(self.label_file_size, text=f"File size: {get_workshop_file_size(workshop_id ,raw=True)}")
+            download_folder, map_folder = get_workshop_folders(get_staging_dir(get_steamcmd_path()), workshop_id)
             if not os.path.exists(download_folder):
                 os.makedirs(download_folder)
 
+            self.download_progress = QueueProgress(use_counters=self.settings_tab.estimated_progress)
+            self.download_progress.add_item(workshop_id, ws_file_size)
+            self.download_progress.set_folders(workshop_id, download_folder, map_folder)
+            self.queue_eta = QueueETA(self.download_progress)
+            self.queue_eta.item_started(workshop_id)
+            job = self.create_download_jobs([workshop_id])[0]
+            self.current_job = job
+
             def check_and_update_progress():
-                previous_net_speed = 0
-                est_downloaded_bytes = 0
+                meter = ThroughputMeter(process_supervisor.running)
+                meter.start_item(workshop_id)
                 start_time = time.time()
-                file_size = ws_file_size
-
-                while not self.settings_tab.stopped:
-                    if self.settings_tab.steamcmd_reset:
-                        self.settings_tab.steamcmd_reset = False
-                        previous_net_speed = 0
-                        est_downloaded_bytes = 0
-
-                    while not self.is_downloading and not self.settings_tab.stopped:
-                        self.after(1, self.label_speed.configure(text=f"Waiting for steamcmd..."))
-                        time_elapsed = time.time() - start_time
-                        elapsed_hours, elapsed_minutes, elapsed_seconds = convert_seconds(time_elapsed)
-                        if self.settings_tab.show_fails:
-                            self.after(1, lambda h=elapsed_hours, m=elapsed_minutes, s=elapsed_seconds: self.elapsed_time.configure(text=f"Elapsed Time: {int(h):02d}:{int(m):02d}:{int(s):02d} - Fails: {self.fail_threshold}"))
-                        else:
-                            self.after(1, lambda h=elapsed_hours, m=elapsed_minutes, s=elapsed_seconds: self.elapsed_time.configure(text=f"Elapsed Time: {int(h):02d}:{int(m):02d}:{int(s):02d}"))
-                        time.sleep(1)
-                        if self.is_downloading:
-                            break
-
-                    try:
-                        current_size = sum(os.path.getsize(os.path.join(download_folder, f)) for f in os.listdir(download_folder))
-                    except:
-                        try:
-                            current_size = sum(os.path.getsize(os.path.join(map_folder, f)) for f in os.listdir(map_folder))
-                        except:
-                            continue
-
-                    progress = int(current_size / file_size * 100)
-
-                    if progress > 100:
-                        progress = int(current_size / current_size * 100)
-                        file_size = current_size
-                        self.after(1, lambda p=progress: self.label_file_size.configure(text=f"Wrong size reported\nActual size: ~{convert_bytes_to_readable(current_size)}"))
 
+                # runs until steamcmd is done with the item (installing) or it's stopped/failed
+                while job.state in (JOB_QUEUED, JOB_RESOLVING, JOB_DOWNLOADING):
+                    fails = f" - Fails: {job.fails}" if self.settings_tab.show_fails else ""
+                    time_elapsed = time.time() - start_time
+                    elapsed_hours, elapsed_minutes, elapsed_seconds = convert_seconds(time_elapsed)
 
-                    if self.settings_tab.estimated_progress and not self.settings_tab.stopped:
-                        time_elapsed = time.time() - start_time
-                        raw_net_speed = psutil.net_io_counters().bytes_recv
-
-                        current_net_speed_text = raw_net_speed
-                        net_speed_bytes = current_net_speed_text - previous_net_speed
-                        previous_net_speed = current_net_speed_text
-
-                        current_net_speed = net_speed_bytes
-                        down_cap = 150000000
-                        if current_net_speed >= down_cap:
-                            current_net_speed = 10
-
-                        est_downloaded_bytes += current_net_speed
+                    if not job.downloading:
+                        self.ui.configure(self.label_speed, text=f"Waiting for steamcmd...")
+                        self.ui.configure(self.elapsed_time, text=f"Elapsed Time: {int(elapsed_hours):02d}:{int(elapsed_minutes):02d}:{int(elapsed_seconds):02d}{fails}")
+                        job.wait_for_change(self.ui.refresh_interval())
+                        continue
 
-                        percentage_complete = (est_downloaded_bytes / file_size) * 100
+                    if self.download_progress.refresh(workshop_id):
+                        item_size = self.download_progress.item(workshop_id).bytes_total
+                        self.ui.configure(self.label_file_size, text=f"Wrong size reported\nActual size: ~{convert_bytes_to_readable(item_size)}")
+                    progress = self.download_progress.fraction(workshop_id)
 
-                        progress = min(percentage_complete / 100, 0.99)
+                    network_rate, disk_rate = meter.sample()
+                    eta_text = format_eta(*self.queue_eta.estimate(network_rate, workshop_id))
 
-                        net_speed, speed_unit = convert_speed(net_speed_bytes)
+                    self.ui.set(self.progress_bar, progress)
+                    self.ui.configure(self.label_speed, text=self.format_throughput(network_rate, disk_rate))
+                    self.ui.configure(self.progress_text, text=f"{progress * 100:.2f}%")
+                    self.ui.configure(self.elapsed_time, text=f"Elapsed Time: {int(elapsed_hours):02d}:{int(elapsed_minutes):02d}:{int(elapsed_seconds):02d}{fails}{eta_text}")
+                    job.wait_for_change(self.ui.refresh_interval())
 
-                        elapsed_hours, elapsed_minutes, elapsed_seconds = convert_seconds(time_elapsed)
-
-                        # print(f"raw_net {raw_net_speed}\ncurrent_net_speed: {current_net_speed}\nest_downloaded_bytes {est_downloaded_bytes}\npercentage_complete {percentage_complete}\nprogress {progress}")
-
-                        self.after(1, self.progress_bar.set(progress))
-                        self.after(1, lambda v=net_speed: self.label_speed.configure(text=f"Network Speed: {v:.2f} {speed_unit}"))
-                        self.after(1, lambda p=min(percentage_complete ,99): self.progress_text.configure(text=f"{p:.2f}%"))
-                        if self.settings_tab.show_fails:
-                            self.after(1, lambda h=elapsed_hours, m=elapsed_minutes, s=elapsed_seconds: self.elapsed_time.configure(text=f"Elapsed Time: {int(h):02d}:{int(m):02d}:{int(s):02d} - Fails: {self.fail_threshold}"))
-                        else:
-                            self.after(1, lambda h=elapsed_hours, m=elapsed_minutes, s=elapsed_seconds: self.elapsed_time.configure(text=f"Elapsed Time: {int(h):02d}:{int(m):02d}:{int(s):02d}"))
+                meter.finish_item("done" if job.state in (JOB_INSTALLING, JOB_DONE) else job.state)
 
-                        time.sleep(1)
-                    else:
-                        if not self.settings_tab.stopped:
-                            time_elapsed = time.time() - start_time
-                            progress = int(current_size / file_size * 100)
-                            self.after(1, lambda v=progress / 100.0: self.progress_bar.set(v))
-
-                            current_net_speed = psutil.net_io_counters().bytes_recv
-
-                            net_speed_bytes = current_net_speed - previous_net_speed
-                            previous_net_speed = current_net_speed
-
-                            net_speed, speed_unit = convert_speed(net_speed_bytes)
-                            elapsed_hours, elapsed_minutes, elapsed_seconds = convert_seconds(time_elapsed)
-
-                            self.after(1, lambda v=net_speed: self.label_speed.configure(text=f"Network Speed: {v:.2f} {speed_unit}"))
-                            self.after(1, lambda p=progress: self.progress_text.configure(text=f"{p}%"))
-                            if self.settings_tab.show_fails:
-                                self.after(1, lambda h=elapsed_hours, m=elapsed_minutes, s=elapsed_seconds: self.elapsed_time.configure(text=f"Elapsed Time: {int(h):02d}:{int(m):02d}:{int(s):02d} - Fails: {self.fail_threshold}"))
-                            else:
-                                self.after(1, lambda h=elapsed_hours, m=elapsed_minutes, s=elapsed_seconds: self.elapsed_time.configure(text=f"Elapsed Time: {int(h):02d}:{int(m):02d}:{int(s):02d}"))
-                            time.sleep(1)
-
-            command = f"+login anonymous app_update 311210 +workshop_download_item 311210 {workshop_id} validate +quit"
-            steamcmd_thread = threading.Thread(target=lambda: self.run_steamcmd_command(command, map_folder, workshop_id))
+            command = build_steamcmd_command(workshop_id, install_dir=get_staging_dir(get_steamcmd_path()))
+            steamcmd_thread = threading.Thread(target=lambda: self.run_steamcmd_command(command, map_folder, job))
             steamcmd_thread.start()
 
             def wait_for_threads():
@@ -1566,130 +1596,193 @@ class BOIIIWD(ctk.CTk):
                 update_ui_thread.start()
                 update_ui_thread.join()
 
-                self.settings_tab.stopped = True
-                self.progress_text.configure(text="0%")
-                self.progress_bar.set(0.0)
+                self.ui.configure(self.progress_text, text="0%")
+                self.ui.set(self.progress_bar, 0.0)
 
-                map_folder = os.path.join(get_steamcmd_path(), "steamapps", "workshop", "content", "311210", workshop_id)
+                # failed or stopped
+                if job.state != JOB_INSTALLING:
+                    return
 
                 json_file_path = os.path.join(map_folder, "workshop.json")
 
                 if os.path.exists(json_file_path):
-                    self.label_speed.configure(text="Installing...")
-                    mod_type = extract_json_data(json_file_path, "Type")
-                    items_file = os.path.join(APPLICATION_PATH, LIBRARY_FILE)
-                    item_exists,_ = self.library_tab.item_exists_in_file(items_file, workshop_id)
-
-                    if invalid_item_folder:
-                        folder_name = invalid_item_folder
-                    else:
-                        if item_exists:
-                            get_folder_name = self.library_tab.get_item_by_id(items_file, workshop_id, return_option="folder_name")
-                            if get_folder_name:
-                                folder_name = get_folder_name
-                            else:
-                                try:
-                                    folder_name = extract_json_data(json_file_path, self.settings_tab.folder_options.get())
-                                except:
-                                    folder_name = extract_json_data(json_file_path, "publisherID")
-                        else:
-                            try:
-                                folder_name = extract_json_data(json_file_path, self.settings_tab.folder_options.get())
-                            except:
-                                folder_name = extract_json_data(json_file_path, "publisherID")
-
-                    if mod_type == "mod":
-                        path_folder = os.path.join(destination_folder, "mods")
-                        folder_name_path = os.path.join(path_folder, folder_name, "zone")
-                    elif mod_type == "map":
-                        path_folder = os.path.join(destination_folder, "usermaps")
-                        folder_name_path = os.path.join(path_folder, folder_name, "zone")
-                    else:
-                        show_message("Error", "Invalid workshop type in workshop.json, are you sure this is a map or a mod?.", icon="cancel")
+                    self.queue_eta.download_finished(workshop_id)
+                    mod_type = self.install_downloaded_item(workshop_id, map_folder, download_folder, destination_folder, invalid_item_folder)
+                    job.transition(JOB_DONE if mod_type else JOB_FAILED, None if mod_type else "Install failed")
+                    self.queue_eta.item_finished(workshop_id, learn=bool(mod_type))
+                    if not mod_type:
                         self.stop_download()
                         return
 
-                    if not item_exists:
-                        while os.path.exists(os.path.join(path_folder, folder_name)):
-                            folder_name += f"_{workshop_id}"
-                            folder_name_path = os.path.join(path_folder, folder_name, "zone")
-
-                    os.makedirs(folder_name_path, exist_ok=True)
-
-                    try:
-                        self.copy_with_progress(map_folder, folder_name_path)
-                    except Exception as E:
-                        show_message("Error", f"Error copying files: {E}", icon="cancel")
-
-                    if self.settings_tab.clean_on_finish:
-                        remove_tree(map_folder)
-                        remove_tree(download_folder)
-
-                    if not invalid_item_folder:
-                        self.library_tab.update_item(self.edit_destination_folder.get(), workshop_id, mod_type, folder_name)
                     self.show_complete_message(message=f"{mod_type.capitalize()} files were downloaded\nYou can run the game now!\nPS: You have to restart the game \n(pressing launch will launch/restarts)")
-                    self.button_download.configure(state="normal")
-                    self.button_stop.configure(state="disabled")
-                elif os.path.exists(json_file_path) and not self.settings_tab.stopped:
+                    self.ui.configure(self.button_download, state="normal")
+                    self.ui.configure(self.button_stop, state="disabled")
+                elif job.transition(JOB_FAILED, "Failed to find workshop.json"):
                     show_message("Error", "Failed to find workshop.json, please try again.", icon="cancel")
                     self.stop_download()
                     return
 
             update_wait_thread = threading.Thread(target=wait_for_threads)
             update_wait_thread.start()
-            self.button_download.configure(state="disabled")
-            self.button_stop.configure(state="normal")
+            self.ui.configure(self.button_download, state="disabled")
+            self.ui.configure(self.button_stop, state="normal")
             steamcmd_thread.join()
             update_wait_thread.join()
 
         finally:
-            self.settings_tab.steam_fail_counter = 0
+            if self.queue_eta:
+                self.queue_eta.save()
             self.stop_download()
+            self.download_running = False
             self.is_pressed = False
+            self.ui.configure(self.button_download, state="normal")
+            self.after(0, self.start_waiting_downloads)
+
+    # copies a downloaded item from steamcmd into boiii and records it in the library, returns its type
+    def install_downloaded_item(self, workshop_id, map_folder, download_folder, destination_folder, invalid_item_folder=None):
+        json_file_path = os.path.join(map_folder, "workshop.json")
+        if not os.path.exists(json_file_path):
+            return None
+
+        # parallel workers finish at random times, only one of them installs at a time
+        with self.install_lock:
+            if not self.is_downloading:
+                self.ui.configure(self.label_speed, text="Installing...")
+            mod_type = extract_json_data(json_file_path, "Type")
+            items_file = os.path.join(APPLICATION_PATH, LIBRARY_FILE)
+            item_exists,_ = self.library_tab.item_exists_in_file(items_file, workshop_id)
+
+            if invalid_item_folder:
+                folder_name = invalid_item_folder
+            else:
+                if item_exists:
+                    get_folder_name = self.library_tab.get_item_by_id(items_file, workshop_id, return_option="folder_name")
+                    if get_folder_name:
+                        folder_name = get_folder_name
+                    else:
+                        try:
+                            folder_name = extract_json_data(json_file_path, self.settings_tab.folder_options.get())
+                        except:
+                            folder_name = extract_json_data(json_file_path, "publisherID")
+                else:
+                    try:
+                        folder_name = extract_json_data(json_file_path, self.settings_tab.folder_options.get())
+                    except:
+                        folder_name = extract_json_data(json_file_path, "publisherID")
+
+            if mod_type == "mod":
+                path_folder = os.path.join(destination_folder, "mods")
+                folder_name_path = os.path.join(path_folder, folder_name, "zone")
+            elif mod_type == "map":
+                path_folder = os.path.join(destination_folder, "usermaps")
+                folder_name_path = os.path.join(path_folder, folder_name, "zone")
+            else:
+                show_message("Error", f"Invalid workshop type in workshop.json, are you sure this is a map or a mod?., skipping {workshop_id}...", icon="cancel")
+                return None
+
+            if not item_exists:
+                while os.path.exists(os.path.join(path_folder, folder_name)):
+                    folder_name += f"_{workshop_id}"
+                    folder_name_path = os.path.join(path_folder, folder_name, "zone")
 
-    def copy_with_progress(self, src, dst):
+            os.makedirs(folder_name_path, exist_ok=True)
+
+            try:
+                # the content folder goes away after the install anyway, on the same drive renaming it is enough
+                if self.settings_tab.clean_on_finish and same_volume(map_folder, folder_name_path):
+                    self.move_with_progress(map_folder, folder_name_path)
+                else:
+                    stats = self.copy_with_progress(map_folder, folder_name_path, sync=True)
+                    if stats and not self.is_downloading:
+                        self.ui.configure(self.label_speed, text=f"Installed: {convert_bytes_to_readable(stats.bytes_written)} written, {convert_bytes_to_readable(stats.bytes_skipped)} unchanged")
+            except Exception as E:
+                show_message("Error", f"Error copying files: {E}", icon="cancel")
+
+            # moved/copied files keep steamcmd's (or the staged copy's) mtimes, the library reads the install date from them
+            try:
+                for ff_file in Path(folder_name_path).glob("*.ff"):
+                    os.utime(ff_file, None)
+                os.utime(folder_name_path, None)
+            except OSError:
+                pass
+
+            if self.settings_tab.clean_on_finish:
+                remove_tree(download_folder)
+                # the next update stages a fresh copy of the installed files
+                remove_tree(map_folder)
+                remove_other_stagings(get_steamcmd_path(), workshop_id, map_folder)
+
+            if not invalid_item_folder:
+                self.library_tab.update_item(self.edit_destination_folder.get(), workshop_id, mod_type, folder_name)
+            return mod_type
+
+    def move_with_progress(self, src, dst):
+        self.ui.configure(self.progress_text, text="Moving files...")
         try:
-            total_files = sum([len(files) for root, dirs, files in os.walk(src)])
-            progress = 0
-
-            def copy_progress(src, dst):
-                nonlocal progress
-                shutil.copy2(src, dst)
-                progress += 1
-                self.progress_text.configure(text=f"Copying files: {progress}/{total_files}")
-                value = (progress / total_files) * 100
-                valuep = value / 100
-                self.progress_bar.set(valuep)
+            # files the new version of the item dropped
+            remove_dropped_files(src, dst)
+            move_tree(src, dst)
+        except OSError:
+            # e.g. a file locked by the game, whatever wasn't moved gets copied
+            self.copy_with_progress(src, dst)
+        finally:
+            self.ui.configure(self.progress_text, text="0%")
 
+    # sync: only new/changed files are copied and the ones src doesn't have are removed from dst, returns the CopyStats
+    def copy_with_progress(self, src, dst, sync=False):
+        try:
             try:
-                shutil.copytree(src, dst, dirs_exist_ok=True, copy_function=copy_progress)
+                # called from the copying threads, it goes through the ui bus
+                return TreeCopier(self.show_copy_progress, hash_cache=HashCache() if sync else None).copy_tree(src, dst)
             except Exception as E:
                 show_message("Error", f"Error copying files: {E}", icon="cancel")
         finally:
-            self.progress_text.configure(text="0%")
-            self.progress_bar.set(0.0)
+            self.ui.configure(self.progress_text, text="0%")
+            self.ui.set(self.progress_bar, 0.0)
 
-    def stop_download(self, on_close=None):
-        self.settings_tab.stopped = True
-        self.queue_stop_button = True
-        self.settings_tab.steam_fail_counter = 0
-        self.is_pressed = False
-        self.is_downloading = False
-        self.after(1, self.label_file_size.configure(text=f"File size: 0KB"))
+    # a pipelined install leaves the progress bar to the item that's downloading
+    def show_copy_progress(self, bytes_done, bytes_total):
+        if self.is_downloading:
+            return
+        self.ui.configure(self.progress_text, text=f"Copying files: {convert_bytes_to_readable(bytes_done)}/{convert_bytes_to_readable(bytes_total)}")
+        self.ui.set(self.progress_bar, bytes_done / bytes_total if bytes_total else 0)
 
+    def report_cancel_latency(self, status):
+        def on_done(latency):
+            if latency:
+                self.ui.configure(self.status_text, text=f"Status: {status} (steamcmd stopped in {latency * 1000:.0f}ms)")
+        return on_done
+
+    # stopping also drops what waited for the current download
+    def stop_button_event(self):
+        with self.scheduler_lock:
+            self.waiting_downloads = []
+        self.stop_download()
+
+    def stop_download(self, on_close=None):
+        self.cancel_download_jobs()
+        if self.stall_watchdog:
+            self.stall_watchdog.stop()
+        # the download thread still installs and cleans up, a new one can't start until it's done
+        if not self.download_running:
+            self.is_pressed = False
+        self.ui.configure(self.label_file_size, text=f"File size: 0KB")
         if on_close:
-            subprocess.run(['taskkill', '/F', '/IM', 'steamcmd.exe'], stdout=subprocess.PIPE, stderr=subprocess.PIPE,
-                       creationflags=subprocess.CREATE_NO_WINDOW)
+            process_supervisor.cancel_all(wait=True, grace_period=1)
             return
 
-        subprocess.run(['taskkill', '/F', '/IM', 'steamcmd.exe'], stdout=subprocess.PIPE, stderr=subprocess.PIPE,
-                       creationflags=subprocess.CREATE_NO_WINDOW)
-
-        self.button_download.configure(state="normal")
-        self.button_stop.configure(state="disabled")
-        self.progress_text.configure(text="0%")
-        self.elapsed_time.configure(text=f"")
-        self.progress_bar.set(0.0)
-        self.after(50, self.status_text.configure(text=f"Status: Standby!"))
-        self.after(1, self.label_speed.configure(text=f"Awaiting Download!"))
-        self.skip_boutton.grid_remove()
+        # only our own steamcmd processes, cancelled off the Tk thread
+        process_supervisor.cancel_all(on_done=self.report_cancel_latency("Standby!"))
+        if self.download_pool:
+            self.download_pool.stop()
+        self.close_steamcmd_session()
+
+        if not self.download_running:
+            self.ui.configure(self.button_download, state="normal")
+        self.ui.configure(self.button_stop, state="disabled")
+        self.ui.configure(self.progress_text, text="0%")
+        self.ui.configure(self.elapsed_time, text=f"")
+        self.ui.set(self.progress_bar, 0.0)
+        self.ui.configure(self.status_text, text=f"Status: Standby!")
+        self.ui.configure(self.label_speed, text=f"Awaiting Download!")
+        self.ui.grid_remove(self.skip_boutton)
@@ -0,0 +1,58 @@
+from src.imports import *
+from src.helpers import *
+
+
+# speculative metadata lookups, started when an id is typed/pasted or a library row is hovered
+# results land in the metadata cache so Details/Download find them ready
+class MetadataPrefetcher:
+    def __init__(self, delay=0.6):
+        self.delay = delay
+        self.timer = None
+        self.generation = 0
+        self.in_flight = set()
+        self.lock = threading.Lock()
+        self.enabled = check_config("prefetch", "on") != "off"
+
+    def prefetch(self, workshop_id, delay=None):
+        if not self.enabled:
+            return
+        workshop_id = str(workshop_id).strip()
+        with self.lock:
+            # debounce, only the last id typed/hovered gets fetched
+            if self.timer:
+                self.timer.cancel()
+                self.timer = None
+            self.generation += 1
+            if get_cached_metadata(workshop_id, "details") or workshop_id in self.in_flight:
+                return
+            self.timer = threading.Timer(self.delay if delay is None else delay, self.run, args=(workshop_id, self.generation))
+            self.timer.daemon = True
+            self.timer.start()
+
+    # drops the pending lookup, one already running is left to finish and fill the cache
+    def cancel(self):
+        with self.lock:
+            if self.timer:
+                self.timer.cancel()
+                self.timer = None
+
+    def is_current(self, generation):
+        with self.lock:
+            return generation == self.generation
+
+    def run(self, workshop_id, generation):
+        with self.lock:
+            if generation != self.generation or workshop_id in self.in_flight:
+                return
+            self.in_flight.add(workshop_id)
+        try:
+            item_steam_api(workshop_id)
+            # superseded by another id while the api call was running
+            if not self.is_current(generation):
+                return
+            get_item_details(workshop_id)
+        except Exception:
+            pass
+        finally:
+            with self.lock:
+                self.in_flight.discard(workshop_id)
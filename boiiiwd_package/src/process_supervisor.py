@@ -0,0 +1,98 @@
+from src.imports import *
+
+
+STEAMCMD_GRACE_PERIOD = 3
+
+
+# owns every steamcmd we start, stop/skip cancel through these handles instead of taskkill /IM
+# so other steamcmd instances on the machine are left alone
+class ProcessSupervisor:
+    def __init__(self, grace_period=STEAMCMD_GRACE_PERIOD):
+        self.grace_period = grace_period
+        self.processes = {}
+        self.lock = threading.Lock()
+        self.last_latency = None
+
+    def register(self, process):
+        with self.lock:
+            self.processes[process.pid] = process
+        return process
+
+    def unregister(self, process):
+        with self.lock:
+            self.processes.pop(process.pid, None)
+
+    def running(self):
+        with self.lock:
+            return [process for process in self.processes.values() if process.poll() is None]
+
+    # terminate, kill after the grace period, then reap whatever it spawned, returns the latency in seconds
+    def terminate(self, process, grace_period=None):
+        grace_period = self.grace_period if grace_period is None else grace_period
+        start = time.perf_counter()
+        try:
+            children = psutil.Process(process.pid).children(recursive=True)
+        except psutil.Error:
+            children = []
+
+        if process.poll() is None:
+            try:
+                process.terminate()
+                process.wait(timeout=grace_period)
+            except subprocess.TimeoutExpired:
+                try:
+                    process.kill()
+                    process.wait(timeout=grace_period)
+                except Exception:
+                    pass
+            except Exception:
+                pass
+
+        for child in children:
+            try: child.terminate()
+            except psutil.Error: pass
+        _, alive = psutil.wait_procs(children, timeout=grace_period)
+        for child in alive:
+            try: child.kill()
+            except psutil.Error: pass
+
+        self.unregister(process)
+        self.last_latency = time.perf_counter() - start
+        return self.last_latency
+
+    # same as terminate() but off the calling thread, on_done gets the latency
+    def cancel(self, process, on_done=None, grace_period=None):
+        def cancel_thread():
+            latency = self.terminate(process, grace_period)
+            if on_done:
+                on_done(latency)
+        threading.Thread(target=cancel_thread, daemon=True).start()
+
+    def cancel_all(self, on_done=None, wait=False, grace_period=None):
+        processes = self.running()
+        if not processes:
+            if on_done:
+                on_done(0)
+            return
+
+        latencies = []
+        def cancel_thread(process):
+            latencies.append(self.terminate(process, grace_period))
+
+        threads = [threading.Thread(target=cancel_thread, args=(process,), daemon=True) for process in processes]
+        for thread in threads:
+            thread.start()
+
+        def wait_threads():
+            for thread in threads:
+                thread.join()
+            if on_done:
+                on_done(max(latencies, default=0))
+
+        if wait:
+            wait_threads()
+        else:
+            threading.Thread(target=wait_threads, daemon=True).start()
+
+
+process_supervisor = ProcessSupervisor()
@@ -0,0 +1,150 @@
+from src.imports import *
+from src.helpers import *
+from src.download_job import JOB_DONE, JOB_DOWNLOADING, JOB_FAILED, JOB_INSTALLING, JOB_QUEUED, JOB_RESOLVING, JOB_SKIPPED
+
+
+DEFAULT_RESOLVE_TTL = 6
+# seconds state changes are gathered before the journal is written
+FLUSH_DELAY = 1
+FINISHED_STATES = (JOB_DONE, JOB_FAILED, JOB_SKIPPED)
+# left unfinished by a crash/reboot (or the window getting closed mid queue)
+RESUMABLE_STATES = (JOB_QUEUED, JOB_RESOLVING, JOB_DOWNLOADING, JOB_INSTALLING)
+
+
+# hours an item's validation and size are trusted without asking steam again
+def get_resolve_ttl():
+    try:
+        return max(float(check_config("queue_resolve_ttl", str(DEFAULT_RESOLVE_TTL))), 0) * 3600
+    except ValueError:
+        return DEFAULT_RESOLVE_TTL * 3600
+
+
+# the running queue in boiiiwd_queue.json: every item's state and what validating it found out,
+# rewritten (atomically) a moment after state changes, a crash loses at most the last FLUSH_DELAY
+class QueueJournal:
+    def __init__(self, path=None):
+        self.path = path or os.path.join(APPLICATION_PATH, QUEUE_JOURNAL_FILE)
+        self.lock = threading.Lock()
+        # held while writing, so an older snapshot can't land on top of a newer one
+        self.write_lock = threading.Lock()
+        self.dirty = False
+        # an item finished since the last write, that one goes to disk for sure (fsync)
+        self.sync_pending = False
+        self.flush_timer = None
+        self.active = False
+        self.update = False
+        self.order = []
+        # workshop id -> {"state", "reason", "size", "resolved", "changed"}
+        self.items = {}
+
+    @classmethod
+    def load(cls, path=None):
+        journal = cls(path)
+        try:
+            with open(journal.path, "r") as file:
+                data = json.load(file)
+            journal.active = bool(data.get("active"))
+            journal.update = bool(data.get("update"))
+            journal.order = [str(workshop_id) for workshop_id in data.get("order", [])]
+            journal.items = {str(workshop_id): item for workshop_id, item in data.get("items", {}).items()}
+        except (OSError, ValueError, AttributeError):
+            pass
+        return journal
+
+    # size of an item validated less than queue_resolve_ttl ago, None when it has to be checked again
+    def recent_size(self, workshop_id):
+        with self.lock:
+            item = self.items.get(str(workshop_id))
+            if item and item.get("size") is not None and time.time() - item.get("resolved", 0) < get_resolve_ttl():
+                return item["size"]
+        return None
+
+    def resolved(self, workshop_id, size):
+        with self.lock:
+            item = self.items.setdefault(str(workshop_id), {})
+            if item.get("size") != size or not item.get("resolved"):
+                item["resolved"] = time.time()
+            item["size"] = size
+
+    def start(self, workshop_ids, update=False):
+        with self.lock:
+            self.active = True
+            self.update = bool(update)
+            self.order = [str(workshop_id) for workshop_id in workshop_ids]
+            for workshop_id in self.order:
+                item = self.items.setdefault(workshop_id, {})
+                item.update(state=JOB_QUEUED, reason=None, changed=time.time())
+            self.mark_dirty_locked(sync=True)
+        self.flush()
+
+    # items added to the queue while it runs
+    def add(self, workshop_ids):
+        with self.lock:
+            if not self.active:
+                return
+            for workshop_id in map(str, workshop_ids):
+                if workshop_id not in self.order:
+                    self.order.append(workshop_id)
+                self.items.setdefault(workshop_id, {}).update(state=JOB_QUEUED, reason=None, changed=time.time())
+            self.schedule_flush_locked()
+
+    # called on every transition (often on the Tk thread), only marks the journal for the next write
+    def on_job_change(self, job):
+        with self.lock:
+            item = self.items.get(job.workshop_id)
+            if not self.active or job.workshop_id not in self.order or item is None:
+                return
+            item.update(state=job.state, reason=job.reason, changed=job.changed)
+            self.schedule_flush_locked(sync=job.state in FINISHED_STATES)
+
+    # ids to pick up again: not done yet, or stopped by the app closing
+    def resumable(self):
+        with self.lock:
+            if not self.active:
+                return []
+            return [workshop_id for workshop_id in self.order
+                    if self.items.get(workshop_id, {}).get("state") in RESUMABLE_STATES
+                    or (self.items.get(workshop_id, {}).get("state") == JOB_FAILED and self.items[workshop_id].get("reason") == "Stopped")]
+
+    # the queue ended (or was stopped) on purpose, resolved sizes are kept for the next one
+    def finish(self):
+        with self.lock:
+            self.active = False
+            self.order = []
+            ttl = get_resolve_ttl()
+            self.items = {workshop_id: {"size": item.get("size"), "resolved": item.get("resolved", 0)}
+                          for workshop_id, item in self.items.items() if time.time() - item.get("resolved", 0) < ttl}
+            self.mark_dirty_locked(sync=True)
+        self.flush()
+
+    def mark_dirty_locked(self, sync=False):
+        self.dirty = True
+        self.sync_pending = self.sync_pending or sync
+
+    def schedule_flush_locked(self, sync=False):
+        self.mark_dirty_locked(sync)
+        if not self.flush_timer:
+            self.flush_timer = threading.Timer(FLUSH_DELAY, self.flush)
+            self.flush_timer.daemon = True
+            self.flush_timer.start()
+
+    # writes what changed since the last write, if anything
+    def flush(self):
+        with self.write_lock:
+            with self.lock:
+                self.flush_timer = None
+                if not self.dirty:
+                    return
+                data = json.dumps({"active": self.active, "update": self.update, "order": self.order, "items": self.items})
+                sync = self.sync_pending
+                self.dirty = self.sync_pending = False
+            temp_path = f"{self.path}.tmp"
+            try:
+                with open(temp_path, "w") as file:
+                    file.write(data)
+                    if sync:
+                        file.flush()
+                        os.fsync(file.fileno())
+                os.replace(temp_path, self.path)
+            except OSError:
+                pass
@@ -0,0 +1,143 @@
+from src.imports import *
+from src.helpers import *
+
+
+FAIL_TIMEOUT = "timeout"
+FAIL_NO_CONNECTION = "no_connection"
+FAIL_DISK_FULL = "disk_full"
+FAIL_INVALID_ITEM = "invalid_item"
+FAIL_LOCKED_FILES = "locked_files"
+# steamcmd's bare "Failure" result, usually a broken depot/manifest in its cache
+FAIL_GENERIC = "failure"
+# steamcmd died or gave no reason at all
+FAIL_EXITED = "exited"
+
+# substrings of the reason steamcmd gave -> failure class, first match wins
+FAILURE_PATTERNS = (
+    (FAIL_DISK_FULL, ("disk write failure", "disk full", "not enough disk space", "not enough space", "insufficient space")),
+    (FAIL_LOCKED_FILES, ("locking failed", "file locked", "sharing violation", "in use by another")),
+    (FAIL_INVALID_ITEM, ("file not found", "access denied", "invalid param", "invalid item", "no subscription")),
+    (FAIL_NO_CONNECTION, ("no connection", "service unavailable", "connection", "network", "offline")),
+    (FAIL_TIMEOUT, ("timeout", "timed out", "stalled")),
+    (FAIL_GENERIC, ("failure", "failed")),
+)
+
+FAILURE_HINTS = {
+    FAIL_DISK_FULL: "not enough disk space, free some space and try again",
+    FAIL_INVALID_ITEM: "the item isn't available (removed, private or not a BO3 item)",
+}
+
+
+# only the reason, steamcmd's startup output is full of harmless "failed"/"not found" lines
+def classify_failure(reason):
+    reason = (reason or "").lower()
+    for failure_class, patterns in FAILURE_PATTERNS:
+        if any(pattern in reason for pattern in patterns):
+            return failure_class
+    return FAIL_EXITED
+
+
+def failure_hint(reason):
+    return FAILURE_HINTS.get(classify_failure(reason), "try again or enable continuous download in settings")
+
+
+# backoff doubles from base_delay up to max_delay, reset_after = failures of the class before the cache gets wiped
+class RetryRule:
+    def __init__(self, base_delay, max_delay, retry=True, reset_after=None):
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry = retry
+        self.reset_after = reset_after
+
+    def delay(self, failures):
+        return min(self.base_delay * 2 ** max(failures - 1, 0), self.max_delay)
+
+
+# "reset" in reset_after means the user's "Reset steamcmd: (n of fails)" setting
+DEFAULT_RETRY_RULES = {
+    # the network's fault, wiping gigabytes of cache won't help
+    FAIL_TIMEOUT: RetryRule(2, 60),
+    FAIL_NO_CONNECTION: RetryRule(5, 120),
+    # retrying can't fix these
+    FAIL_DISK_FULL: RetryRule(0, 0, retry=False),
+    FAIL_INVALID_ITEM: RetryRule(0, 0, retry=False),
+    # a fresh steamcmd (reset_cache() closes it first) releases the locks
+    FAIL_LOCKED_FILES: RetryRule(2, 30, reset_after=3),
+    FAIL_GENERIC: RetryRule(1, 30, reset_after="reset"),
+    FAIL_EXITED: RetryRule(1, 30, reset_after="reset"),
+}
+
+
+# per item: failures by class, time spent backing off and cache resets
+class RetryStats:
+    def __init__(self):
+        self.failures = {}
+        self.backoff_time = 0.0
+        self.cache_resets = 0
+        self.stalls = 0
+        self.stall_time = 0.0
+        self.last_failure = None
+
+    @property
+    def total(self):
+        return sum(self.failures.values())
+
+    def add(self, failure_class):
+        self.failures[failure_class] = self.failures.get(failure_class, 0) + 1
+        self.last_failure = failure_class
+        return self.failures[failure_class]
+
+    def add_stall(self, seconds_lost):
+        self.stalls += 1
+        self.stall_time += seconds_lost
+
+    def to_dict(self, workshop_id, status):
+        return {
+            "id": workshop_id,
+            "status": status,
+            "failures": dict(self.failures),
+            "backoff_seconds": round(self.backoff_time, 2),
+            "cache_resets": self.cache_resets,
+            "stalls": self.stalls,
+            "stall_seconds": round(self.stall_time, 2),
+        }
+
+
+class RetryPolicy:
+    # reset_after: the user's fail count before a cache reset, None turns resets off
+    def __init__(self, reset_after=None, rules=None):
+        self.reset_after = reset_after
+        self.rules = rules or DEFAULT_RETRY_RULES
+
+    def rule(self, failure_class):
+        return self.rules.get(failure_class, self.rules[FAIL_EXITED])
+
+    # records a failed attempt of the job, resets steamcmd's cache if the class calls for it and
+    # waits out the backoff (a skip/stop wakes it up), returns False when the item shouldn't be retried
+    def handle_failure(self, job, reason, reset_cache):
+        failure_class = classify_failure(reason)
+        rule = self.rule(failure_class)
+        failures = job.register_fail(failure_class)
+        if not rule.retry:
+            return False
+
+        reset_after = self.reset_after if rule.reset_after == "reset" else rule.reset_after
+        if reset_after and self.reset_after and failures % reset_after == 0:
+            reset_cache()
+            job.retries.cache_resets += 1
+
+        started = time.time()
+        job.wait(lambda job: job.finished, rule.delay(failures))
+        job.retries.backoff_time += time.time() - started
+        return not job.finished
+
+
+# one json line per item that failed or stalled at least once, in boiiiwd_retries.jsonl
+def record_retries(job):
+    if not job.retries.total and not job.retries.stalls or check_config("record_retries", "on") == "off":
+        return
+    try:
+        with open(os.path.join(APPLICATION_PATH, RETRIES_FILE), "a") as file:
+            file.write(json.dumps(job.retries.to_dict(job.workshop_id, job.state)) + "\n")
+    except OSError:
+        pass
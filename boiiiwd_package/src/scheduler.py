@@ -0,0 +1,81 @@
+from src.imports import *
+from src.helpers import *
+from src.download_job import JOB_QUEUED
+
+
+# lower goes first: something the user just asked for, then item updates, then pasted queues
+LANE_INTERACTIVE = 0
+LANE_UPDATE = 1
+LANE_BULK = 2
+
+
+def shortest_job_first_enabled():
+    return check_config("shortest_job_first", "off") == "on"
+
+def preemption_enabled():
+    return check_config("preempt_downloads", "off") == "on"
+
+
+# pending jobs of the running queue, handed out by lane, then (optionally) smallest first, then in the order they came in.
+# stalled items go behind the ones of their lane that haven't had a go yet, preempted ones resume first
+class JobScheduler:
+    def __init__(self, shortest_first=None):
+        self.shortest_first = shortest_job_first_enabled() if shortest_first is None else shortest_first
+        self.heap = []
+        self.counter = itertools.count()
+        # workshop id -> the order it first came in, kept when it goes back to the queue
+        self.sequence = {}
+        # the queue ended, items added from now on would never run
+        self.closed = False
+        self.lock = threading.Lock()
+
+    def key(self, job):
+        sequence = self.sequence.setdefault(job.workshop_id, next(self.counter))
+        return (job.lane, job.requeues, job.size if self.shortest_first else 0, sequence, next(self.counter))
+
+    # entries left behind by a promotion, or of items skipped/stopped while they waited, are dropped
+    @staticmethod
+    def waiting(key, job):
+        return job.state == JOB_QUEUED and key[0] == job.lane
+
+    # returns False once the queue is closed
+    def add_all(self, jobs):
+        with self.lock:
+            if self.closed:
+                return False
+            for job in jobs:
+                heapq.heappush(self.heap, (self.key(job), job))
+            return True
+
+    def add(self, job):
+        return self.add_all([job])
+
+    # moves a waiting item up to a higher priority lane, its old entry is dropped when it comes up
+    def promote(self, job, lane):
+        with self.lock:
+            if lane >= job.lane or self.closed or job.state != JOB_QUEUED:
+                return False
+            job.lane = lane
+            heapq.heappush(self.heap, (self.key(job), job))
+            return True
+
+    # next job that's still waiting, None when there's nothing left,
+    # close=True ends the queue at that point so nothing gets added behind its back
+    def pop(self, close=False):
+        with self.lock:
+            while self.heap:
+                key, job = heapq.heappop(self.heap)
+                if self.waiting(key, job):
+                    return job
+            if close:
+                self.closed = True
+        return None
+
+    def close(self):
+        with self.lock:
+            self.closed = True
+            self.heap.clear()
+
+    def __len__(self):
+        with self.lock:
+            return sum(1 for key, job in self.heap if self.waiting(key, job))
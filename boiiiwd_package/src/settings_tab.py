@@ -11,17 +11,15 @@ class SettingsTab(ctk.CTkFrame):
         super().__init__(master)
         # settings default bools
         self.skip_already_installed = True
-        self.stopped = False
         self.console = False
         self.clean_on_finish = True
         self.continuous = True
         self.estimated_progress = True
         self.steam_fail_counter_toggle = True
-        self.steam_fail_counter = 0
         self.steam_fail_number = 10
-        self.steamcmd_reset = False
         self.show_fails = True
         self.check_items_on_launch = False
+        self.download_workers = 1
 
         # Left and right frames, use fg_color="transparent"
         self.grid_rowconfigure(0, weight=1)
@@ -71,8 +69,8 @@ class SettingsTab(ctk.CTkFrame):
         self.estimated_progress_var.trace_add("write", self.enable_save_button)
         self.estimated_progress_cb = ctk.CTkSwitch(left_frame, text="Estimated Progress Bar", variable=self.estimated_progress_var)
         self.estimated_progress_cb.grid(row=4, column=1, padx=20, pady=(20, 0), sticky="nw")
-        self.estimated_progress_var_tooltip = CTkToolTip(self.estimated_progress_cb, message="This will change how to progress bar works by estimating how long the download will take\
-            \nThis is not accurate ,it's better than with it off which is calculating the downloaded folder size which steamcmd dumps the full size rigth mostly")
+        self.estimated_progress_var_tooltip = CTkToolTip(self.estimated_progress_cb, message="Use steamcmd's own downloaded/total byte counters for the progress bar when it reports them\
+            \nWith it off (or when steamcmd doesn't report them) progress is the size of the item's download folder")
         self.estimated_progress_var.set(self.load_settings("estimated_progress", "on"))
 
         # Show show fails checkbox
@@ -106,9 +104,19 @@ class SettingsTab(ctk.CTkFrame):
         self.reset_steamcmd_on_fail_text.grid(row=8, column=1, padx=20, pady=(10, 0), sticky="nw")
         self.reset_steamcmd_on_fail = ctk.CTkOptionMenu(left_frame, values=["5", "10", "20", "30", "40", "Custom", "Disable"], variable=self.reset_steamcmd_on_fail_var, command=self.reset_steamcmd_on_fail_func)
         self.reset_steamcmd_on_fail.grid(row=8, column=1, padx=(190, 0), pady=(10, 0), sticky="nw")
-        self.reset_steamcmd_on_fail_tooltip = CTkToolTip(self.reset_steamcmd_on_fail, message="This actually fixes steamcmd when its crashing way too much")
+        self.reset_steamcmd_on_fail_tooltip = CTkToolTip(self.reset_steamcmd_on_fail, message="Wipes steamcmd's cache after n crashes/failures of the same item, this actually fixes steamcmd when its crashing way too much\nTimeouts and connection errors only wait and retry, they never wipe the cache")
         self.reset_steamcmd_on_fail.set(value=self.load_settings("reset_on_fail", "10"))
 
+        # parallel steamcmd instances for the queue
+        self.download_workers_var = ctk.IntVar()
+        self.download_workers_var.trace_add("write", self.enable_save_button)
+        self.download_workers_text = ctk.CTkLabel(left_frame, text=f"Download workers (queue):", anchor="w")
+        self.download_workers_text.grid(row=9, column=1, padx=20, pady=(10, 0), sticky="nw")
+        self.download_workers_menu = ctk.CTkOptionMenu(left_frame, values=["1", "2", "3", "4"], variable=self.download_workers_var)
+        self.download_workers_menu.grid(row=9, column=1, padx=(190, 0), pady=(10, 0), sticky="nw")
+        self.download_workers_tooltip = CTkToolTip(self.download_workers_menu, message="How many items of the queue are downloaded at the same time\nEach worker is its own steamcmd with its own steamapps folder (ignored when the console is on)")
+        self.download_workers_menu.set(value=self.load_settings("download_workers", "1"))
+
         # item folder naming
         self.folder_options_label_var = ctk.IntVar()
         self.folder_options_label_var.trace_add("write", self.enable_save_button)
@@ -291,6 +299,10 @@ class SettingsTab(ctk.CTkFrame):
                 self.steam_fail_number = int(value)
             save_config("reset_on_fail", value)
 
+        if self.download_workers_menu.get():
+            self.download_workers = int(self.download_workers_menu.get())
+            save_config("download_workers", str(self.download_workers))
+
     def load_settings(self, setting, fallback=None):
         if setting == "folder_naming":
             if check_config(setting, fallback) == "1":
@@ -344,6 +356,13 @@ class SettingsTab(ctk.CTkFrame):
                     self.steam_fail_number = 10
                     return "10"
 
+        if setting == "download_workers":
+            try:
+                self.download_workers = min(max(int(check_config(setting, fallback)), 1), 4)
+            except:
+                self.download_workers = 1
+            return str(self.download_workers)
+
         if setting == "show_fails":
             if check_config(setting, fallback) == "on":
                 self.show_fails = True
@@ -493,6 +512,7 @@ class SettingsTab(ctk.CTkFrame):
         self.check_updates_var.set(self.load_settings("checkforupdtes"))
         self.console_var.set(self.load_settings("console"))
         self.reset_steamcmd_on_fail.set(value=self.load_settings("reset_on_fail", "10"))
+        self.download_workers_menu.set(value=self.load_settings("download_workers", "1"))
         self.estimated_progress_var.set(self.load_settings("estimated_progress", "on"))
         self.clean_checkbox_var.set(self.load_settings("clean_on_finish", "on"))
         self.continuous_var.set(self.load_settings("continuous_download"))
@@ -0,0 +1,133 @@
+from src.imports import *
+from src.helpers import *
+
+
+DEFAULT_STALL_WINDOW = 120
+DEFAULT_STALL_THRESHOLD = 10
+STALL_ACTIONS = ("restart", "requeue")
+
+
+# (window seconds, threshold bytes/s, action), a window of 0 turns the watchdog off
+def get_stall_settings():
+    try:
+        window = max(float(check_config("stall_window", str(DEFAULT_STALL_WINDOW))), 0)
+    except ValueError:
+        window = DEFAULT_STALL_WINDOW
+    try:
+        threshold = max(float(check_config("stall_threshold", str(DEFAULT_STALL_THRESHOLD))), 0) * 1024
+    except ValueError:
+        threshold = DEFAULT_STALL_THRESHOLD * 1024
+    action = check_config("stall_action", "restart")
+    return window, threshold, action if action in STALL_ACTIONS else "restart"
+
+
+class WatchedItem:
+    def __init__(self, job):
+        self.job = job
+        self.state_changed = job.changed
+        # (time, bytes done) over the last window
+        self.samples = deque()
+        self.last_progress = time.time()
+        self.last_bytes = 0
+        self.last_disk = 0
+
+    def reset(self, now):
+        self.state_changed = self.job.changed
+        self.samples.clear()
+        self.last_progress = now
+        self.last_bytes = 0
+        self.last_disk = 0
+
+
+# follows the byte progress of downloading jobs and calls on_stall(job, seconds_lost) when one
+# stays under threshold bytes/s for a whole window, the job needs a new attempt before it's watched again
+class StallWatchdog:
+    def __init__(self, progress, on_stall, window=None, threshold=None, interval=5):
+        default_window, default_threshold, _ = get_stall_settings()
+        self.progress = progress
+        self.on_stall = on_stall
+        self.window = default_window if window is None else window
+        self.threshold = default_threshold if threshold is None else threshold
+        self.interval = min(interval, self.window / 4) if self.window else interval
+        self.items = {}
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.thread = None
+
+    @property
+    def enabled(self):
+        return self.window > 0
+
+    def start(self):
+        if self.enabled:
+            self.thread = threading.Thread(target=self.run, daemon=True)
+            self.thread.start()
+        return self
+
+    def stop(self):
+        self.stopped.set()
+
+    def watch(self, job):
+        with self.lock:
+            self.items[job.workshop_id] = WatchedItem(job)
+
+    def unwatch(self, workshop_id):
+        with self.lock:
+            self.items.pop(str(workshop_id), None)
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            with self.lock:
+                items = list(self.items.values())
+            for item in items:
+                seconds_lost = self.check(item, time.time())
+                if seconds_lost is not None:
+                    self.on_stall(item.job, seconds_lost)
+
+    # returns the seconds since the item last made progress when it stalled, None otherwise
+    def check(self, item, now):
+        job = item.job
+        # a new attempt (or one that hasn't reached the download yet) starts a new window
+        if item.state_changed != job.changed or not job.downloading:
+            item.reset(now)
+            return None
+
+        # measured here rather than taken from the ui's progress, which only moves as often as it's redrawn
+        progress = self.progress.item(job.workshop_id)
+        disk_bytes = self.progress.disk_size(job.workshop_id)
+        bytes_done = max(progress.bytes_done if progress else 0, disk_bytes)
+        growing = disk_bytes > item.last_disk
+        item.last_disk = disk_bytes
+        if bytes_done > item.last_bytes or growing:
+            item.last_progress = now
+        item.last_bytes = bytes_done
+
+        item.samples.append((now, bytes_done))
+        while len(item.samples) > 1 and item.samples[1][0] <= now - self.window:
+            item.samples.popleft()
+        oldest_time, oldest_bytes = item.samples[0]
+        # never a stall while the files on disk keep growing
+        if growing or now - oldest_time < self.window:
+            return None
+
+        if (bytes_done - oldest_bytes) / (now - oldest_time) >= self.threshold:
+            return None
+        item.samples.clear()
+        return now - item.last_progress
+
+
+# one json line per detected stall in boiiiwd_stalls.jsonl
+def record_stall(job, seconds_lost, action):
+    if check_config("record_stalls", "on") == "off":
+        return
+    try:
+        with open(os.path.join(APPLICATION_PATH, STALLS_FILE), "a") as file:
+            file.write(json.dumps({
+                "id": job.workshop_id,
+                "detected": int(time.time()),
+                "attempt": job.attempts,
+                "seconds_lost": round(seconds_lost, 2),
+                "action": action,
+            }) + "\n")
+    except OSError:
+        pass
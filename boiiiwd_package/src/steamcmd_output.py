@@ -0,0 +1,186 @@
+from src.imports import *
+
+
+STEAMCMD_LOGIN_OK = ("waiting for user info...ok", "logged in ok")
+STEAMCMD_LOGIN_FAILED = ("failed login", "login failure", "failed (")
+STEAMCMD_PROMPT = "steam>"
+
+EVENT_LOGGED_IN = "logged_in"
+EVENT_LOGIN_FAILED = "login_failed"
+EVENT_DOWNLOAD_STARTED = "download_started"
+EVENT_PROGRESS = "progress"
+EVENT_SUCCESS = "success"
+EVENT_FAILURE = "failure"
+
+# stdout
+download_started_re = re.compile(r'downloading item (\d+)', re.IGNORECASE)
+download_success_re = re.compile(r'success\. downloaded item (\d+)', re.IGNORECASE)
+download_failed_re = re.compile(r'error! download item (\d+) failed \(([^)]*)\)', re.IGNORECASE)
+download_timeout_re = re.compile(r'error! timeout downloading item (\d+)', re.IGNORECASE)
+download_progress_re = re.compile(r'progress: [\d.]+ \((\d+) / (\d+)\)', re.IGNORECASE)
+# logs/workshop_log.txt
+log_item_re = re.compile(r'download item (\d+)', re.IGNORECASE)
+log_result_re = re.compile(r'download item (\d+) result : (.+)$', re.IGNORECASE)
+log_progress_re = re.compile(r'update started : download (\d+)/(\d+)', re.IGNORECASE)
+# any line naming an item, the progress line doesn't say which one it's about
+log_owner_re = re.compile(r'item (\d+)', re.IGNORECASE)
+
+
+class SteamCMDEvent:
+    def __init__(self, kind, workshop_id=None, reason=None, bytes_done=None, bytes_total=None):
+        self.kind = kind
+        self.workshop_id = workshop_id
+        self.reason = reason
+        self.bytes_done = bytes_done
+        self.bytes_total = bytes_total
+
+    def __repr__(self):
+        return f"SteamCMDEvent({self.kind}, {self.workshop_id}, {self.reason}, {self.bytes_done}/{self.bytes_total})"
+
+
+# state machine fed with lines from steamcmd's stdout and workshop_log.txt,
+# starting -> logged_in -> downloading (one item) -> logged_in ...
+class SteamCMDOutputParser:
+    def __init__(self, on_event, logged_in=False):
+        self.on_event = on_event
+        self.state = "logged_in" if logged_in else "starting"
+        self.current_item = None
+        self.item_finished = False
+        # last item the workshop log named
+        self.log_item = None
+        self.lock = threading.Lock()
+
+    # the item we expect output for, lines about other items are ignored
+    def expect_item(self, workshop_id):
+        with self.lock:
+            self.current_item = str(workshop_id) if workshop_id else None
+            self.item_finished = False
+            if self.state == "downloading":
+                self.state = "logged_in"
+
+    def emit(self, kind, **kwargs):
+        self.on_event(SteamCMDEvent(kind, workshop_id=kwargs.pop("workshop_id", self.current_item), **kwargs))
+
+    def feed(self, line, source="stdout"):
+        line = line.strip()
+        if not line:
+            return
+        with self.lock:
+            events = self.parse_log(line) if source == "log" else self.parse_stdout(line)
+        for kind, kwargs in events:
+            self.emit(kind, **kwargs)
+
+    def parse_stdout(self, line):
+        lower = line.lower()
+        if self.state == "starting":
+            if any(ok in lower for ok in STEAMCMD_LOGIN_OK) or lower.endswith(STEAMCMD_PROMPT):
+                self.state = "logged_in"
+                return [(EVENT_LOGGED_IN, {})]
+            if any(failed in lower for failed in STEAMCMD_LOGIN_FAILED):
+                return [(EVENT_LOGIN_FAILED, {"reason": line})]
+            return []
+
+        match = download_success_re.search(line)
+        if match and match.group(1) == self.current_item:
+            return self.finished(EVENT_SUCCESS)
+
+        match = download_failed_re.search(line)
+        if match and match.group(1) == self.current_item:
+            return self.finished(EVENT_FAILURE, match.group(2))
+
+        match = download_timeout_re.search(line)
+        if match and match.group(1) == self.current_item:
+            return self.finished(EVENT_FAILURE, "Timeout")
+
+        match = download_started_re.search(line)
+        if match and match.group(1) == self.current_item:
+            return self.started()
+
+        match = download_progress_re.search(line)
+        if match and self.state == "downloading":
+            return [(EVENT_PROGRESS, {"bytes_done": int(match.group(1)), "bytes_total": int(match.group(2))})]
+        return []
+
+    def parse_log(self, line):
+        match = log_owner_re.search(line)
+        if match:
+            self.log_item = match.group(1)
+
+        match = log_result_re.search(line)
+        if match and match.group(1) == self.current_item:
+            result = match.group(2).strip()
+            if result.lower() == "ok":
+                return self.finished(EVENT_SUCCESS)
+            return self.finished(EVENT_FAILURE, result)
+
+        # a progress line belongs to the item the log named before it, not to whatever this session downloads
+        match = log_progress_re.search(line)
+        if match:
+            if self.state != "downloading" or self.log_item != self.current_item:
+                return []
+            return [(EVENT_PROGRESS, {"bytes_done": int(match.group(1)), "bytes_total": int(match.group(2))})]
+
+        match = log_item_re.search(line)
+        if match and match.group(1) == self.current_item:
+            return self.started()
+        return []
+
+    # stdout and the log both report the result, only the first one counts
+    def finished(self, kind, reason=None):
+        if self.item_finished:
+            return []
+        self.item_finished = True
+        self.state = "logged_in"
+        return [(kind, {"reason": reason} if reason else {})]
+
+    def started(self):
+        if self.state == "downloading" or self.item_finished:
+            return []
+        self.state = "downloading"
+        return [(EVENT_DOWNLOAD_STARTED, {})]
+
+
+# tails logs/workshop_log.txt from where it was when we started, no copies and no rescans
+class WorkshopLogFollower:
+    def __init__(self, log_path, on_line, interval=0.25):
+        self.log_path = log_path
+        self.on_line = on_line
+        self.interval = interval
+        self.stopped = threading.Event()
+        self.thread = None
+        try:
+            self.offset = os.path.getsize(log_path)
+        except OSError:
+            self.offset = 0
+
+    def start(self):
+        self.thread = threading.Thread(target=self.follow, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.stopped.set()
+
+    def follow(self):
+        pending = b""
+        while not self.stopped.wait(self.interval):
+            try:
+                size = os.path.getsize(self.log_path)
+            except OSError:
+                continue
+            # steamcmd rotated or truncated the log
+            if size < self.offset:
+                self.offset = 0
+                pending = b""
+            if size == self.offset:
+                continue
+            try:
+                with open(self.log_path, "rb") as log_file:
+                    log_file.seek(self.offset)
+                    data = log_file.read(size - self.offset)
+            except OSError:
+                continue
+            self.offset += len(data)
+            *lines, pending = (pending + data).split(b"\n")
+            for line in lines:
+                self.on_line(line.decode("utf-8", errors="replace"))
@@ -0,0 +1,283 @@
+from src.imports import *
+from src.helpers import *
+from src.process_supervisor import process_supervisor
+from src.steamcmd_output import *
+
+
+STEAMCMD_APP_ID = "311210"
+# what a worker's steamcmd copy doesn't take from the real one, downloads, logs and caches stay its own
+STEAMCMD_COPY_SKIP = ("steamapps", "logs", "dumps", "depotcache", "appcache", "userdata", "boiiiwd_workers", "boiiiwd_staging")
+
+
+# where steamcmd downloads items, "stage_on_boiii_drive = on" moves it next to boiii so installs are a rename
+def get_staging_dir(steamcmd_path):
+    destination_folder = check_config("DestinationFolder", "")
+    if check_config("stage_on_boiii_drive", "off") == "on" and destination_folder and os.path.exists(destination_folder):
+        return os.path.join(destination_folder, "boiiiwd_staging")
+    return steamcmd_path
+
+# workers get their own install dir so their content/download folders don't collide
+def get_worker_install_dir(steamcmd_path, index, workers=1):
+    staging_dir = get_staging_dir(steamcmd_path)
+    if workers <= 1:
+        return staging_dir
+    return os.path.join(staging_dir, "boiiiwd_workers", f"worker_{index}")
+
+# steamcmd always logs to <its folder>/logs, workers run their own copy so their workshop_log.txt don't mix
+def get_worker_steamcmd_dir(steamcmd_path, index, workers=1):
+    if workers <= 1:
+        return steamcmd_path
+    return os.path.join(get_worker_install_dir(steamcmd_path, index, workers), "steamcmd")
+
+# copies what's new or changed (steamcmd updated itself) into a worker's copy
+def sync_steamcmd_copy(steamcmd_path, copy_path):
+    for root, folders, files in os.walk(steamcmd_path):
+        if os.path.normpath(root) == os.path.normpath(steamcmd_path):
+            folders[:] = [folder for folder in folders if folder.lower() not in STEAMCMD_COPY_SKIP]
+        target_root = os.path.join(copy_path, os.path.relpath(root, steamcmd_path))
+        os.makedirs(target_root, exist_ok=True)
+        for name in files:
+            src, dst = os.path.join(root, name), os.path.join(target_root, name)
+            try:
+                src_stat, dst_stat = os.stat(src), os.stat(dst)
+                if src_stat.st_size == dst_stat.st_size and abs(src_stat.st_mtime - dst_stat.st_mtime) < 2:
+                    continue
+            except OSError:
+                pass
+            shutil.copy2(src, dst)
+
+# every install dir an item could have been downloaded to
+def get_install_dirs(steamcmd_path):
+    install_dirs = []
+    for staging_dir in dict.fromkeys([steamcmd_path, get_staging_dir(steamcmd_path)]):
+        install_dirs.append(staging_dir)
+        install_dirs += [str(path) for path in Path(staging_dir, "boiiiwd_workers").glob("worker_*")]
+    return install_dirs
+
+def get_workshop_log_path(steamcmd_path):
+    return os.path.join(steamcmd_path, "logs", "workshop_log.txt")
+
+# returns (download_folder, map_folder) of an item for the given steamcmd install dir
+def get_workshop_folders(install_dir, workshop_id):
+    workshop_folder = os.path.join(install_dir, "steamapps", "workshop")
+    return (os.path.join(workshop_folder, "downloads", STEAMCMD_APP_ID, str(workshop_id)),
+            os.path.join(workshop_folder, "content", STEAMCMD_APP_ID, str(workshop_id)))
+
+# steamcmd.exe's arguments as a list, so an install dir with spaces stays one argument
+def build_steamcmd_command(workshop_id, validate=None, install_dir=None):
+    if validate is None:
+        validate = check_config("validate_downloads", "no") == "yes"
+    command = []
+    if install_dir and os.path.normpath(install_dir) != os.path.normpath(get_steamcmd_path()):
+        command += ["+force_install_dir", install_dir]
+    command += ["+login", "anonymous", "+workshop_download_item", STEAMCMD_APP_ID, str(workshop_id)]
+    if validate:
+        command.append("validate")
+    return command + ["+quit"]
+
+
+# one logged in steamcmd.exe that gets workshop_download_item commands through stdin,
+# so items in a queue don't each pay for startup, self-update check and login
+class SteamCMDSession:
+    # source_path: the real steamcmd when steamcmd_path is a worker's copy of it, synced before the first start
+    def __init__(self, steamcmd_path, on_download_started=None, install_dir=None, on_event=None, source_path=None):
+        self.steamcmd_path = steamcmd_path
+        self.source_path = source_path
+        self.install_dir = install_dir or steamcmd_path
+        self.on_download_started = on_download_started
+        self.on_event = on_event
+        self.process = None
+        self.reader_thread = None
+        self.parser = None
+        self.log_follower = None
+        self.lock = threading.Lock()
+        self.logged_in = threading.Event()
+        self.login_failed = False
+        self.current_item = None
+        self.item_done = threading.Event()
+        self.item_result = None
+        self.output_tail = []
+
+    def has_own_install_dir(self):
+        return os.path.normpath(self.install_dir) != os.path.normpath(self.steamcmd_path)
+
+    def get_workshop_folders(self, workshop_id):
+        return get_workshop_folders(self.install_dir, workshop_id)
+
+    # a worker only wipes its own steamapps, the shared steamcmd folder gets the full reset
+    def reset_cache(self):
+        self.close()
+        if self.has_own_install_dir():
+            remove_tree(os.path.join(self.install_dir, "steamapps"))
+        else:
+            reset_steamcmd(no_warn=True)
+
+    def is_alive(self):
+        process = self.process
+        return process is not None and process.poll() is None
+
+    # for the throughput meter, kill()/close() can clear self.process at any time so it's read once
+    def running_processes(self):
+        process = self.process
+        return [process] if process is not None and process.poll() is None else []
+
+    def start(self, timeout=120):
+        if self.is_alive() and self.logged_in.is_set():
+            return True
+
+        self.close()
+        self.logged_in.clear()
+        self.login_failed = False
+        if self.source_path:
+            try:
+                sync_steamcmd_copy(self.source_path, self.steamcmd_path)
+            except OSError:
+                # out of space or locked files, it shares the real steamcmd (and its log) instead
+                self.steamcmd_path = self.source_path
+            self.source_path = None
+        self.parser = SteamCMDOutputParser(self.handle_event)
+        args = [os.path.join(self.steamcmd_path, "steamcmd.exe"), "+@ShutdownOnFailedCommand", "0", "+@NoPromptForPassword", "1"]
+        if self.has_own_install_dir():
+            os.makedirs(self.install_dir, exist_ok=True)
+            args += ["+force_install_dir", self.install_dir]
+        self.process = process_supervisor.register(subprocess.Popen(
+            args + ["+login", "anonymous"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            bufsize=0,
+            creationflags=subprocess.CREATE_NO_WINDOW
+        ))
+        self.reader_thread = threading.Thread(target=self.read_output, args=(self.process,), daemon=True)
+        self.reader_thread.start()
+
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if self.logged_in.wait(0.5):
+                return True
+            if self.login_failed or not self.is_alive():
+                break
+        self.close()
+        return False
+
+    def read_output(self, process):
+        pending = ""
+        while True:
+            try:
+                chunk = process.stdout.read(4096)
+            except Exception:
+                break
+            if not chunk:
+                break
+            pending += chunk.decode("utf-8", errors="replace")
+            *lines, pending = pending.replace("\r", "\n").split("\n")
+            for line in lines:
+                self.handle_line(line)
+            # the prompt has no newline after it
+            if pending.strip().lower().endswith(STEAMCMD_PROMPT):
+                self.handle_line(pending)
+                pending = ""
+        if pending:
+            self.handle_line(pending)
+        # process went away, wake up whoever is waiting on an item
+        if self.current_item and not self.item_done.is_set():
+            self.item_result = (False, "SteamCMD exited")
+            self.item_done.set()
+
+    def handle_line(self, line):
+        line = line.strip()
+        if not line:
+            return
+        self.output_tail = (self.output_tail + [line])[-20:]
+        parser = self.parser
+        if parser:
+            parser.feed(line)
+
+    def handle_log_line(self, line):
+        parser = self.parser
+        if parser:
+            parser.feed(line, source="log")
+
+    def handle_event(self, event):
+        if event.kind == EVENT_LOGGED_IN:
+            self.logged_in.set()
+        elif event.kind == EVENT_LOGIN_FAILED:
+            self.login_failed = True
+        elif event.workshop_id != self.current_item:
+            return
+        elif event.kind == EVENT_DOWNLOAD_STARTED:
+            if self.on_download_started:
+                self.on_download_started(self.current_item)
+        elif event.kind == EVENT_SUCCESS:
+            self.item_result = (True, None)
+            self.item_done.set()
+        elif event.kind == EVENT_FAILURE:
+            self.item_result = (False, event.reason)
+            self.item_done.set()
+
+        if self.on_event:
+            self.on_event(event)
+
+    def send(self, command):
+        self.process.stdin.write(f"{command}\n".encode())
+        self.process.stdin.flush()
+
+    # blocks until steamcmd reports the item as downloaded/failed or the session dies
+    def download_item(self, workshop_id, validate=None, should_stop=None):
+        if validate is None:
+            validate = check_config("validate_downloads", "no") == "yes"
+        with self.lock:
+            if not self.start():
+                return False, "Login failed"
+
+            self.current_item = str(workshop_id)
+            self.item_result = None
+            self.item_done.clear()
+            self.parser.expect_item(workshop_id)
+            self.log_follower = WorkshopLogFollower(get_workshop_log_path(self.steamcmd_path), self.handle_log_line).start()
+            try:
+                self.send(f"workshop_download_item {STEAMCMD_APP_ID} {workshop_id}{' validate' if validate else ''}")
+                while not self.item_done.wait(0.5):
+                    if should_stop and should_stop():
+                        return False, "Stopped"
+                    if not self.is_alive():
+                        break
+                return self.item_result or (False, "SteamCMD exited")
+            except Exception as e:
+                return False, f"{e}"
+            finally:
+                self.log_follower.stop()
+                self.log_follower = None
+                self.current_item = None
+
+    def close(self, timeout=5):
+        process = self.process
+        self.process = None
+        self.logged_in.clear()
+        if process is None:
+            return
+        if process.poll() is not None:
+            process_supervisor.unregister(process)
+            return
+        try:
+            process.stdin.write(b"quit\n")
+            process.stdin.flush()
+            process.wait(timeout=timeout)
+            process_supervisor.unregister(process)
+        except Exception:
+            process_supervisor.terminate(process)
+
+    # doesn't wait for the process to go away, on_done gets the cancellation latency
+    def kill(self, on_done=None):
+        process = self.process
+        self.process = None
+        self.logged_in.clear()
+        # wake up download_item() right away instead of on its next poll
+        if self.current_item and not self.item_done.is_set():
+            self.item_result = (False, "Stopped")
+            self.item_done.set()
+        if process is None:
+            if on_done:
+                on_done(0)
+            return
+        process_supervisor.cancel(process, on_done=on_done)
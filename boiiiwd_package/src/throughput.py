@@ -0,0 +1,149 @@
+from src.imports import *
+from src.helpers import *
+
+
+DEFAULT_EWMA_ALPHA = 0.3
+
+
+def get_ewma_alpha():
+    try:
+        alpha = float(check_config("throughput_ewma", str(DEFAULT_EWMA_ALPHA)))
+    except ValueError:
+        return DEFAULT_EWMA_ALPHA
+    return min(max(alpha, 0.01), 1.0)
+
+
+# io counters of a process and everything it spawned, (network, disk) bytes so far
+# psutil has no per-process socket counters: on Windows socket traffic lands in other_bytes
+# (read_bytes elsewhere), disk is what the process wrote
+def get_process_tree_io(pid):
+    network = disk = 0
+    try:
+        root = psutil.Process(pid)
+        processes = [root] + root.children(recursive=True)
+    except psutil.Error:
+        return None
+    for process in processes:
+        try:
+            counters = process.io_counters()
+        except (psutil.Error, AttributeError):
+            continue
+        network += getattr(counters, "other_bytes", 0) or counters.read_bytes
+        disk += counters.write_bytes
+    return network, disk
+
+
+class ItemThroughput:
+    def __init__(self, workshop_id):
+        self.workshop_id = str(workshop_id)
+        self.started = time.time()
+        self.finished = None
+        self.samples = 0
+        self.network_bytes = 0
+        self.disk_bytes = 0
+        self.network_min = None
+        self.network_max = 0
+        self.disk_max = 0
+
+    def add(self, network_rate, disk_rate, network_bytes, disk_bytes):
+        self.samples += 1
+        self.network_bytes += network_bytes
+        self.disk_bytes += disk_bytes
+        self.network_min = network_rate if self.network_min is None else min(self.network_min, network_rate)
+        self.network_max = max(self.network_max, network_rate)
+        self.disk_max = max(self.disk_max, disk_rate)
+
+    def elapsed(self):
+        return (self.finished or time.time()) - self.started
+
+    def network_avg(self):
+        elapsed = self.elapsed()
+        return self.network_bytes / elapsed if elapsed else 0
+
+    def disk_avg(self):
+        elapsed = self.elapsed()
+        return self.disk_bytes / elapsed if elapsed else 0
+
+    def to_dict(self, status):
+        return {
+            "id": self.workshop_id,
+            "status": status,
+            "started": int(self.started),
+            "seconds": round(self.elapsed(), 2),
+            "network_bytes": self.network_bytes,
+            "network_min": round(self.network_min or 0),
+            "network_avg": round(self.network_avg()),
+            "network_max": round(self.network_max),
+            "disk_bytes": self.disk_bytes,
+            "disk_avg": round(self.disk_avg()),
+            "disk_max": round(self.disk_max),
+        }
+
+
+# samples the I/O of the steamcmd processes we own, not the whole NIC, so other traffic
+# on the machine doesn't show up as download speed
+class ThroughputMeter:
+    def __init__(self, get_processes, alpha=None):
+        self.get_processes = get_processes
+        self.alpha = get_ewma_alpha() if alpha is None else alpha
+        self.last_counters = {}
+        self.last_sample = None
+        self.network_rate = 0
+        self.disk_rate = 0
+        self.item = None
+
+    # call about once a second, returns the smoothed (network, disk) rates in bytes/s
+    def sample(self):
+        now = time.perf_counter()
+        counters = {}
+        for process in self.get_processes():
+            # gone since it was listed
+            if process is None or process.poll() is not None:
+                continue
+            io = get_process_tree_io(process.pid)
+            if io:
+                counters[process.pid] = io
+
+        network_bytes = disk_bytes = 0
+        for pid, (network, disk) in counters.items():
+            if pid in self.last_counters:
+                last_network, last_disk = self.last_counters[pid]
+                network_bytes += max(network - last_network, 0)
+                disk_bytes += max(disk - last_disk, 0)
+
+        if self.last_sample is not None and now > self.last_sample:
+            elapsed = now - self.last_sample
+            network_rate = network_bytes / elapsed
+            disk_rate = disk_bytes / elapsed
+            self.network_rate = self.alpha * network_rate + (1 - self.alpha) * self.network_rate
+            self.disk_rate = self.alpha * disk_rate + (1 - self.alpha) * self.disk_rate
+            if self.item:
+                self.item.add(network_rate, disk_rate, network_bytes, disk_bytes)
+
+        self.last_counters = counters
+        self.last_sample = now
+        return self.network_rate, self.disk_rate
+
+    def start_item(self, workshop_id):
+        self.item = ItemThroughput(workshop_id)
+        return self.item
+
+    def finish_item(self, status="done"):
+        item = self.item
+        self.item = None
+        if not item or not item.samples:
+            return item
+        item.finished = time.time()
+        record_throughput(item, status)
+        return item
+
+
+# one json line per item in boiiiwd_throughput.jsonl, for looking at speeds across runs
+def record_throughput(item, status):
+    if check_config("record_throughput", "on") == "off":
+        return
+    try:
+        with open(os.path.join(APPLICATION_PATH, THROUGHPUT_FILE), "a") as file:
+            file.write(json.dumps(item.to_dict(status)) + "\n")
+    except OSError:
+        pass
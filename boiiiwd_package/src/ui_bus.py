@@ -0,0 +1,100 @@
+from src.imports import *
+from src.helpers import *
+
+
+DEFAULT_UI_FPS = 15
+DEFAULT_BACKGROUND_FPS = 2
+# seconds between progress samples (folder sizes, process io) while nobody is looking
+DEFAULT_BACKGROUND_REFRESH = 5
+
+
+def get_ui_fps():
+    try:
+        return min(max(int(check_config("ui_fps", str(DEFAULT_UI_FPS))), 1), 60)
+    except ValueError:
+        return DEFAULT_UI_FPS
+
+# (frames per second, progress refresh seconds) when the window is minimized, unfocused or the progress isn't showing
+def get_background_rates():
+    try:
+        fps = min(max(int(check_config("ui_background_fps", str(DEFAULT_BACKGROUND_FPS))), 1), 60)
+    except ValueError:
+        fps = DEFAULT_BACKGROUND_FPS
+    try:
+        refresh = max(float(check_config("background_refresh", str(DEFAULT_BACKGROUND_REFRESH))), UI_REFRESH_INTERVAL)
+    except ValueError:
+        refresh = DEFAULT_BACKGROUND_REFRESH
+    return fps, refresh
+
+
+# download threads post widget updates here instead of touching Tk, the pump runs on the Tk thread and
+# applies only the latest update of each widget (and option) once per frame, fewer frames in the background
+class UIUpdateBus:
+    # is_visible() tells if the widgets that get updated are showing at all
+    def __init__(self, root, fps=None, is_visible=None):
+        background_fps, self.background_refresh = get_background_rates()
+        self.root = root
+        self.is_visible = is_visible
+        self.interval = int(1000 / (fps or get_ui_fps()))
+        self.background_interval = max(int(1000 / background_fps), self.interval)
+        self.background = False
+        # key -> (fn, args, kwargs), a newer post for the same key replaces the older one
+        self.pending = {}
+        self.lock = threading.Lock()
+        self.started = False
+
+    def start(self):
+        if not self.started:
+            self.started = True
+            self.root.after(self.interval, self.pump)
+        return self
+
+    def post(self, key, fn, *args, **kwargs):
+        with self.lock:
+            # moved to the end: updates are applied in the order of their latest post
+            self.pending.pop(key, None)
+            self.pending[key] = (fn, args, kwargs)
+
+    def configure(self, widget, **options):
+        self.post((id(widget), "configure", tuple(sorted(options))), widget.configure, **options)
+
+    # progress bars
+    def set(self, widget, value):
+        self.post((id(widget), "set"), widget.set, value)
+
+    # grid/grid_remove share a key, the last one wins
+    def grid(self, widget, **options):
+        self.post((id(widget), "grid"), widget.grid, **options)
+
+    def grid_remove(self, widget):
+        self.post((id(widget), "grid"), widget.grid_remove)
+
+    # seconds the download threads wait between progress samples
+    def refresh_interval(self):
+        return self.background_refresh if self.background else UI_REFRESH_INTERVAL
+
+    def check_background(self):
+        try:
+            background = self.root.state() in ("iconic", "withdrawn") or self.root.focus_get() is None
+            if not background and self.is_visible:
+                background = not self.is_visible()
+        except Exception:
+            # focus_get() fails while some popups (combobox dropdowns) have the focus
+            background = False
+        self.background = background
+
+    # applies what's pending right away, on the Tk thread only
+    def flush(self):
+        with self.lock:
+            pending, self.pending = self.pending, {}
+        for fn, args, kwargs in pending.values():
+            try:
+                fn(*args, **kwargs)
+            except Exception:
+                # widget is gone (window closing)
+                pass
+
+    def pump(self):
+        self.check_background()
+        self.flush()
+        self.root.after(self.background_interval if self.background else self.interval, self.pump)
@@ -23,6 +23,25 @@ PyInstaller.__main__.run([
     "--add-data", "boiiiwd_package/src;library_tab",
     "--add-data", "boiiiwd_package/src;settings_tab",
     "--add-data", "boiiiwd_package/src;update_window",
+    "--add-data", "boiiiwd_package/src;details_window",
+    "--add-data", "boiiiwd_package/src;prefetch",
+    "--add-data", "boiiiwd_package/src;steamcmd_session",
+    "--add-data", "boiiiwd_package/src;steamcmd_output",
+    "--add-data", "boiiiwd_package/src;download_progress",
+    "--add-data", "boiiiwd_package/src;retry_policy",
+    "--add-data", "boiiiwd_package/src;stall_watchdog",
+    "--add-data", "boiiiwd_package/src;delta_staging",
+    "--add-data", "boiiiwd_package/src;copy_engine",
+    "--add-data", "boiiiwd_package/src;install_pipeline",
+    "--add-data", "boiiiwd_package/src;ui_bus",
+    "--add-data", "boiiiwd_package/src;folder_size",
+    "--add-data", "boiiiwd_package/src;queue_journal",
+    "--add-data", "boiiiwd_package/src;scheduler",
+    "--add-data", "boiiiwd_package/src;download_job",
+    "--add-data", "boiiiwd_package/src;download_workers",
+    "--add-data", "boiiiwd_package/src;throughput",
+    "--add-data", "boiiiwd_package/src;eta",
+    "--add-data", "boiiiwd_package/src;process_supervisor",
     "--add-data", "boiiiwd_package/src;main",
     "--add-data", f"{site_packages_path}/customtkinter;customtkinter",
     "--add-data", f"{site_packages_path}/CTkMessagebox;CTkMessagebox",